@@ -12,8 +12,11 @@ if str(BASE_DIR) not in sys.path:
 
 from app.db.base import Base
 import app.db.models
+from app.settings import settings
 
 config = context.config
+# mesma URL da aplicação (variáveis do .env); % precisa de escape no configparser
+config.set_main_option("sqlalchemy.url", settings.database_url.replace("%", "%%"))
 
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
@@ -0,0 +1,40 @@
+"""reservations no overlap exclusion constraint
+
+Revision ID: 3c5e9a1f7b2d
+Revises: 807f8fdfd465
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c5e9a1f7b2d'
+down_revision: Union[str, Sequence[str], None] = '807f8fdfd465'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # btree_gist permite o "property_id WITH =" dentro do índice GiST
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        """
+        ALTER TABLE reservations
+        ADD CONSTRAINT reservations_no_overlap
+        EXCLUDE USING gist (
+            property_id WITH =,
+            daterange(start_date, end_date, '[]') WITH &&
+        )
+        WHERE (is_active)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE reservations DROP CONSTRAINT reservations_no_overlap")
@@ -0,0 +1,54 @@
+"""query shaped indexes
+
+Revision ID: 5b8d2e7c4a91
+Revises: 3c5e9a1f7b2d
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8d2e7c4a91'
+down_revision: Union[str, Sequence[str], None] = '3c5e9a1f7b2d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # redundantes com as PKs
+    op.drop_index(op.f('ix_properties_id'), table_name='properties')
+    op.drop_index(op.f('ix_reservations_id'), table_name='reservations')
+
+    op.create_index(
+        'ix_properties_city_neighborhood_capacity_price',
+        'properties',
+        ['address_city', 'address_neighborhood', 'capacity', 'price_per_night'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_properties_state_city',
+        'properties',
+        ['address_state', 'address_city'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_reservations_active_property_dates',
+        'reservations',
+        ['property_id', 'start_date', 'end_date'],
+        unique=False,
+        postgresql_where=sa.text('is_active'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reservations_active_property_dates', table_name='reservations')
+    op.drop_index('ix_properties_state_city', table_name='properties')
+    op.drop_index('ix_properties_city_neighborhood_capacity_price', table_name='properties')
+    op.create_index(op.f('ix_reservations_id'), 'reservations', ['id'], unique=False)
+    op.create_index(op.f('ix_properties_id'), 'properties', ['id'], unique=False)
@@ -0,0 +1,49 @@
+"""client email search indexes
+
+Revision ID: 8e4f1a6c2d37
+Revises: 5b8d2e7c4a91
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4f1a6c2d37'
+down_revision: Union[str, Sequence[str], None] = '5b8d2e7c4a91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # nunca usado: as buscas comparam lower(client_email)
+    op.drop_index(op.f('ix_reservations_client_email'), table_name='reservations')
+
+    # match=exact|prefix
+    op.create_index(
+        'ix_reservations_client_email_lower',
+        'reservations',
+        [sa.text('lower(client_email) text_pattern_ops')],
+        unique=False,
+    )
+    # match=contains ('%x%')
+    op.create_index(
+        'ix_reservations_client_email_trgm',
+        'reservations',
+        [sa.text('lower(client_email) gin_trgm_ops')],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reservations_client_email_trgm', table_name='reservations')
+    op.drop_index('ix_reservations_client_email_lower', table_name='reservations')
+    op.create_index(op.f('ix_reservations_client_email'), 'reservations', ['client_email'], unique=False)
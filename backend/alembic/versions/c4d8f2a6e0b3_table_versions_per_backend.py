@@ -0,0 +1,64 @@
+"""table versions per backend
+
+Revision ID: c4d8f2a6e0b3
+Revises: a7c3e5f9b1d4
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8f2a6e0b3'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e5f9b1d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # uma linha por conexão: o UPDATE numa linha só serializava todas as escritas
+    op.add_column('table_versions', sa.Column('backend', sa.Integer(), server_default='0', nullable=False))
+    op.drop_constraint('table_versions_pkey', 'table_versions', type_='primary')
+    op.create_primary_key('table_versions_pkey', 'table_versions', ['name', 'backend'])
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO table_versions (name, backend, version)
+            VALUES (TG_TABLE_NAME, pg_backend_pid(), 1)
+            ON CONFLICT (name, backend) DO UPDATE SET version = table_versions.version + 1;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE name = TG_TABLE_NAME;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # volta a uma linha por tabela, com a soma (a versão nunca diminui)
+    op.execute(
+        """
+        UPDATE table_versions v SET version = s.total
+        FROM (SELECT name, sum(version) AS total FROM table_versions GROUP BY name) s
+        WHERE v.name = s.name AND v.backend = 0
+        """
+    )
+    op.execute("DELETE FROM table_versions WHERE backend <> 0")
+    op.drop_constraint('table_versions_pkey', 'table_versions', type_='primary')
+    op.create_primary_key('table_versions_pkey', 'table_versions', ['name'])
+    op.drop_column('table_versions', 'backend')
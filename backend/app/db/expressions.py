@@ -0,0 +1,82 @@
+from datetime import date
+from typing import Union
+
+from sqlalchemy import ColumnElement, and_, func, literal, literal_column
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnClause
+from sqlalchemy.sql.visitors import InternalTraversal
+
+
+class DateRangeOverlaps(ColumnElement):
+    """
+    Sobreposição de períodos (extremos inclusivos, como em find_conflicts).
+
+    No Postgres vira `daterange(a, b, '[]') && daterange(:ini, :fim, '[]')`,
+    mesmo formato da exclusion constraint, para usar o índice GiST dela.
+    Nos outros dialetos (SQLite dos testes) vira comparação simples de datas.
+    """
+
+    inherit_cache = True
+    _traverse_internals = [
+        ("start_col", InternalTraversal.dp_clauseelement),
+        ("end_col", InternalTraversal.dp_clauseelement),
+        ("start", InternalTraversal.dp_clauseelement),
+        ("end", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(
+        self,
+        start_col: ColumnClause,
+        end_col: ColumnClause,
+        start: Union[date, ColumnElement],
+        end: Union[date, ColumnElement],
+    ):
+        self.start_col = start_col
+        self.end_col = end_col
+        # datas viram parâmetros; colunas (ex.: de um VALUES) entram como estão
+        self.start = start if isinstance(start, ColumnElement) else literal(start)
+        self.end = end if isinstance(end, ColumnElement) else literal(end)
+
+
+@compiles(DateRangeOverlaps)
+def _overlaps_default(element, compiler, **kw):
+    expr = and_(element.start_col <= element.end, element.end_col >= element.start)
+    return compiler.process(expr.self_group(), **kw)
+
+
+@compiles(DateRangeOverlaps, "postgresql")
+def _overlaps_postgresql(element, compiler, **kw):
+    bounds = literal_column("'[]'")
+    stored = func.daterange(element.start_col, element.end_col, bounds)
+    wanted = func.daterange(element.start, element.end, bounds)
+    return compiler.process(stored.op("&&")(wanted), **kw)
+
+
+class DaysBetween(ColumnElement):
+    """
+    Dias de `start` até `end` (inteiro, `end - start`).
+
+    No Postgres é a subtração de datas; no SQLite, que guarda datas como texto,
+    vira diferença de julianday().
+    """
+
+    inherit_cache = True
+    _traverse_internals = [
+        ("start", InternalTraversal.dp_clauseelement),
+        ("end", InternalTraversal.dp_clauseelement),
+    ]
+
+    def __init__(self, start: ColumnElement, end: ColumnElement):
+        self.start = start
+        self.end = end
+
+
+@compiles(DaysBetween)
+def _days_between_default(element, compiler, **kw):
+    return compiler.process((element.end - element.start).self_group(), **kw)
+
+
+@compiles(DaysBetween, "sqlite")
+def _days_between_sqlite(element, compiler, **kw):
+    expr = func.julianday(element.end) - func.julianday(element.start)
+    return compiler.process(expr.self_group(), **kw)
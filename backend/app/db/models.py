@@ -1,12 +1,28 @@
-from sqlalchemy import String, Integer, Float, Date, ForeignKey, Numeric, Boolean, sql
+from sqlalchemy import BigInteger, String, Integer, Float, Date, ForeignKey, Numeric, Boolean, sql, DDL, Index, event, func, literal_column, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.db.base import Base
 
+# nome usado pela exclusion constraint (Postgres) e pelos triggers equivalentes (SQLite)
+RESERVATION_NO_OVERLAP = "reservations_no_overlap"
+
 
 class Property(Base):
     __tablename__ = "properties"
+    __table_args__ = (
+        # list_properties/search: igualdade em cidade (+ bairro), faixa em capacidade e preço
+        Index(
+            "ix_properties_city_neighborhood_capacity_price",
+            "address_city",
+            "address_neighborhood",
+            "capacity",
+            "price_per_night",
+        ),
+        # filtro por estado (com ou sem cidade)
+        Index("ix_properties_state_city", "address_state", "address_city"),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     title: Mapped[str] = mapped_column(String(255), nullable=False)
 
@@ -24,15 +40,40 @@ class Property(Base):
 
 class Reservation(Base):
     __tablename__ = "reservations"
+    __table_args__ = (
+        ExcludeConstraint(
+            ("property_id", "="),
+            (
+                func.daterange(
+                    literal_column("start_date"),
+                    literal_column("end_date"),
+                    literal_column("'[]'"),
+                ),
+                "&&",
+            ),
+            name=RESERVATION_NO_OVERLAP,
+            using="gist",
+            where="is_active",
+        ).ddl_if(dialect="postgresql"),
+        # find_conflicts/anti-join nas comparações de datas, calendário e listagens por propriedade
+        Index(
+            "ix_reservations_active_property_dates",
+            "property_id",
+            "start_date",
+            "end_date",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     property_id: Mapped[int] = mapped_column(
         ForeignKey("properties.id"), nullable=False, index=True
     )
 
     client_name: Mapped[str] = mapped_column(String(255), nullable=False)
-    client_email: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    client_email: Mapped[str] = mapped_column(String(255), nullable=False)
     
     start_date: Mapped[Date] = mapped_column(Date, nullable=False)
     end_date: Mapped[Date] = mapped_column(Date, nullable=False)
@@ -47,4 +88,120 @@ class Reservation(Base):
         server_default=sql.true(),
         default=True,
     )
-    
+
+
+# busca por client_email (list_reservations): exact/prefix pelo btree em lower(),
+# contains ('%x%') pelo GIN trigram, que só existe no Postgres (pg_trgm)
+Index(
+    "ix_reservations_client_email_lower",
+    func.lower(Reservation.client_email).label("client_email_lower"),
+    postgresql_ops={"client_email_lower": "text_pattern_ops"},
+)
+Index(
+    "ix_reservations_client_email_trgm",
+    func.lower(Reservation.client_email).label("client_email_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"client_email_lower": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+
+# Stand-in da exclusion constraint para o SQLite (testes): mesma regra via trigger
+_SQLITE_OVERLAP_CHECK = """
+    WHEN NEW.is_active AND EXISTS (
+        SELECT 1 FROM reservations r
+        WHERE r.property_id = NEW.property_id
+          AND r.is_active
+          AND r.id IS NOT NEW.id
+          AND r.start_date <= NEW.end_date
+          AND r.end_date >= NEW.start_date
+    )
+    BEGIN
+        SELECT RAISE(ABORT, '{name}');
+    END
+""".format(name=RESERVATION_NO_OVERLAP)
+
+for _when in ("INSERT", "UPDATE"):
+    event.listen(
+        Reservation.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TRIGGER {RESERVATION_NO_OVERLAP}_{_when.lower()} "
+            f"BEFORE {_when} ON reservations{_SQLITE_OVERLAP_CHECK}"
+        ).execute_if(dialect="sqlite"),
+    )
+
+
+class TableVersion(Base):
+    """
+    Contador de escritas por tabela, usado nos ETags das listagens. Mantido
+    pelos triggers abaixo, então cobre todo caminho de escrita (ORM, INSERT
+    multi-linha, COPY do bulk import) sem round trip extra.
+
+    No Postgres cada conexão (backend) soma na própria linha e a versão é a
+    soma das linhas da tabela: escritas concorrentes nunca disputam o lock de
+    uma linha compartilhada, e o incremento só aparece no commit, junto com os
+    dados. `backend = 0` acumula as linhas de conexões encerradas
+    (compact_table_versions).
+    """
+    __tablename__ = "table_versions"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    backend: Mapped[int] = mapped_column(Integer, primary_key=True, server_default="0")
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+
+
+VERSIONED_TABLES = ("properties", "reservations")
+
+# no metadata (e não em cada tabela) para rodar depois de todas existirem; o
+# metadata dispara after_create em todo create_all, então tudo aqui é idempotente
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(
+        "INSERT INTO table_versions (name, backend, version) VALUES "
+        + ", ".join(f"('{name}', 0, 0)" for name in VERSIONED_TABLES)
+        + " ON CONFLICT DO NOTHING"
+    ),
+)
+event.listen(
+    Base.metadata,
+    "after_create",
+    DDL(
+        """
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO table_versions (name, backend, version)
+            VALUES (TG_TABLE_NAME, pg_backend_pid(), 1)
+            ON CONFLICT (name, backend) DO UPDATE SET version = table_versions.version + 1;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    ).execute_if(dialect="postgresql"),
+)
+for _table in VERSIONED_TABLES:
+    # Postgres: uma vez por statement (um INSERT de 5000 linhas conta 1)
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(f"DROP TRIGGER IF EXISTS {_table}_bump_version ON {_table}").execute_if(dialect="postgresql"),
+    )
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(
+            f"CREATE TRIGGER {_table}_bump_version "
+            f"AFTER INSERT OR UPDATE OR DELETE ON {_table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+        ).execute_if(dialect="postgresql"),
+    )
+    # SQLite só tem trigger por linha (e um escritor por vez: basta a linha 0)
+    for _when in ("INSERT", "UPDATE", "DELETE"):
+        event.listen(
+            Base.metadata,
+            "after_create",
+            DDL(
+                f"CREATE TRIGGER IF NOT EXISTS {_table}_bump_version_{_when.lower()} AFTER {_when} ON {_table} "
+                f"BEGIN UPDATE table_versions SET version = version + 1 WHERE name = '{_table}' AND backend = 0; END"
+            ).execute_if(dialect="sqlite"),
+        )
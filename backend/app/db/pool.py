@@ -0,0 +1,85 @@
+"""
+Pools instrumentados: contam checkouts e o tempo que cada um esperou por uma
+conexão livre. Junto com o estado do pool (em uso, overflow) é o que mostra se
+o pool ou o threadpool estão subdimensionados.
+"""
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+
+class PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.waiting = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def start(self) -> float:
+        with self._lock:
+            self.waiting += 1
+        return time.perf_counter()
+
+    def finish(self, started: float, outcome: str) -> None:
+        """outcome: "ok", "timeout" ou "error" (falha ao conectar)."""
+        waited = time.perf_counter() - started
+        with self._lock:
+            self.waiting -= 1
+            if outcome == "timeout":
+                self.timeouts += 1
+            if outcome != "ok":
+                return
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def snapshot(self, pool: Pool) -> Dict[str, float]:
+        with self._lock:
+            out = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "waiting": self.waiting,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+        if isinstance(pool, QueuePool):
+            out.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return out
+
+
+class _InstrumentedMixin:
+    # compartilhado pelas instâncias recriadas em engine.dispose()
+    stats: PoolStats
+
+    def _do_get(self):
+        started = self.stats.start()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.finish(started, "timeout")
+            raise
+        except BaseException:
+            self.stats.finish(started, "error")
+            raise
+        self.stats.finish(started, "ok")
+        return conn
+
+
+def instrumented(pool_class: type) -> type:
+    """Subclasse de `pool_class` com o seu próprio PoolStats."""
+    return type(
+        f"Instrumented{pool_class.__name__}",
+        (_InstrumentedMixin, pool_class),
+        {"stats": PoolStats()},
+    )
+
@@ -0,0 +1,85 @@
+"""
+Contagem de statements por trecho de código.
+
+- count_queries / query_budget: context managers para testes e scripts
+  ("POST /reservations faz no máximo 1 statement").
+- RepeatedQueryDetector: em modo dev (QUERY_REPEAT_DETECTOR=1) registra, ao
+  fim de cada requisição, statements idênticos repetidos — o padrão de N+1 de
+  um loop que consulta linha a linha.
+"""
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, List, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+from app.settings import settings
+
+logger = logging.getLogger("app.db.queries")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, min_repeats: int = 2) -> List[tuple]:
+        """(statement, vezes) dos statements que apareceram `min_repeats` vezes ou mais."""
+        return [(sql, n) for sql, n in Counter(self.statements).most_common() if n >= min_repeats]
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(bind: Union[Engine, Connection]) -> Iterator[QueryCounter]:
+    """Conta os statements enviados ao banco por `bind` dentro do bloco."""
+    counter = QueryCounter()
+    event.listen(bind, "before_cursor_execute", counter._record)
+    try:
+        yield counter
+    finally:
+        event.remove(bind, "before_cursor_execute", counter._record)
+
+
+@contextmanager
+def query_budget(bind: Union[Engine, Connection], max_statements: int) -> Iterator[QueryCounter]:
+    """Falha se o bloco enviar mais de `max_statements` statements."""
+    with count_queries(bind) as counter:
+        yield counter
+    if counter.count > max_statements:
+        listing = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(counter.statements, 1))
+        raise QueryBudgetExceeded(
+            f"{counter.count} statements, orçamento de {max_statements}:\n{listing}"
+        )
+
+
+class RepeatedQueryDetector:
+    def __init__(self, enabled: bool = False, threshold: int = 3):
+        self.enabled = enabled
+        self.threshold = threshold
+
+    def report(self, route: str, statements: Counter) -> List[tuple]:
+        """Loga (e devolve) os statements repetidos `threshold` vezes ou mais."""
+        repeated = [(sql, n) for sql, n in statements.most_common() if n >= self.threshold]
+        for sql, n in repeated:
+            logger.warning("possível N+1 em %s: statement repetido %d vezes: %s", route, n, sql)
+        return repeated
+
+
+repeated_query_detector = RepeatedQueryDetector(
+    enabled=settings.query_repeat_detector,
+    threshold=settings.query_repeat_threshold,
+)
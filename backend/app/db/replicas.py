@@ -0,0 +1,156 @@
+"""
+Réplicas de leitura (DATABASE_REPLICA_URLS).
+
+- ReplicaSet: round-robin entre as réplicas saudáveis. Uma réplica que falha
+  no checkout sai da rotação por `retry_after` segundos; sem nenhuma saudável,
+  a leitura vai para o primário.
+- Read your writes (READ_YOUR_WRITES_SECONDS > 0): depois de uma requisição
+  bem-sucedida que commitou uma escrita, o cliente recebe um cookie e,
+  enquanto ele valer, suas leituras vão para o primário, sem depender do lag
+  da réplica. O cookie carrega o próprio prazo, então funciona com vários
+  workers. Quem decide é a sessão (flush, INSERT/UPDATE/DELETE ou
+  note_write() seguidos de commit), não o método HTTP: POSTs só de leitura,
+  como /quotes, não marcam o cliente.
+- Sessões de réplica levam info["read_replica"]: os caches em memória
+  (listagem, calendário) só guardam leituras do primário, senão um resultado
+  atrasado ficaria guardado sob a geração que a escrita já incrementou.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Generic, Iterator, List, Optional, Sequence, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.requests import HTTPConnection
+
+E = TypeVar("E")
+
+PRIMARY_COOKIE = "db_read_primary_until"
+
+# escritas commitadas na requisição em curso; None fora do ReadYourWritesMiddleware
+_request_writes: ContextVar[Optional[list]] = ContextVar("request_writes", default=None)
+
+
+class ReplicaSet(Generic[E]):
+    def __init__(
+        self,
+        engines: Sequence[E],
+        retry_after: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.engines: List[E] = list(engines)
+        self.retry_after = retry_after
+        self._clock = clock
+        self._down_until: Dict[int, float] = {}
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def candidates(self) -> Iterator[E]:
+        """Réplicas saudáveis, começando pela próxima da vez (round-robin)."""
+        if not self.engines:
+            return
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.engines)
+        now = self._clock()
+        for offset in range(len(self.engines)):
+            i = (start + offset) % len(self.engines)
+            if self._down_until.get(i, 0.0) <= now:
+                yield self.engines[i]
+
+    def mark_down(self, engine: E) -> None:
+        self._down_until[self.engines.index(engine)] = self._clock() + self.retry_after
+
+    def status(self) -> List[dict]:
+        now = self._clock()
+        return [
+            {"replica": i, "healthy": self._down_until.get(i, 0.0) <= now}
+            for i in range(len(self.engines))
+        ]
+
+
+def note_write(session: Session) -> None:
+    """Marca a transação de `session` como escrita (para o que não passa pelo ORM, ex.: COPY)."""
+    if _request_writes.get() is not None:
+        session.info["rw_pending_write"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _flushed(session, flush_context):
+    note_write(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _executed(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        note_write(orm_execute_state.session)
+
+
+@event.listens_for(Session, "after_commit")
+def _committed(session):
+    if session.info.pop("rw_pending_write", False):
+        writes = _request_writes.get()
+        if writes is not None:
+            writes.append(True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _rolled_back(session):
+    session.info.pop("rw_pending_write", None)
+
+
+def from_replica(session) -> bool:
+    """A sessão lê de uma réplica (get_read_db): o resultado pode estar atrasado e não vai para caches."""
+    return session.info.get("read_replica", False)
+
+
+def wants_primary(conn: HTTPConnection) -> bool:
+    """O cliente escreveu há pouco (cookie de read your writes ainda válido)."""
+    value = conn.cookies.get(PRIMARY_COOKIE)
+    if not value:
+        return False
+    try:
+        return float(value) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app, window_seconds: float):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        writes: list = []
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400 and writes:
+                until = time.time() + self.window_seconds
+                cookie = (
+                    f"{PRIMARY_COOKIE}={until:.3f}; Max-Age={int(self.window_seconds) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"set-cookie", cookie.encode("latin-1"))]
+            await send(message)
+
+        token = _request_writes.set(writes)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_writes.reset(token)
+
+
+def read_target(replicas: ReplicaSet, conn: Optional[HTTPConnection]) -> Iterator:
+    """Réplicas a tentar, em ordem; vazio = ler do primário."""
+    if not replicas or (conn is not None and wants_primary(conn)):
+        return iter(())
+    return replicas.candidates()
@@ -1,5 +1,6 @@
 from decimal import Decimal
 from datetime import date
+from typing import Literal, Optional
 from pydantic import (
     BaseModel,
     Field,
@@ -62,3 +63,135 @@ class ReservationCreateResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True, extra="forbid")
     message: str
     reservation: ReservationOut
+
+
+class ReservationBatchCreate(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    mode: Literal["all_or_nothing", "best_effort"] = Field(
+        "best_effort", description="all_or_nothing: qualquer erro cancela o lote inteiro"
+    )
+    items: list[ReservationCreate] = Field(..., min_length=1, max_length=1000)
+
+
+class ReservationBatchItemResult(BaseModel):
+    index: int
+    status_code: int
+    detail: Optional[str] = None
+    reservation: Optional[ReservationOut] = None
+
+
+class ReservationBatchResponse(BaseModel):
+    mode: str
+    created: int
+    failed: int
+    results: list[ReservationBatchItemResult]
+
+
+class AvailabilityBatchItem(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    property_id: int = Field(..., description="ID da propriedade")
+    start_date: date
+    end_date: date
+    guests_quantity: conint(ge=1)
+
+
+class AvailabilityBatchRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    items: list[AvailabilityBatchItem] = Field(..., min_length=1, max_length=1000)
+
+
+class AvailabilityBatchItemResult(BaseModel):
+    index: int
+    available: bool
+    status_code: int
+    detail: Optional[str] = None
+
+
+class AvailabilityBatchResponse(BaseModel):
+    checked: int
+    available: int
+    unavailable: int
+    results: list[AvailabilityBatchItemResult]
+
+
+class QuoteItem(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    property_id: int = Field(..., description="ID da propriedade")
+    start_date: date
+    end_date: date
+
+
+class QuoteOverride(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    property_id: int = Field(..., description="ID da propriedade")
+    price_per_night: condecimal(max_digits=10, decimal_places=2, ge=Decimal("0"))
+    start_date: Optional[date] = Field(None, description="Primeira noite da regra (inclusiva)")
+    end_date: Optional[date] = Field(None, description="Última noite da regra (inclusiva)")
+    weekdays: Optional[list[conint(ge=0, le=6)]] = Field(
+        None, min_length=1, description="Só nestes dias da semana da noite (0 = segunda, 4 e 5 = sexta e sábado)"
+    )
+
+
+class QuoteRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    items: list[QuoteItem] = Field(..., min_length=1, max_length=5000)
+    overrides: list[QuoteOverride] = Field(
+        default_factory=list,
+        max_length=1000,
+        description="Preços por data; a última regra que cobre a noite vale",
+    )
+
+
+class QuoteItemResult(BaseModel):
+    index: int
+    status_code: int
+    detail: Optional[str] = None
+    property_id: int
+    start_date: date
+    end_date: date
+    nights: Optional[int] = None
+    total_price: Optional[Decimal] = None
+
+
+class QuoteResponse(BaseModel):
+    quoted: int
+    failed: int
+    results: list[QuoteItemResult]
+
+
+class BulkImportError(BaseModel):
+    line: int
+    errors: list[str]
+
+
+class BulkImportReport(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    errors: list[BulkImportError]
+    errors_truncated: bool = False
+
+
+class CalendarRange(BaseModel):
+    start: date
+    end: date
+
+
+class PropertyCalendarOut(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    property_id: int
+    start: date = Field(..., alias="from")
+    end: date = Field(..., alias="to")
+    occupied: Optional[list[CalendarRange]] = None
+    free: Optional[list[CalendarRange]] = None
+    bitmap: Optional[str] = Field(
+        None, description="Um caractere por dia a partir de `from`: 1 = ocupado, 0 = livre"
+    )
+
+
+class NextAvailableOut(BaseModel):
+    property_id: int
+    start_date: date = Field(..., description="Entrada")
+    end_date: date = Field(..., description="Saída")
+    nights: int
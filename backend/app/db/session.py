@@ -1,14 +1,104 @@
+from typing import Any, Dict, Optional
+
+from fastapi import Depends, Request
 from sqlalchemy import create_engine
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.db.base import Base  # seu declarative_base
+from app.db.pool import instrumented
+from app.db.replicas import ReplicaSet, read_target
+from app.db.slow_query import slow_query_log
+from app.metrics import instrument_engine, registry
+from app.settings import Settings, settings
+
+SQLALCHEMY_DATABASE_URL = settings.database_url
+ASYNC_SQLALCHEMY_DATABASE_URL = settings.async_database_url
+
 
-SQLALCHEMY_DATABASE_URL = "postgresql+psycopg2://user:password@db:5432/appdb"
+def engine_options(cfg: Settings, async_mode: bool = False) -> Dict[str, Any]:
+    options: Dict[str, Any] = {
+        "poolclass": instrumented(AsyncAdaptedQueuePool if async_mode else QueuePool),
+        "pool_size": cfg.db_pool_size,
+        "max_overflow": cfg.db_max_overflow,
+        "pool_timeout": cfg.db_pool_timeout,
+        "pool_pre_ping": cfg.db_pool_pre_ping,
+        "pool_recycle": cfg.db_pool_recycle,
+    }
+    if cfg.db_statement_timeout_ms:
+        timeout = str(cfg.db_statement_timeout_ms)
+        options["connect_args"] = (
+            {"server_settings": {"statement_timeout": timeout}}
+            if async_mode
+            else {"options": f"-c statement_timeout={timeout}"}
+        )
+    return options
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(settings))
 
 # fábrica de sessões
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# engine/sessões do modo async (DB_ASYNC=1): as rotas não ocupam o threadpool
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, **engine_options(settings, async_mode=True))
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+# réplicas de leitura (get_read_db / get_async_read_db); sem réplicas, tudo no primário
+replica_engines = [create_engine(url, **engine_options(settings)) for url in settings.db_replica_urls]
+async_replica_engines = [
+    create_async_engine(url, **engine_options(settings, async_mode=True))
+    for url in settings.async_replica_urls
+]
+read_replicas = ReplicaSet(replica_engines, retry_after=settings.db_replica_retry_after)
+async_read_replicas = ReplicaSet(async_replica_engines, retry_after=settings.db_replica_retry_after)
+
+for _sync_engine in [engine, *replica_engines, async_engine.sync_engine,
+                     *(e.sync_engine for e in async_replica_engines)]:
+    instrument_engine(_sync_engine)
+    slow_query_log.attach(_sync_engine)
+
+
+def pool_stats() -> Dict[str, Dict[str, float]]:
+    stats = {
+        "sync": engine.pool.stats.snapshot(engine.pool),
+        "async": async_engine.pool.stats.snapshot(async_engine.pool),
+    }
+    for i, replica in enumerate(replica_engines):
+        stats[f"replica{i}"] = replica.pool.stats.snapshot(replica.pool)
+    for i, replica in enumerate(async_replica_engines):
+        stats[f"async_replica{i}"] = replica.pool.stats.snapshot(replica.pool)
+    return stats
+
+
+def replica_status() -> Dict[str, list]:
+    return {"sync": read_replicas.status(), "async": async_read_replicas.status()}
+
+
+_POOL_METRICS = {
+    "checked_out": ("db_pool_checked_out", "gauge", "Conexões em uso."),
+    "overflow": ("db_pool_overflow", "gauge", "Conexões de overflow abertas."),
+    "waiting": ("db_pool_waiting", "gauge", "Checkouts esperando uma conexão livre."),
+    "checkouts": ("db_pool_checkouts_total", "counter", "Checkouts concluídos."),
+    "timeouts": ("db_pool_timeouts_total", "counter", "Checkouts que estouraram DB_POOL_TIMEOUT."),
+    "wait_seconds_total": ("db_pool_wait_seconds_total", "counter", "Tempo total esperando conexão."),
+}
+
+
+def _pool_metrics():
+    for engine_name, stats in pool_stats().items():
+        for key, (name, kind, help) in _POOL_METRICS.items():
+            if key in stats:
+                yield name, help, kind, {"engine": engine_name}, stats[key]
+
+
+registry.add_collector(_pool_metrics)
+
 
 def init_db():
     Base.metadata.create_all(bind=engine)
@@ -20,3 +110,59 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# ---------- LEITURA EM RÉPLICA ----------
+# a sessão do primário vem de get_db/get_async_db (e dos overrides dos testes);
+# só abre conexão se nenhuma réplica atender
+
+def _replica_session(request: Request) -> Optional[Session]:
+    for replica in read_target(read_replicas, request):
+        db = SessionLocal(bind=replica, info={"read_replica": True})
+        try:
+            db.connection()
+            return db
+        except (DBAPIError, OSError):
+            db.close()
+            read_replicas.mark_down(replica)
+    return None
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    """Sessão para rotas só de leitura: uma réplica saudável ou o primário."""
+    replica_db = _replica_session(request)
+    if replica_db is None:
+        yield db
+        return
+    try:
+        yield replica_db
+    finally:
+        replica_db.close()
+
+
+async def _async_replica_session(request: Request) -> Optional[AsyncSession]:
+    for replica in read_target(async_read_replicas, request):
+        db = AsyncSessionLocal(bind=replica, info={"read_replica": True})
+        try:
+            await db.connection()
+            return db
+        except (DBAPIError, OSError):
+            await db.close()
+            async_read_replicas.mark_down(replica)
+    return None
+
+
+async def get_async_read_db(request: Request, db: AsyncSession = Depends(get_async_db)):
+    replica_db = await _async_replica_session(request)
+    if replica_db is None:
+        yield db
+        return
+    try:
+        yield replica_db
+    finally:
+        await replica_db.close()
@@ -0,0 +1,167 @@
+"""
+Log de consultas lentas (SLOW_QUERY_MS > 0).
+
+Cada statement acima do limite vira um warning em `app.db.slow_query` com o
+SQL normalizado, o formato dos parâmetros (tipos, nunca valores: e-mails e
+nomes de clientes não vão para o log), a rota que o disparou e a duração.
+
+Com SLOW_QUERY_EXPLAIN_SAMPLE > 0, essa fração das consultas lentas também
+grava o plano em SLOW_QUERY_PLAN_FILE: EXPLAIN (ANALYZE, BUFFERS) no Postgres,
+EXPLAIN QUERY PLAN no SQLite. ANALYZE executa o statement de novo, por isso só
+SELECTs são explicados com ANALYZE, dentro de um SAVEPOINT para que uma falha
+no EXPLAIN não aborte a transação da requisição. Consultas com WITH podem ter
+INSERT/UPDATE/DELETE nas CTEs: recebem só o EXPLAIN, sem executar.
+"""
+import logging
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.metrics import current_route
+from app.settings import settings
+
+logger = logging.getLogger("app.db.slow_query")
+
+_EXPLAIN_PREFIX = {
+    "postgresql": "EXPLAIN (ANALYZE, BUFFERS) ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+# só o plano estimado: o statement não roda
+_PLAN_ONLY_PREFIX = {
+    "postgresql": "EXPLAIN ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+_WHITESPACE = re.compile(r"\s+")
+# IN expandido pelo SQLAlchemy: uma lista de placeholders por tamanho de lista
+_PLACEHOLDER = r"(?:\?|\$\d+|%s|%\(\w+\)s|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_SELECT = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+_WITH = re.compile(r"^\s*WITH\b", re.IGNORECASE)
+
+
+def explain_prefix(dialect: str, statement: str) -> Optional[str]:
+    """Prefixo do EXPLAIN para `statement`, ou None se ele não deve ser explicado."""
+    if _SELECT.match(statement):
+        return _EXPLAIN_PREFIX.get(dialect)
+    if _WITH.match(statement):
+        return _PLAN_ONLY_PREFIX.get(dialect)
+    return None
+
+
+def normalize_sql(statement: str) -> str:
+    """Uma linha só, com listas de placeholders colapsadas em (...)."""
+    return _PLACEHOLDER_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def _type_name(value: Any) -> str:
+    return "NULL" if value is None else type(value).__name__
+
+
+def param_shape(parameters: Any, executemany: bool = False) -> str:
+    """Tipos dos parâmetros, ex. {property_id: int, start_date: date} ou (int, str)."""
+    if executemany:
+        rows = list(parameters or ())
+        return f"{len(rows)} x {param_shape(rows[0]) if rows else '()'}"
+    if not parameters:
+        return "()"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {_type_name(v)}" for k, v in parameters.items()) + "}"
+    return "(" + ", ".join(_type_name(v) for v in parameters) + ")"
+
+
+class SlowQueryLog:
+    def __init__(
+        self,
+        threshold_ms: float = 0.0,
+        explain_sample: float = 0.0,
+        plan_file: str = "slow_query_plans.log",
+        sampler: Callable[[], float] = random.random,
+    ):
+        self.threshold_ms = threshold_ms
+        self.explain_sample = explain_sample
+        self.plan_file = plan_file
+        self._sampler = sampler
+        self._file_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+    def attach(self, engine: Engine) -> None:
+        if self.enabled and not event.contains(engine, "before_cursor_execute", self._before):
+            event.listen(engine, "before_cursor_execute", self._before)
+            event.listen(engine, "after_cursor_execute", self._after)
+
+    def detach(self, engine: Engine) -> None:
+        if event.contains(engine, "before_cursor_execute", self._before):
+            event.remove(engine, "before_cursor_execute", self._before)
+            event.remove(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms < self.threshold_ms:
+            return
+
+        sql = normalize_sql(statement)
+        shape = param_shape(parameters, executemany)
+        route = current_route() or "<fora de requisição>"
+        logger.warning(
+            "consulta lenta: %.1f ms em %s: %s params=%s", elapsed_ms, route, sql, shape,
+            extra={"duration_ms": elapsed_ms, "route": route, "sql": sql, "param_shape": shape},
+        )
+        if (
+            self.explain_sample > 0
+            and not executemany
+            and self._sampler() < self.explain_sample
+        ):
+            self._capture_plan(conn, statement, parameters, route, elapsed_ms, sql, shape)
+
+    def _capture_plan(self, conn, statement, parameters, route, elapsed_ms, sql, shape) -> None:
+        dialect = conn.dialect.name
+        prefix = explain_prefix(dialect, statement)
+        if prefix is None:
+            return
+        # cursor cru na mesma conexão/transação: não passa pelos hooks do engine
+        cursor = conn.connection.dbapi_connection.cursor()
+        savepoint = dialect == "postgresql"
+        try:
+            if savepoint:
+                cursor.execute("SAVEPOINT slow_query_explain")
+            try:
+                cursor.execute(prefix + statement, parameters)
+                plan = "\n".join(" | ".join(str(col) for col in row) for row in cursor.fetchall())
+            except Exception:
+                if savepoint:
+                    cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                logger.exception("falha ao capturar o plano de %s", sql)
+                return
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        finally:
+            cursor.close()
+
+        stamp = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        entry = f"-- {stamp} {route} {elapsed_ms:.1f} ms params={shape}\n-- {sql}\n{plan}\n\n"
+        with self._file_lock, open(self.plan_file, "a", encoding="utf-8") as fh:
+            fh.write(entry)
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.slow_query_ms,
+    explain_sample=settings.slow_query_explain_sample,
+    plan_file=settings.slow_query_plan_file,
+)
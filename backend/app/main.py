@@ -1,14 +1,70 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
+from fastapi import APIRouter, FastAPI
 from app.routes.properties import router as properties_router
 from app.routes.reservations import router as reservations_router
+from app.routes.properties_async import router as properties_async_router
+from app.routes.reservations_async import router as reservations_async_router
+from app.routes.quotes import router as quotes_router
 from app.routes.seed import router as seed_router
+from app.routes.health import router as health_router
+from app.routes.metrics import router as metrics_router
+from app.metrics import MetricsMiddleware
+from app.db.replicas import ReadYourWritesMiddleware
+from app.settings import settings
+
+DB_ASYNC = settings.db_async
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # rotas sync: uma thread por conexão do pool (ver Settings.threadpool_tokens)
+    to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_tokens
+    yield
+
+
+def _unshadowed(router: APIRouter, *shadowing: APIRouter) -> APIRouter:
+    """Rotas de `router` que não têm (path, método) servidos por `shadowing`."""
+    served = {
+        (route.path, method)
+        for other in shadowing
+        for route in other.routes
+        for method in route.methods
+    }
+    remaining = APIRouter()
+    remaining.routes.extend(
+        route
+        for route in router.routes
+        if not any((route.path, method) in served for method in route.methods)
+    )
+    return remaining
+
+
+def create_app(async_mode: bool = DB_ASYNC) -> FastAPI:
+    app = FastAPI(title="Challenge Zone", lifespan=lifespan)
+    if async_mode:
+        app.include_router(properties_async_router)
+        app.include_router(reservations_async_router)
+        # rotas sem versão async continuam servidas pelos routers sync
+        app.include_router(_unshadowed(properties_router, properties_async_router))
+        app.include_router(_unshadowed(reservations_router, reservations_async_router))
+    else:
+        app.include_router(properties_router)
+        app.include_router(reservations_router)
+    app.include_router(quotes_router)
+    app.include_router(seed_router)
+    app.include_router(health_router)
+    app.include_router(metrics_router)
+    if settings.read_your_writes_seconds > 0:
+        app.add_middleware(ReadYourWritesMiddleware, window_seconds=settings.read_your_writes_seconds)
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/")
+    def read_root():
+        return {"message": "Para acessar o Swagger: http://127.0.0.1:8000/docs#/"}
 
-app = FastAPI(title="Challenge Zone")
-app.include_router(properties_router)
-app.include_router(reservations_router)
-app.include_router(seed_router)
+    return app
 
 
-@app.get("/")
-def read_root():
-    return {"message": "Para acessar o Swagger: http://127.0.0.1:8000/docs#/"}
+app = create_app()
@@ -0,0 +1,269 @@
+"""
+Métricas em formato texto do Prometheus, sem dependência externa.
+
+- MetricsMiddleware (ASGI puro): latência, status e requisições em andamento
+  por rota (o template, ex. /properties/{prop_id}, não o caminho concreto).
+- instrument_engine: hooks before/after_cursor_execute que somam, por
+  requisição, quantas consultas foram feitas e quanto tempo passou no banco.
+
+O estado da requisição fica num ContextVar; as rotas sync rodam no threadpool
+com uma cópia do contexto, então enxergam o mesmo objeto.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from collections import Counter as StatementCounter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.db.query_budget import repeated_query_detector
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # por label: [contagem por bucket (+Inf no fim), soma]
+        self._series: Dict[Labels, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Labels, value: float) -> None:
+        pos = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][pos] += 1
+            series[1] += value
+
+    def count(self, labels: Labels) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def total(self, labels: Labels) -> float:
+        series = self._series.get(labels)
+        return series[1] if series else 0.0
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            items = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labels, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labels, labels)} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List = []
+        # chamados a cada scrape: tuplas (nome, help, tipo, labels, valor)
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, Dict[str, str], float]]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for collector in self._collectors:
+            declared = set()
+            # amostras da mesma família precisam sair juntas
+            for name, help, kind, labels, value in sorted(collector(), key=lambda sample: sample[0]):
+                if name not in declared:
+                    declared.add(name)
+                    lines.append(f"# HELP {name} {help}")
+                    lines.append(f"# TYPE {name} {kind}")
+                label_str = _format_labels(tuple(labels), tuple(labels.values()))
+                lines.append(f"{name}{label_str} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUESTS = registry.register(Counter(
+    "http_requests_total", "Requisições HTTP por rota e status.", ("method", "route", "status"),
+))
+LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP.", ("method", "route"),
+))
+IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight", "Requisições HTTP em andamento.", ("method",),
+))
+DB_QUERIES = registry.register(Histogram(
+    "http_request_db_queries", "Consultas SQL feitas por requisição.", ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+))
+DB_TIME = registry.register(Histogram(
+    "http_request_db_duration_seconds", "Tempo no banco por requisição.", ("method", "route"),
+))
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds", "statements", "scope")
+
+    def __init__(self, track_statements: bool = False, scope: Optional[dict] = None):
+        self.queries = 0
+        self.db_seconds = 0.0
+        # só com o detector de N+1 ligado
+        self.statements: Optional[StatementCounter] = StatementCounter() if track_statements else None
+        # a rota só é resolvida depois do roteamento, então guarda o scope
+        self.scope = scope
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def current_route() -> Optional[str]:
+    """"GET /properties/{prop_id}" da requisição em andamento, se houver."""
+    stats = _current.get()
+    if stats is None or stats.scope is None:
+        return None
+    route = stats.scope.get("route")
+    return f"{stats.scope['method']} {getattr(route, 'path', '<unmatched>')}"
+
+
+# ---------- SQLALCHEMY ----------
+
+# o início fica no ExecutionContext (um por statement): se o execute falhar,
+# não sobra nada pendurado na conexão
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current.get() is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_metrics_started", None)
+    if stats is not None and started is not None:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - started
+        if stats.statements is not None:
+            stats.statements[statement] += 1
+
+
+def instrument_engine(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def uninstrument_engine(engine: Engine) -> None:
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ---------- ASGI ----------
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_code[0] = message["status"]
+            await send(message)
+
+        stats = RequestStats(track_statements=repeated_query_detector.enabled, scope=scope)
+        token = _current.set(stats)
+        IN_FLIGHT.inc((method,))
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec((method,))
+            _current.reset(token)
+            route = scope.get("route")
+            # sem rota casada (404): um rótulo só, para não explodir a cardinalidade
+            labels = (method, getattr(route, "path", "<unmatched>"))
+            REQUESTS.inc(labels + (str(status_code[0]),))
+            LATENCY.observe(labels, elapsed)
+            DB_QUERIES.observe(labels, stats.queries)
+            DB_TIME.observe(labels, stats.db_seconds)
+            if stats.statements:
+                repeated_query_detector.report(f"{method} {labels[1]}", stats.statements)
@@ -0,0 +1,21 @@
+from anyio import to_thread
+from fastapi import APIRouter
+
+from app.db.session import pool_stats, replica_status
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/pool")
+async def pool_stats_endpoint():
+    """Estado dos pools de conexão (sync, async e réplicas), das réplicas e do threadpool das rotas sync."""
+    limiter = to_thread.current_default_thread_limiter()
+    return {
+        **pool_stats(),
+        "replicas": replica_status(),
+        "threadpool": {
+            "total_tokens": limiter.total_tokens,
+            "borrowed_tokens": limiter.borrowed_tokens,
+            "waiting": limiter.statistics().tasks_waiting,
+        },
+    }
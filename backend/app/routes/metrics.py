@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+
+from app.metrics import registry
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    return Response(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,21 +1,48 @@
-from fastapi import APIRouter, Depends, status, HTTPException, Query
-from typing import Optional, List
+from fastapi import APIRouter, Depends, status, HTTPException, Query, Request, Response
+from typing import AsyncIterator, Iterator, Literal, Optional, List
 from datetime import date
+import codecs
+from anyio import from_thread
 from sqlalchemy.orm import Session
-from app.db.schema import PropertyCreate, PropertyOut,PropertyMessageResponse
+from starlette.concurrency import run_in_threadpool
+from app.db.schema import (
+    AvailabilityBatchRequest,
+    AvailabilityBatchResponse,
+    BulkImportReport,
+    NextAvailableOut,
+    PropertyCalendarOut,
+    PropertyCreate,
+    PropertyMessageResponse,
+    PropertyOut,
+)
+from app.service.bulk_import import BULK_CHUNK_ROWS, PropertyImporter
+from app.service.availability_batch import check_availability_batch
+from app.service.calendar import MAX_CALENDAR_DAYS, next_available, property_calendar
 from app.service.property import (
     create_property,
-    list_properties,
+    list_properties_json,
+    parse_property_fields,
+    search_available_properties,
+    search_next_available,
     delete_property_by_id,
     check_availability,
 )
-from app.db.session import get_db
+from app.service.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    resolve_after_id,
+    set_next_page_headers,
+    split_page,
+)
+from app.service.table_version import get_table_version, make_etag, not_modified
+from app.db.session import get_db, get_read_db
 
 router = APIRouter(prefix="/properties", tags=["properties"])
 
 
 @router.get("/list", response_model=List[PropertyOut])
 def list_properties_endpoint(
+    request: Request,
     address_neighborhood: Optional[str] = Query(None, description="Filtro por Bairro"),
     address_city: Optional[str] = Query(None, description="Filtro por cidade"),
     address_state: Optional[str] = Query(None, description="Filtro por estado"),
@@ -23,16 +50,74 @@ def list_properties_endpoint(
         None, ge=0, description="Capacidade maxima de pessoas"
     ),
     price_per_night: Optional[int] = Query(None, ge=0, description="Valor maximo"),
-    db: Session = Depends(get_db),
+    after_id: Optional[int] = Query(None, ge=0, description="Lista a partir deste id (exclusivo)"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco da próxima página (X-Next-Cursor)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Itens por página"),
+    fields: Optional[str] = Query(
+        None, description="Campos a devolver, separados por vírgula (ex.: id,title,price_per_night)"
+    ),
+    db: Session = Depends(get_read_db),
 ):
-    return list_properties(
+    selected = parse_property_fields(fields)
+    etag = make_etag(request, "properties", get_table_version(db, "properties"))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    body, next_after_id = list_properties_json(
         db,
         address_neighborhood=address_neighborhood,
         address_city=address_city,
         address_state=address_state,
         capacity=capacity,
         price_per_night=price_per_night,
+        after_id=resolve_after_id(after_id, cursor),
+        limit=limit,
+        fields=selected,
+    )
+    # corpo já serializado (e possivelmente vindo do cache): vai direto, sem o response_model
+    response = Response(content=body, media_type="application/json", headers={"ETag": etag})
+    set_next_page_headers(request, response, next_after_id)
+    return response
+
+
+@router.get("/search", response_model=List[PropertyOut])
+def search_properties_endpoint(
+    request: Request,
+    response: Response,
+    start_date: date = Query(..., description="Data de início da reserva (YYYY-MM-DD)"),
+    end_date: date = Query(..., description="Data final da reserva (YYYY-MM-DD)"),
+    guests: int = Query(..., ge=1, description="Quantidade de pessoas para a reserva"),
+    address_neighborhood: Optional[str] = Query(None, description="Filtro por Bairro"),
+    address_city: Optional[str] = Query(None, description="Filtro por cidade"),
+    address_state: Optional[str] = Query(None, description="Filtro por estado"),
+    price_per_night: Optional[int] = Query(None, ge=0, description="Valor maximo"),
+    after_id: Optional[int] = Query(None, ge=0, description="Lista a partir deste id (exclusivo)"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco da próxima página (X-Next-Cursor)"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE, description="Itens por página"),
+    db: Session = Depends(get_read_db),
+):
+    if end_date <= start_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A data final deve ser maior que a data inicial",
+        )
+
+    rows = search_available_properties(
+        db,
+        start_date=start_date,
+        end_date=end_date,
+        guests=guests,
+        address_neighborhood=address_neighborhood,
+        address_city=address_city,
+        address_state=address_state,
+        price_per_night=price_per_night,
+        after_id=resolve_after_id(after_id, cursor),
+        limit=limit + 1,
     )
+    page, next_after_id = split_page(rows, limit)
+    set_next_page_headers(request, response, next_after_id)
+    return page
 
 
 @router.get("/availability", response_model=PropertyMessageResponse)
@@ -45,7 +130,7 @@ def check_availability_endpoint(
     guests_quantity: int = Query(
         None, description="Quantidade de pessoas para a reserva"
     ),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     if not all([property_id, start_date, end_date, guests_quantity]):
         raise HTTPException(
@@ -58,6 +143,76 @@ def check_availability_endpoint(
     return {"message": "A propriedade encontra-se disponível para as datas verificadas."}
 
 
+@router.post("/availability/batch", response_model=AvailabilityBatchResponse)
+def check_availability_batch_endpoint(
+    payload: AvailabilityBatchRequest,
+    db: Session = Depends(get_read_db),
+):
+    return check_availability_batch(db, payload.items)
+
+
+@router.get(
+    "/{property_id}/calendar",
+    response_model=PropertyCalendarOut,
+    response_model_exclude_none=True,
+)
+def property_calendar_endpoint(
+    property_id: int,
+    start: date = Query(..., alias="from", description="Primeiro dia (YYYY-MM-DD)"),
+    end: date = Query(..., alias="to", description="Último dia, inclusivo (YYYY-MM-DD)"),
+    format: Literal["ranges", "bitmap"] = Query(
+        "ranges", description="ranges: períodos ocupados e livres; bitmap: um caractere por dia"
+    ),
+    db: Session = Depends(get_read_db),
+):
+    return property_calendar(db, property_id, start, end, format)
+
+
+
+@router.get("/next-available", response_model=List[NextAvailableOut])
+def search_next_available_endpoint(
+    request: Request,
+    response: Response,
+    nights: int = Query(..., ge=1, lt=MAX_CALENDAR_DAYS, description="Quantidade de noites"),
+    start: date = Query(..., alias="from", description="Primeira entrada possível (YYYY-MM-DD)"),
+    end: date = Query(..., alias="to", description="Última saída possível (YYYY-MM-DD)"),
+    guests: Optional[int] = Query(None, ge=1, description="Quantidade de pessoas para a reserva"),
+    address_neighborhood: Optional[str] = Query(None, description="Filtro por Bairro"),
+    address_city: Optional[str] = Query(None, description="Filtro por cidade"),
+    address_state: Optional[str] = Query(None, description="Filtro por estado"),
+    price_per_night: Optional[int] = Query(None, ge=0, description="Valor maximo"),
+    after_id: Optional[int] = Query(None, ge=0, description="Lista a partir deste id (exclusivo)"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco da próxima página (X-Next-Cursor)"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE, description="Itens por página"),
+    db: Session = Depends(get_read_db),
+):
+    page, next_after_id = search_next_available(
+        db,
+        nights,
+        start,
+        end,
+        guests=guests,
+        address_neighborhood=address_neighborhood,
+        address_city=address_city,
+        address_state=address_state,
+        price_per_night=price_per_night,
+        after_id=resolve_after_id(after_id, cursor),
+        limit=limit,
+    )
+    set_next_page_headers(request, response, next_after_id)
+    return page
+
+
+@router.get("/{property_id}/next-available", response_model=NextAvailableOut)
+def next_available_endpoint(
+    property_id: int,
+    nights: int = Query(..., ge=1, lt=MAX_CALENDAR_DAYS, description="Quantidade de noites"),
+    start: date = Query(..., alias="from", description="Primeira entrada possível (YYYY-MM-DD)"),
+    end: date = Query(..., alias="to", description="Última saída possível (YYYY-MM-DD)"),
+    db: Session = Depends(get_read_db),
+):
+    return next_available(db, property_id, nights, start, end)
+
 
 @router.post("", response_model=PropertyOut, status_code=status.HTTP_201_CREATED)
 def create_property_endpoint(payload: PropertyCreate, db: Session = Depends(get_db)):
@@ -67,6 +222,40 @@ def create_property_endpoint(payload: PropertyCreate, db: Session = Depends(get_
         raise HTTPException(status_code=409, detail=str(e))
 
 
+def _body_lines(stream: AsyncIterator[bytes]) -> Iterator[str]:
+    """Linhas do corpo (com a quebra), lendo o stream async de dentro do threadpool."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    while True:
+        try:
+            chunk = from_thread.run(stream.__anext__)
+        except StopAsyncIteration:
+            break
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+@router.post("/bulk", response_model=BulkImportReport)
+async def bulk_import_properties_endpoint(
+    request: Request,
+    format: Optional[Literal["ndjson", "csv"]] = Query(
+        None, description="Formato do corpo; padrão pelo Content-Type (text/csv ou NDJSON)"
+    ),
+    db: Session = Depends(get_db),
+):
+    fmt = format or ("csv" if "csv" in request.headers.get("content-type", "") else "ndjson")
+    importer = PropertyImporter(db, fmt)
+
+    # o corpo é lido em streaming por um único parser (CSV com quebras entre aspas);
+    # parse, validação e gravação em lotes rodam no threadpool
+    return await run_in_threadpool(importer.run, _body_lines(request.stream()), BULK_CHUNK_ROWS)
+
+
 @router.delete("/{property_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_property_endpoint(property_id: int, db: Session = Depends(get_db)):
     try:
@@ -0,0 +1,191 @@
+from fastapi import APIRouter, Depends, status, HTTPException, Query, Request, Response
+from typing import Literal, Optional, List
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.schema import (
+    AvailabilityBatchRequest,
+    AvailabilityBatchResponse,
+    NextAvailableOut,
+    PropertyCalendarOut,
+    PropertyCreate,
+    PropertyMessageResponse,
+    PropertyOut,
+)
+from app.service.availability_batch import check_availability_batch_async
+from app.service.calendar import MAX_CALENDAR_DAYS, next_available_async, property_calendar_async
+from app.service.property import (
+    create_property_async,
+    list_properties_json_async,
+    parse_property_fields,
+    search_next_available_async,
+    delete_property_by_id_async,
+    check_availability_async,
+)
+from app.service.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    resolve_after_id,
+    set_next_page_headers,
+)
+from app.service.table_version import get_table_version_async, make_etag, not_modified
+from app.db.session import get_async_db, get_async_read_db
+
+# Mesmas rotas de app.routes.properties, servidas pelo AsyncSession (DB_ASYNC=1)
+router = APIRouter(prefix="/properties", tags=["properties"])
+
+
+@router.get("/list", response_model=List[PropertyOut])
+async def list_properties_endpoint(
+    request: Request,
+    address_neighborhood: Optional[str] = Query(None, description="Filtro por Bairro"),
+    address_city: Optional[str] = Query(None, description="Filtro por cidade"),
+    address_state: Optional[str] = Query(None, description="Filtro por estado"),
+    capacity: Optional[int] = Query(
+        None, ge=0, description="Capacidade maxima de pessoas"
+    ),
+    price_per_night: Optional[int] = Query(None, ge=0, description="Valor maximo"),
+    after_id: Optional[int] = Query(None, ge=0, description="Lista a partir deste id (exclusivo)"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco da próxima página (X-Next-Cursor)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Itens por página"),
+    fields: Optional[str] = Query(
+        None, description="Campos a devolver, separados por vírgula (ex.: id,title,price_per_night)"
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    selected = parse_property_fields(fields)
+    etag = make_etag(request, "properties", await get_table_version_async(db, "properties"))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    body, next_after_id = await list_properties_json_async(
+        db,
+        address_neighborhood=address_neighborhood,
+        address_city=address_city,
+        address_state=address_state,
+        capacity=capacity,
+        price_per_night=price_per_night,
+        after_id=resolve_after_id(after_id, cursor),
+        limit=limit,
+        fields=selected,
+    )
+    # corpo já serializado (e possivelmente vindo do cache): vai direto, sem o response_model
+    response = Response(content=body, media_type="application/json", headers={"ETag": etag})
+    set_next_page_headers(request, response, next_after_id)
+    return response
+
+
+@router.get("/availability", response_model=PropertyMessageResponse)
+async def check_availability_endpoint(
+    property_id: int = Query(None, description="Id da propriedade"),
+    start_date: date = Query(
+        None, description="Data de início da reserva (YYYY-MM-DD)"
+    ),
+    end_date: date = Query(None, description="Data final da reserva (YYYY-MM-DD)"),
+    guests_quantity: int = Query(
+        None, description="Quantidade de pessoas para a reserva"
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    if not all([property_id, start_date, end_date, guests_quantity]):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Todos os dados devem estar preenchidos",
+        )
+
+    await check_availability_async(db, property_id, start_date, end_date, guests_quantity)
+
+    return {"message": "A propriedade encontra-se disponível para as datas verificadas."}
+
+
+@router.post("/availability/batch", response_model=AvailabilityBatchResponse)
+async def check_availability_batch_endpoint(
+    payload: AvailabilityBatchRequest,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await check_availability_batch_async(db, payload.items)
+
+
+@router.get(
+    "/{property_id}/calendar",
+    response_model=PropertyCalendarOut,
+    response_model_exclude_none=True,
+)
+async def property_calendar_endpoint(
+    property_id: int,
+    start: date = Query(..., alias="from", description="Primeiro dia (YYYY-MM-DD)"),
+    end: date = Query(..., alias="to", description="Último dia, inclusivo (YYYY-MM-DD)"),
+    format: Literal["ranges", "bitmap"] = Query(
+        "ranges", description="ranges: períodos ocupados e livres; bitmap: um caractere por dia"
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await property_calendar_async(db, property_id, start, end, format)
+
+
+@router.get("/next-available", response_model=List[NextAvailableOut])
+async def search_next_available_endpoint(
+    request: Request,
+    response: Response,
+    nights: int = Query(..., ge=1, lt=MAX_CALENDAR_DAYS, description="Quantidade de noites"),
+    start: date = Query(..., alias="from", description="Primeira entrada possível (YYYY-MM-DD)"),
+    end: date = Query(..., alias="to", description="Última saída possível (YYYY-MM-DD)"),
+    guests: Optional[int] = Query(None, ge=1, description="Quantidade de pessoas para a reserva"),
+    address_neighborhood: Optional[str] = Query(None, description="Filtro por Bairro"),
+    address_city: Optional[str] = Query(None, description="Filtro por cidade"),
+    address_state: Optional[str] = Query(None, description="Filtro por estado"),
+    price_per_night: Optional[int] = Query(None, ge=0, description="Valor maximo"),
+    after_id: Optional[int] = Query(None, ge=0, description="Lista a partir deste id (exclusivo)"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco da próxima página (X-Next-Cursor)"),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE, description="Itens por página"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    page, next_after_id = await search_next_available_async(
+        db,
+        nights,
+        start,
+        end,
+        guests=guests,
+        address_neighborhood=address_neighborhood,
+        address_city=address_city,
+        address_state=address_state,
+        price_per_night=price_per_night,
+        after_id=resolve_after_id(after_id, cursor),
+        limit=limit,
+    )
+    set_next_page_headers(request, response, next_after_id)
+    return page
+
+
+@router.get("/{property_id}/next-available", response_model=NextAvailableOut)
+async def next_available_endpoint(
+    property_id: int,
+    nights: int = Query(..., ge=1, lt=MAX_CALENDAR_DAYS, description="Quantidade de noites"),
+    start: date = Query(..., alias="from", description="Primeira entrada possível (YYYY-MM-DD)"),
+    end: date = Query(..., alias="to", description="Última saída possível (YYYY-MM-DD)"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    return await next_available_async(db, property_id, nights, start, end)
+
+
+@router.post("", response_model=PropertyOut, status_code=status.HTTP_201_CREATED)
+async def create_property_endpoint(
+    payload: PropertyCreate, db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        return await create_property_async(db, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.delete("/{property_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_property_endpoint(
+    property_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        ok = await delete_property_by_id_async(db, property_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not ok:
+        raise HTTPException(status_code=404, detail="Property not found")
+    return
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.db.schema import QuoteRequest, QuoteResponse
+from app.db.session import get_read_db
+from app.service.quotes import quote_stays
+
+router = APIRouter(prefix="/quotes", tags=["quotes"])
+
+
+# sync de propósito: o cálculo com NumPy roda no threadpool, fora do event loop
+@router.post("", response_model=QuoteResponse)
+def quote_stays_endpoint(payload: QuoteRequest, db: Session = Depends(get_read_db)):
+    return quote_stays(db, payload.items, payload.overrides)
@@ -1,25 +1,83 @@
-from fastapi import APIRouter, Depends, status, HTTPException, Query
+from fastapi import APIRouter, Depends, status, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional, List
-from app.db.session import get_db
-from app.db.schema import ReservationCreate, ReservationOut, ReservationCreateResponse
+from typing import Literal, Optional, List
+from app.service.table_version import get_table_version, make_etag, not_modified
+from app.db.session import get_db, get_read_db
+from app.db.schema import (
+    ReservationCreate,
+    ReservationOut,
+    ReservationCreateResponse,
+    ReservationBatchCreate,
+    ReservationBatchResponse,
+)
+from app.service.reservation_batch import create_reservations_batch
+from app.service.export import MEDIA_TYPES, stream_reservations
+from app.service.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    resolve_after_id,
+    set_next_page_headers,
+    split_page,
+)
 from app.service.reservation import (
-    create_reservation,
+    book_reservation,
     list_reservations,
     deactivate_reservation,
 )
-from app.service.property import check_availability
 
 router = APIRouter(prefix="/reservations", tags=["reservations"])
 
 
 @router.get("", response_model=List[ReservationOut])
 def list_reservations_endpoint(
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    client_email: str = Query(None, description="Email do cliente"),
+    property_id: int = Query(None, description="Id da propiedade"),
+    match: Literal["exact", "prefix", "contains"] = Query(
+        "contains", description="Como comparar client_email: exact, prefix ou contains"
+    ),
+    after_id: Optional[int] = Query(None, ge=0, description="Lista a partir deste id (exclusivo)"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco da próxima página (X-Next-Cursor)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Itens por página"),
+):
+    etag = make_etag(request, "reservations", get_table_version(db, "reservations"))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    rows = list_reservations(
+        db,
+        client_email,
+        property_id,
+        match=match,
+        after_id=resolve_after_id(after_id, cursor),
+        limit=limit + 1,
+    )
+    page, next_after_id = split_page(rows, limit)
+    response.headers["ETag"] = etag
+    set_next_page_headers(request, response, next_after_id)
+    return page
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_reservations_endpoint(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Formato do arquivo"),
     client_email: str = Query(None, description="Email do cliente"),
     property_id: int = Query(None, description="Id da propiedade"),
+    match: Literal["exact", "prefix", "contains"] = Query(
+        "contains", description="Como comparar client_email: exact, prefix ou contains"
+    ),
+    db: Session = Depends(get_read_db),
 ):
-    return list_reservations(db, client_email, property_id)
+    # a sessão de get_read_db só fecha depois do corpo enviado (FastAPI >= 0.118)
+    return StreamingResponse(
+        stream_reservations(db, format, client_email, property_id, match),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="reservations.{format}"'},
+    )
 
 
 @router.post(
@@ -29,16 +87,19 @@ def create_reservation_endpoint(
     payload: ReservationCreate,
     db: Session = Depends(get_db),
 ):
-    check_availability(
-        db,
-        property_id=payload.property_id,
-        start_date=payload.start_date,
-        end_date=payload.end_date,
-        guests_quantity=payload.guests_quantity,
-    )
+    try:
+        return book_reservation(db, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
 
+@router.post("/batch", response_model=ReservationBatchResponse)
+def create_reservations_batch_endpoint(
+    payload: ReservationBatchCreate,
+    db: Session = Depends(get_db),
+):
     try:
-        return create_reservation(db, payload)
+        return create_reservations_batch(db, payload.items, payload.mode)
     except ValueError as e:
         raise HTTPException(status_code=409, detail=str(e))
 
@@ -0,0 +1,77 @@
+from fastapi import APIRouter, Depends, status, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional, List
+from app.service.table_version import get_table_version_async, make_etag, not_modified
+from app.db.session import get_async_db, get_async_read_db
+from app.db.schema import ReservationCreate, ReservationOut, ReservationCreateResponse
+from app.service.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    resolve_after_id,
+    set_next_page_headers,
+    split_page,
+)
+from app.service.reservation import (
+    book_reservation_async,
+    list_reservations_async,
+    deactivate_reservation_async,
+)
+
+# Mesmas rotas de app.routes.reservations, servidas pelo AsyncSession (DB_ASYNC=1)
+router = APIRouter(prefix="/reservations", tags=["reservations"])
+
+
+@router.get("", response_model=List[ReservationOut])
+async def list_reservations_endpoint(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    client_email: str = Query(None, description="Email do cliente"),
+    property_id: int = Query(None, description="Id da propiedade"),
+    match: Literal["exact", "prefix", "contains"] = Query(
+        "contains", description="Como comparar client_email: exact, prefix ou contains"
+    ),
+    after_id: Optional[int] = Query(None, ge=0, description="Lista a partir deste id (exclusivo)"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco da próxima página (X-Next-Cursor)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Itens por página"),
+):
+    etag = make_etag(request, "reservations", await get_table_version_async(db, "reservations"))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+
+    rows = await list_reservations_async(
+        db,
+        client_email,
+        property_id,
+        match=match,
+        after_id=resolve_after_id(after_id, cursor),
+        limit=limit + 1,
+    )
+    page, next_after_id = split_page(rows, limit)
+    response.headers["ETag"] = etag
+    set_next_page_headers(request, response, next_after_id)
+    return page
+
+
+@router.post(
+    "", response_model=ReservationCreateResponse, status_code=status.HTTP_201_CREATED
+)
+async def create_reservation_endpoint(
+    payload: ReservationCreate,
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        return await book_reservation_async(db, payload)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.put("/{reservation_id}/cancel", response_model=ReservationOut)
+async def deactivate_reservation_endpoint(
+    reservation_id: int, db: AsyncSession = Depends(get_async_db)
+):
+    res = await deactivate_reservation_async(db, reservation_id)
+    if not res:
+        raise HTTPException(status_code=404, detail="Reservation not found")
+    return res
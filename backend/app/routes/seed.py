@@ -1,16 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
-from app.service.seeds import apply_full_seed
+from app.service.seeds import apply_full_seed, load_seed_manifest
+from app.settings import settings
+from app.service.synthetic import generate_dataset
 
 router = APIRouter(prefix="/seed", tags=["seed"])
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
-def run_seed(db: Session = Depends(get_db)):
+def run_seed(
+    scale: Optional[int] = Query(
+        None, ge=1, le=100,
+        description="Gera dados sintéticos (scale x 1000 propriedades) em vez da seed fixa",
+    ),
+    seed: int = Query(42, description="Semente do gerador sintético"),
+    db: Session = Depends(get_db),
+):
     try:
-        result = apply_full_seed(db)
+        if scale is not None:
+            return generate_dataset(db, scale, seed)
+        manifest = load_seed_manifest(settings.seed_manifest) if settings.seed_manifest else None
+        result = apply_full_seed(db, manifest)
         return result
     except HTTPException:
         raise
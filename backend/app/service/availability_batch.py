@@ -0,0 +1,120 @@
+"""
+Consulta de disponibilidade em lote (POST /properties/availability/batch).
+
+Mesmas regras de check_availability, mas com um resultado por item em vez de
+exceção no primeiro erro. Uma consulta com IN carrega as propriedades; os
+itens que passam nas regras sem banco vão para uma tabela VALUES juntada às
+reservas ativas por sobreposição, e os índices que casam estão indisponíveis.
+Ao todo, no máximo duas consultas por lote.
+"""
+from typing import List, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Date, Integer, Select, column, select, values
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.expressions import DateRangeOverlaps
+from app.db.models import Property, Reservation
+from app.db.schema import AvailabilityBatchItem
+from app.service.property import _validate_availability
+
+
+def _result(index: int, status_code: int, detail: Optional[str] = None) -> dict:
+    return {
+        "index": index,
+        "available": status_code == status.HTTP_200_OK,
+        "status_code": status_code,
+        "detail": detail,
+    }
+
+
+def _properties_stmt(items: List[AvailabilityBatchItem]) -> Select:
+    property_ids = sorted({item.property_id for item in items})
+    return select(Property.id, Property.capacity).where(Property.id.in_(property_ids))
+
+
+def _validate(
+    items: List[AvailabilityBatchItem], props: dict
+) -> Tuple[List[Optional[dict]], List[Tuple[int, AvailabilityBatchItem]]]:
+    """Resultado de erro por item (None = falta checar reservas) e os itens a checar."""
+
+    results: List[Optional[dict]] = [None] * len(items)
+    candidates = []
+    for index, item in enumerate(items):
+        if item.end_date < item.start_date:
+            results[index] = _result(
+                index, status.HTTP_400_BAD_REQUEST, "A data final deve ser maior que a data inicial"
+            )
+            continue
+        try:
+            _validate_availability(
+                props.get(item.property_id), item.start_date, item.end_date, item.guests_quantity
+            )
+        except HTTPException as e:
+            results[index] = _result(index, e.status_code, e.detail)
+            continue
+        candidates.append((index, item))
+    return results, candidates
+
+
+def _conflicts_stmt(candidates: List[Tuple[int, AvailabilityBatchItem]]) -> Select:
+    wanted = values(
+        column("idx", Integer),
+        column("property_id", Integer),
+        column("start_date", Date),
+        column("end_date", Date),
+        name="wanted",
+    ).data(
+        [(index, item.property_id, item.start_date, item.end_date) for index, item in candidates]
+    ).cte("wanted")
+    return (
+        select(wanted.c.idx)
+        .join(Reservation, Reservation.property_id == wanted.c.property_id)
+        .where(
+            Reservation.is_active,
+            DateRangeOverlaps(
+                Reservation.start_date, Reservation.end_date, wanted.c.start_date, wanted.c.end_date
+            ),
+        )
+        .distinct()
+    )
+
+
+def _finish(
+    results: List[Optional[dict]],
+    candidates: List[Tuple[int, AvailabilityBatchItem]],
+    conflicting: Set[int],
+) -> dict:
+    for index, _ in candidates:
+        if index in conflicting:
+            results[index] = _result(
+                index, status.HTTP_409_CONFLICT, "Período indisponível para esta propriedade"
+            )
+        else:
+            results[index] = _result(index, status.HTTP_200_OK)
+    available = sum(1 for r in results if r["available"])
+    return {
+        "checked": len(results),
+        "available": available,
+        "unavailable": len(results) - available,
+        "results": results,
+    }
+
+
+def check_availability_batch(db: Session, items: List[AvailabilityBatchItem]) -> dict:
+    props = {row.id: row for row in db.execute(_properties_stmt(items))}
+    results, candidates = _validate(items, props)
+    conflicting: Set[int] = set()
+    if candidates:
+        conflicting = set(db.execute(_conflicts_stmt(candidates)).scalars())
+    return _finish(results, candidates, conflicting)
+
+
+async def check_availability_batch_async(db: AsyncSession, items: List[AvailabilityBatchItem]) -> dict:
+    props = {row.id: row for row in await db.execute(_properties_stmt(items))}
+    results, candidates = _validate(items, props)
+    conflicting: Set[int] = set()
+    if candidates:
+        conflicting = set((await db.execute(_conflicts_stmt(candidates))).scalars())
+    return _finish(results, candidates, conflicting)
@@ -0,0 +1,163 @@
+"""
+Índice de disponibilidade em memória (opcional, AVAILABILITY_INDEX=1).
+
+Guarda, por propriedade, os períodos das reservas ativas ordenados pela data
+de início. Como a constraint reservations_no_overlap impede sobreposição entre
+reservas ativas, os fins também ficam ordenados e a checagem de conflito é
+uma busca binária (O(log n)) em vez de uma ida ao Postgres.
+
+O índice é só um atalho de leitura: a reserva em si continua sendo validada
+pelo banco (book_reservation + constraint). Cada worker tem o seu índice, por
+isso as entradas expiram após `max_age` segundos.
+"""
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.settings import settings
+
+# (start_date, end_date, reservation_id)
+Interval = Tuple[date, date, int]
+
+
+class PropertyIntervals:
+    __slots__ = ("starts", "intervals", "loaded_at")
+
+    def __init__(self, intervals: Iterable[Interval]):
+        self.intervals: List[Interval] = sorted(intervals)
+        self.starts: List[date] = [i[0] for i in self.intervals]
+        self.loaded_at = time.monotonic()
+
+    def add(self, interval: Interval) -> None:
+        pos = bisect_right(self.starts, interval[0])
+        self.starts.insert(pos, interval[0])
+        self.intervals.insert(pos, interval)
+
+    def remove(self, reservation_id: int) -> None:
+        for pos, interval in enumerate(self.intervals):
+            if interval[2] == reservation_id:
+                del self.intervals[pos]
+                del self.starts[pos]
+                return
+
+    def conflicts(self, start_date: date, end_date: date) -> List[int]:
+        # último período que começa até end_date; daí para trás, enquanto o fim
+        # alcançar start_date, há sobreposição (extremos inclusivos)
+        pos = bisect_right(self.starts, end_date) - 1
+        found = []
+        while pos >= 0 and self.intervals[pos][1] >= start_date:
+            found.append(self.intervals[pos][2])
+            pos -= 1
+        found.reverse()
+        return found
+
+
+class AvailabilityIndex:
+    def __init__(self, enabled: bool = False, max_properties: int = 10_000, max_age: float = 60.0):
+        self.enabled = enabled
+        self.max_properties = max_properties
+        self.max_age = max_age
+        self._by_property: "OrderedDict[int, PropertyIntervals]" = OrderedDict()
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._by_property)
+
+    def __contains__(self, property_id: int) -> bool:
+        return property_id in self._by_property
+
+    # ---------- LEITURA ----------
+
+    def lookup(self, property_id: int, start_date: date, end_date: date) -> Optional[List[int]]:
+        """Ids das reservas em conflito, ou None se a propriedade não está carregada."""
+        with self._lock:
+            entry = self._by_property.get(property_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.loaded_at > self.max_age:
+                del self._by_property[property_id]
+                return None
+            self._by_property.move_to_end(property_id)
+            return entry.conflicts(start_date, end_date)
+
+    # ---------- CARGA ----------
+
+    def load_token(self) -> int:
+        """Marca tirada antes de consultar o banco; ver load()."""
+        return self._writes
+
+    def load(self, property_id: int, intervals: Iterable[Interval], token: int) -> bool:
+        """
+        Carrega os períodos lidos do banco. Se alguma escrita passou pelo índice
+        depois de `token`, a leitura pode estar velha e a carga é descartada.
+        """
+        entry = PropertyIntervals(intervals)
+        with self._lock:
+            if token != self._writes:
+                return False
+            self._by_property[property_id] = entry
+            self._by_property.move_to_end(property_id)
+            while len(self._by_property) > self.max_properties:
+                self._by_property.popitem(last=False)
+        return True
+
+    def load_many(self, rows: Iterable[Tuple[int, date, date, int]], token: int) -> int:
+        """Carga a frio: linhas (property_id, start_date, end_date, reservation_id)."""
+        grouped: Dict[int, List[Interval]] = {}
+        for property_id, start_date, end_date, reservation_id in rows:
+            grouped.setdefault(property_id, []).append((start_date, end_date, reservation_id))
+        loaded = 0
+        for property_id, intervals in grouped.items():
+            if loaded >= self.max_properties or not self.load(property_id, intervals, token):
+                break
+            loaded += 1
+        return loaded
+
+    # ---------- ESCRITA ----------
+
+    def add(self, property_id: int, start_date: date, end_date: date, reservation_id: int) -> None:
+        with self._lock:
+            self._writes += 1
+            entry = self._by_property.get(property_id)
+            if entry is not None:
+                entry.add((start_date, end_date, reservation_id))
+
+    def remove(self, property_id: int, reservation_id: int) -> None:
+        with self._lock:
+            self._writes += 1
+            entry = self._by_property.get(property_id)
+            if entry is not None:
+                entry.remove(reservation_id)
+
+    def discard(self, property_id: int) -> None:
+        with self._lock:
+            self._writes += 1
+            self._by_property.pop(property_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._writes += 1
+            self._by_property.clear()
+
+    # ---------- CONSISTÊNCIA ----------
+
+    def loaded_property_ids(self) -> List[int]:
+        with self._lock:
+            return list(self._by_property)
+
+    def diverging(self, property_id: int, intervals: Iterable[Interval]) -> bool:
+        """Compara a entrada carregada com os períodos atuais do banco."""
+        with self._lock:
+            entry = self._by_property.get(property_id)
+            return entry is not None and entry.intervals != sorted(intervals)
+
+
+availability_index = AvailabilityIndex(
+    enabled=settings.availability_index,
+    max_properties=settings.availability_index_max_properties,
+    max_age=settings.availability_index_max_age,
+)
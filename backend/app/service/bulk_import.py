@@ -0,0 +1,203 @@
+"""
+Importação em massa de propriedades (NDJSON ou CSV, uma linha por registro).
+
+O corpo é lido como um único fluxo de texto (um csv.reader para o arquivo
+todo, então campos entre aspas podem ter quebras de linha) e os registros vão
+em lotes: cada lote é validado contra PropertyCreate, as linhas válidas são
+gravadas de uma vez (COPY no Postgres, executemany com insert() nos outros
+bancos) e commitadas. Linhas inválidas vão para o relatório com o número da
+linha onde o registro começa.
+
+Se o banco recusar um lote, ele é regravado em metades dentro de SAVEPOINTs
+até isolar as linhas recusadas, que entram no relatório com a mensagem do
+banco; as demais são gravadas normalmente.
+"""
+import csv
+import io
+import json
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.db.models import Property
+from app.db.replicas import note_write
+from app.db.schema import PropertyCreate
+from app.service.response_cache import property_list_cache
+
+BULK_CHUNK_ROWS = 5000
+MAX_REPORTED_ERRORS = 1000
+
+PROPERTY_COLUMNS = list(PropertyCreate.model_fields)
+
+try:
+    from psycopg2 import Error as _DriverError
+except ImportError:  # sem psycopg2 não há COPY, só erros já embrulhados pelo SQLAlchemy
+    _DriverError = DBAPIError
+
+# copy_rows fala direto com o cursor do psycopg2: os erros dele não passam pelo SQLAlchemy
+DB_ERRORS = (DBAPIError, _DriverError)
+
+
+def _db_message(e: Exception) -> str:
+    orig = getattr(e, "orig", None) or e
+    return " ".join(line.strip() for line in str(orig).splitlines() if line.strip())
+
+
+def _validation_messages(e: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(p) for p in err['loc']) or 'linha'}: {err['msg']}"
+        for err in e.errors()
+    ]
+
+
+def copy_rows(db: Session, table: str, columns: List[str], rows: Iterable[dict]) -> None:
+    """COPY ... FROM STDIN (psycopg2) das colunas `columns` de cada linha."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow([row[c] for c in columns])
+    buf.seek(0)
+
+    note_write(db)
+    dbapi_conn = db.connection().connection.dbapi_connection
+    with dbapi_conn.cursor() as cur:
+        cur.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buf,
+        )
+
+
+def supports_copy(db: Session) -> bool:
+    return db.get_bind().dialect.driver == "psycopg2"
+
+
+def load_property_rows(db: Session, rows: List[dict]) -> None:
+    """Grava linhas já validadas (sem commit)."""
+    if not rows:
+        return
+    if supports_copy(db):
+        copy_rows(db, "properties", PROPERTY_COLUMNS, rows)
+    else:
+        db.execute(insert(Property), rows)
+
+
+class PropertyImporter:
+    def __init__(self, db: Session, fmt: str):
+        self.db = db
+        self.fmt = fmt
+        self.header: Optional[List[str]] = None
+        self.received = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+
+    def _fail(self, line_no: int, messages: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line_no, "errors": messages})
+
+    def _records(self, lines: Iterable[str]) -> Iterator[Tuple[int, object]]:
+        """(linha onde o registro começa, dict ou exceção) de cada registro não vazio."""
+        if self.fmt != "csv":
+            for line_no, line in enumerate(lines, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_no, json.loads(line)
+                except ValueError as e:
+                    yield line_no, ValueError(f"JSON inválido: {e}")
+            return
+
+        reader = csv.reader(lines)
+        while True:
+            line_no = reader.line_num + 1
+            try:
+                values = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield line_no, ValueError(f"CSV inválido: {e}")
+                continue
+            if not any(values):
+                continue
+            if self.header is None:
+                self.header = values
+                continue
+            if len(values) != len(self.header):
+                message = f"esperadas {len(self.header)} colunas, recebidas {len(values)}"
+                if reader.line_num > line_no:
+                    # um registro que atravessa linhas costuma ser aspas sem fechamento
+                    message += f" (registro das linhas {line_no} a {reader.line_num})"
+                yield line_no, ValueError(message)
+                continue
+            # campo vazio = campo ausente, para valer o default (ex.: country)
+            yield line_no, {k: v for k, v in zip(self.header, values) if v != ""}
+
+    def _store(self, rows: List[Tuple[int, dict]]) -> List[Tuple[int, dict]]:
+        """Grava `rows` num SAVEPOINT; se o banco recusar, tenta cada metade. Devolve as gravadas."""
+        try:
+            with self.db.begin_nested():
+                load_property_rows(self.db, [row for _, row in rows])
+        except DB_ERRORS as e:
+            if len(rows) == 1:
+                self._fail(rows[0][0], [f"erro ao gravar: {_db_message(e)}"])
+                return []
+            middle = len(rows) // 2
+            return self._store(rows[:middle]) + self._store(rows[middle:])
+        return rows
+
+    def feed(self, records: List[Tuple[int, object]]) -> None:
+        """Processa um lote de (número da linha, registro de _records)."""
+        valid: List[Tuple[int, dict]] = []
+        for line_no, record in records:
+            self.received += 1
+            if isinstance(record, Exception):
+                self._fail(line_no, [str(record)])
+                continue
+            try:
+                valid.append((line_no, PropertyCreate.model_validate(record).model_dump()))
+            except ValidationError as e:
+                self._fail(line_no, _validation_messages(e))
+        if not valid:
+            return
+
+        stored = self._store(valid)
+        try:
+            self.db.commit()
+        except DB_ERRORS as e:
+            self.db.rollback()
+            for line_no, _ in stored:
+                self._fail(line_no, [f"erro ao gravar o lote: {_db_message(e)}"])
+            return
+        if stored:
+            property_list_cache.invalidate()
+        self.inserted += len(stored)
+
+    def run(self, lines: Iterable[str], chunk_rows: int = BULK_CHUNK_ROWS) -> dict:
+        """Importa o fluxo `lines` (linhas com a quebra, como as de um arquivo) e devolve o relatório."""
+        batch = []
+        for record in self._records(lines):
+            batch.append(record)
+            if len(batch) >= chunk_rows:
+                self.feed(batch)
+                batch = []
+        if batch:
+            self.feed(batch)
+        return self.report()
+
+    def report(self) -> dict:
+        return {
+            "received": self.received,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def import_properties(db: Session, lines: Iterable[str], fmt: str) -> dict:
+    """Versão síncrona (testes/scripts): `lines` como as de um arquivo aberto, com a quebra."""
+    return PropertyImporter(db, fmt).run(lines)
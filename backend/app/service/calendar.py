@@ -0,0 +1,294 @@
+"""
+Calendário de ocupação de uma propriedade (GET /properties/{id}/calendar).
+
+Um dia está ocupado se alguma reserva ativa o cobre, com os dois extremos
+inclusivos, como em find_conflicts e na constraint: um período [a, b] está
+livre para reserva se e só se todos os seus dias estão livres.
+
+A ocupação é calculada por mês ("0110..." com um caractere por dia) e, com
+CALENDAR_CACHE=1, guardada em memória por (propriedade, mês). Os meses que
+faltam saem de uma única consulta de intervalo, que também confirma que a
+propriedade existe. Escritas de reservas da propriedade (criar, cancelar,
+lote, excluir a propriedade) invalidam só os meses dela. Cada worker tem o seu
+cache, por isso as entradas também expiram após CALENDAR_CACHE_TTL segundos.
+
+GET /properties/{id}/next-available usa os mesmos meses: uma estadia de N
+noites ocupa N + 1 dias (entrada e saída), então a primeira janela livre é a
+primeira sequência de N + 1 zeros do bitmap.
+"""
+import calendar as _calendar
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.expressions import DateRangeOverlaps
+from app.db.models import Property, Reservation
+from app.db.replicas import from_replica
+from app.settings import settings
+
+MAX_CALENDAR_DAYS = 366
+FREE, OCCUPIED = "0", "1"
+
+Month = Tuple[int, int]
+
+
+def _month_bounds(month: Month) -> Tuple[date, date]:
+    year, m = month
+    return date(year, m, 1), date(year, m, _calendar.monthrange(year, m)[1])
+
+
+def _months(start: date, end: date) -> List[Month]:
+    months = []
+    year, m = start.year, start.month
+    while (year, m) <= (end.year, end.month):
+        months.append((year, m))
+        year, m = (year + 1, 1) if m == 12 else (year, m + 1)
+    return months
+
+
+class CalendarCache:
+    def __init__(self, enabled: bool = False, ttl: float = 30.0, max_entries: int = 10_000):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, Month], Tuple[float, str]]" = OrderedDict()
+        self._months_by_property: Dict[int, Set[Month]] = {}
+        # incrementa a cada invalidação: meses calculados antes dela não são guardados
+        self._generations: Dict[int, int] = {}
+        # idem para clear(), que vale para todas as propriedades
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def generation(self, property_id: int) -> int:
+        # as duas parcelas só crescem: qualquer invalidação muda a soma
+        return self._epoch + self._generations.get(property_id, 0)
+
+    def get(self, property_id: int, month: Month) -> Optional[str]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get((property_id, month))
+            if entry is None:
+                return None
+            if time.monotonic() >= entry[0]:
+                self._drop(property_id, month)
+                return None
+            self._entries.move_to_end((property_id, month))
+            return entry[1]
+
+    def set(self, property_id: int, month: Month, bitmap: str, generation: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if self.generation(property_id) != generation:
+                return
+            self._entries[(property_id, month)] = (time.monotonic() + self.ttl, bitmap)
+            self._entries.move_to_end((property_id, month))
+            self._months_by_property.setdefault(property_id, set()).add(month)
+            while len(self._entries) > self.max_entries:
+                (pid, old), _ = self._entries.popitem(last=False)
+                self._months_by_property.get(pid, set()).discard(old)
+
+    def invalidate(self, property_id: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._generations[property_id] = self._generations.get(property_id, 0) + 1
+            for month in self._months_by_property.pop(property_id, set()):
+                self._entries.pop((property_id, month), None)
+
+    def clear(self) -> None:
+        """Invalida todas as propriedades (cargas em massa)."""
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._months_by_property.clear()
+
+    def _drop(self, property_id: int, month: Month) -> None:
+        self._entries.pop((property_id, month), None)
+        self._months_by_property.get(property_id, set()).discard(month)
+
+
+calendar_cache = CalendarCache(
+    enabled=settings.calendar_cache,
+    ttl=settings.calendar_cache_ttl,
+    max_entries=settings.calendar_cache_max_entries,
+)
+
+
+def _validate_window(start: date, end: date) -> None:
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A data final deve ser maior ou igual à data inicial",
+        )
+    if (end - start).days + 1 > MAX_CALENDAR_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A janela do calendário é de no máximo {MAX_CALENDAR_DAYS} dias",
+        )
+
+
+def validate_stay_window(nights: int, start: date, end: date) -> None:
+    """`start`..`end` é o intervalo em que a estadia inteira (entrada e saída) deve caber."""
+    _validate_window(start, end)
+    if start + timedelta(days=nights) > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="O intervalo informado é menor que a quantidade de noites",
+        )
+
+
+def _calendar_stmt(property_id: int, start: date, end: date) -> Select:
+    # LEFT JOIN: sem linha = propriedade inexistente; (None, None) = sem reservas
+    return (
+        select(Reservation.start_date, Reservation.end_date)
+        .select_from(Property)
+        .outerjoin(
+            Reservation,
+            and_(
+                Reservation.property_id == Property.id,
+                Reservation.is_active,
+                DateRangeOverlaps(Reservation.start_date, Reservation.end_date, start, end),
+            ),
+        )
+        .where(Property.id == property_id)
+    )
+
+
+def _month_bitmaps(months: List[Month], rows: Iterable[Tuple[date, date]]) -> Dict[Month, str]:
+    bitmaps = {}
+    intervals = [(s, e) for s, e in rows if s is not None]
+    for month in months:
+        first, last = _month_bounds(month)
+        days = bytearray(FREE * (last.day), "ascii")
+        for s, e in intervals:
+            lo, hi = max(s, first), min(e, last)
+            if lo <= hi:
+                days[lo.day - 1:hi.day] = OCCUPIED.encode() * (hi.day - lo.day + 1)
+        bitmaps[month] = days.decode()
+    return bitmaps
+
+
+def _plan(property_id: int, start: date, end: date) -> Tuple[Dict[Month, str], List[Month], int]:
+    """Meses já em cache, meses que faltam e a geração antes da consulta."""
+    _validate_window(start, end)
+    generation = calendar_cache.generation(property_id)
+    cached, missing = {}, []
+    for month in _months(start, end):
+        bitmap = calendar_cache.get(property_id, month)
+        if bitmap is None:
+            missing.append(month)
+        else:
+            cached[month] = bitmap
+    return cached, missing, generation
+
+
+def _store(
+    property_id: int, missing: List[Month], rows: list, generation: int, db: Union[Session, AsyncSession]
+) -> Dict[Month, str]:
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Propriedade não encontrada")
+    computed = _month_bitmaps(missing, rows)
+    # leitura de réplica pode não ter a escrita que já incrementou a geração: não guarda
+    if not from_replica(db):
+        for month, bitmap in computed.items():
+            calendar_cache.set(property_id, month, bitmap, generation)
+    return computed
+
+
+def _missing_window(missing: List[Month]) -> Tuple[date, date]:
+    return _month_bounds(missing[0])[0], _month_bounds(missing[-1])[1]
+
+
+def _ranges(bitmap: str, start: date, value: str) -> List[dict]:
+    out, pos = [], 0
+    for bit, run in groupby(bitmap):
+        length = len(list(run))
+        if bit == value:
+            out.append({
+                "start": start + timedelta(days=pos),
+                "end": start + timedelta(days=pos + length - 1),
+            })
+        pos += length
+    return out
+
+
+def _window_bitmap(months: Dict[Month, str], start: date, end: date) -> str:
+    joined = "".join(months[m] for m in sorted(months))
+    offset = (start - _month_bounds(min(months))[0]).days
+    return joined[offset:offset + (end - start).days + 1]
+
+
+def _response(property_id: int, start: date, end: date, months: Dict[Month, str], fmt: str) -> dict:
+    bitmap = _window_bitmap(months, start, end)
+    result = {"property_id": property_id, "from": start, "to": end}
+    if fmt == "bitmap":
+        result["bitmap"] = bitmap
+    else:
+        result["occupied"] = _ranges(bitmap, start, OCCUPIED)
+        result["free"] = _ranges(bitmap, start, FREE)
+    return result
+
+
+def property_calendar(db: Session, property_id: int, start: date, end: date, fmt: str = "ranges") -> dict:
+    cached, missing, generation = _plan(property_id, start, end)
+    if missing:
+        rows = db.execute(_calendar_stmt(property_id, *_missing_window(missing))).all()
+        cached.update(_store(property_id, missing, rows, generation, db))
+    return _response(property_id, start, end, cached, fmt)
+
+
+async def property_calendar_async(
+    db: AsyncSession, property_id: int, start: date, end: date, fmt: str = "ranges"
+) -> dict:
+    cached, missing, generation = _plan(property_id, start, end)
+    if missing:
+        rows = (await db.execute(_calendar_stmt(property_id, *_missing_window(missing)))).all()
+        cached.update(_store(property_id, missing, rows, generation, db))
+    return _response(property_id, start, end, cached, fmt)
+
+
+def _first_free_stay(property_id: int, months: Dict[Month, str], nights: int, start: date, end: date) -> dict:
+    offset = _window_bitmap(months, start, end).find(FREE * (nights + 1))
+    if offset < 0:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Nenhum período disponível com essa quantidade de noites no intervalo informado",
+        )
+    check_in = start + timedelta(days=offset)
+    return {
+        "property_id": property_id,
+        "start_date": check_in,
+        "end_date": check_in + timedelta(days=nights),
+        "nights": nights,
+    }
+
+
+def next_available(db: Session, property_id: int, nights: int, start: date, end: date) -> dict:
+    """Primeira estadia de `nights` noites livre entre `start` e `end` (inclusivos)."""
+    validate_stay_window(nights, start, end)
+    cached, missing, generation = _plan(property_id, start, end)
+    if missing:
+        rows = db.execute(_calendar_stmt(property_id, *_missing_window(missing))).all()
+        cached.update(_store(property_id, missing, rows, generation, db))
+    return _first_free_stay(property_id, cached, nights, start, end)
+
+
+async def next_available_async(
+    db: AsyncSession, property_id: int, nights: int, start: date, end: date
+) -> dict:
+    validate_stay_window(nights, start, end)
+    cached, missing, generation = _plan(property_id, start, end)
+    if missing:
+        rows = (await db.execute(_calendar_stmt(property_id, *_missing_window(missing)))).all()
+        cached.update(_store(property_id, missing, rows, generation, db))
+    return _first_free_stay(property_id, cached, nights, start, end)
@@ -0,0 +1,102 @@
+"""
+Exportação em streaming das reservas (NDJSON ou CSV).
+
+Seleciona só as colunas (sem montar objetos ORM) e lê com yield_per, que no
+Postgres usa cursor no servidor: a memória do worker não cresce com o número
+de linhas exportadas.
+"""
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+from typing import Iterator, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.db.models import Reservation
+from app.service.reservation import _list_reservations_stmt
+
+EXPORT_COLUMNS = (
+    Reservation.id,
+    Reservation.property_id,
+    Reservation.total_price,
+    Reservation.client_name,
+    Reservation.client_email,
+    Reservation.start_date,
+    Reservation.end_date,
+    Reservation.guests_quantity,
+    Reservation.is_active,
+)
+EXPORT_FIELDS = [c.key for c in EXPORT_COLUMNS]
+
+CHUNK_ROWS = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _plain(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def iter_reservation_rows(
+    db: Session,
+    client_email: Optional[str] = None,
+    property_id: Optional[int] = None,
+    match: str = "contains",
+) -> Iterator[Sequence]:
+    stmt = (
+        _list_reservations_stmt(client_email, property_id, match)
+        .with_only_columns(*EXPORT_COLUMNS)
+        .execution_options(yield_per=CHUNK_ROWS)
+    )
+    for partition in db.execute(stmt).partitions():
+        yield from partition
+
+
+def _ndjson_chunks(rows: Iterator[Sequence]) -> Iterator[str]:
+    buf = []
+    for row in rows:
+        buf.append(
+            json.dumps({k: _plain(v) for k, v in zip(EXPORT_FIELDS, row)}, ensure_ascii=False)
+        )
+        if len(buf) >= CHUNK_ROWS:
+            yield "\n".join(buf) + "\n"
+            buf.clear()
+    if buf:
+        yield "\n".join(buf) + "\n"
+
+
+def _csv_chunks(rows: Iterator[Sequence]) -> Iterator[str]:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_FIELDS)
+    for n, row in enumerate(rows, 1):
+        writer.writerow(
+            ["true" if v is True else "false" if v is False else _plain(v) for v in row]
+        )
+        if n % CHUNK_ROWS == 0:
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate(0)
+    yield out.getvalue()
+
+
+def stream_reservations(
+    db: Session,
+    fmt: str,
+    client_email: Optional[str] = None,
+    property_id: Optional[int] = None,
+    match: str = "contains",
+) -> Iterator[str]:
+    rows = iter_reservation_rows(db, client_email, property_id, match)
+    if fmt == "csv":
+        return _csv_chunks(rows)
+    return _ndjson_chunks(rows)
@@ -0,0 +1,71 @@
+"""
+Paginação por keyset (id > último id visto) para as listagens.
+
+O corpo das respostas continua sendo a lista; a próxima página vai no header
+`Link: <...>; rel="next"` e no `X-Next-Cursor` (cursor opaco).
+"""
+import base64
+import binascii
+from typing import List, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy import Select
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+T = TypeVar("T")
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, last_id = raw.split(":", 1)
+        if prefix != "id":
+            raise ValueError(raw)
+        return int(last_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginação inválido",
+        )
+
+
+def resolve_after_id(after_id: Optional[int], cursor: Optional[str]) -> Optional[int]:
+    """`cursor` (opaco) tem precedência sobre `after_id`."""
+    if cursor:
+        return decode_cursor(cursor)
+    return after_id
+
+
+def split_page(rows: Sequence[T], limit: int) -> Tuple[List[T], Optional[int]]:
+    """
+    `rows` deve ter sido buscada com limit + 1: a linha extra só indica que
+    existe próxima página. Devolve a página e o id da última linha, se houver mais.
+    """
+    page = list(rows[:limit])
+    if len(rows) > limit and page:
+        return page, page[-1].id
+    return page, None
+
+
+def set_next_page_headers(request: Request, response: Response, next_after_id: Optional[int]) -> None:
+    if next_after_id is None:
+        return
+    cursor = encode_cursor(next_after_id)
+    url = request.url.remove_query_params("after_id").include_query_params(cursor=cursor)
+    response.headers["Link"] = f'<{url}>; rel="next"'
+    response.headers["X-Next-Cursor"] = cursor
+
+
+def keyset_page(stmt: Select, id_column, after_id: Optional[int], limit: Optional[int]) -> Select:
+    """Aplica `id > after_id` e o limite a um SELECT já ordenado por id."""
+    if after_id is not None:
+        stmt = stmt.where(id_column > after_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return stmt
@@ -1,43 +1,198 @@
 from fastapi import HTTPException, status
-from typing import Optional, List
+from typing import Optional, List, Sequence, Tuple
+from decimal import Decimal
+import orjson
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import asc, func, select
-from datetime import date
+from sqlalchemy import Date, Select, asc, case, func, literal, select, union_all
+from datetime import date, timedelta
 from app.db.models import Property, Reservation
-from app.db.schema import PropertyCreate
+from app.db.replicas import from_replica
+from app.db.expressions import DateRangeOverlaps, DaysBetween
+from app.service.availability_index import availability_index
+from app.service.calendar import calendar_cache, validate_stay_window
+from app.service.pagination import DEFAULT_PAGE_SIZE, keyset_page, split_page
+from app.service.response_cache import property_list_cache
+from app.db.schema import PropertyCreate, PropertyOut
 
 
-def list_properties(
-    db: Session,
+def _list_properties_stmt(
     location: Optional[str] = None,
     capacity: Optional[int] = None,
     address_neighborhood: Optional[str] = None,
     address_city: Optional[str] = None,
     address_state: Optional[str] = None,
     price_per_night: Optional[int] = None,
-) -> List[Property]:
+    columns: Optional[Sequence] = None,
+) -> Select:
 
-    q = db.query(Property)
+    q = select(*columns) if columns else select(Property)
 
     if address_state:
-        q = q.filter(Property.address_state == address_state.strip())
+        q = q.where(Property.address_state == address_state.strip())
 
     if address_neighborhood:
-        q = q.filter(Property.address_neighborhood == address_neighborhood.strip())
+        q = q.where(Property.address_neighborhood == address_neighborhood.strip())
 
     if address_city:
-        q = q.filter(Property.address_city == address_city.strip())
+        q = q.where(Property.address_city == address_city.strip())
 
     # esta maior ou igual para facilitar debug mudar para enviar
 
     if capacity:
-        q = q.filter(Property.capacity >= capacity)
+        q = q.where(Property.capacity >= capacity)
 
     if price_per_night:
-        q = q.filter(Property.price_per_night <= price_per_night)
+        q = q.where(Property.price_per_night <= price_per_night)
+
+    return q.order_by(asc(Property.id))
+
+
+def list_properties(
+    db: Session,
+    location: Optional[str] = None,
+    capacity: Optional[int] = None,
+    address_neighborhood: Optional[str] = None,
+    address_city: Optional[str] = None,
+    address_state: Optional[str] = None,
+    price_per_night: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> List[Property]:
+
+    stmt = _list_properties_stmt(
+        location=location,
+        capacity=capacity,
+        address_neighborhood=address_neighborhood,
+        address_city=address_city,
+        address_state=address_state,
+        price_per_night=price_per_night,
+    )
+    stmt = keyset_page(stmt, Property.id, after_id, limit)
+    return list(db.execute(stmt).scalars().all())
+
+
+# campos de GET /properties/list, na ordem do PropertyOut
+PROPERTY_LIST_FIELDS: Tuple[str, ...] = tuple(PropertyOut.model_fields)
+
+
+def parse_property_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """`fields=id,title,...` -> campos na ordem do PropertyOut; vazio = todos."""
+    if not fields or not fields.strip():
+        return PROPERTY_LIST_FIELDS
+    wanted = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = sorted(wanted - set(PROPERTY_LIST_FIELDS))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campos desconhecidos em fields: {', '.join(unknown)}",
+        )
+    return tuple(f for f in PROPERTY_LIST_FIELDS if f in wanted)
+
+
+def _property_list_params(
+    address_neighborhood: Optional[str],
+    address_city: Optional[str],
+    address_state: Optional[str],
+    capacity: Optional[int],
+    price_per_night: Optional[int],
+    after_id: Optional[int],
+    limit: int,
+    fields: Tuple[str, ...] = PROPERTY_LIST_FIELDS,
+) -> tuple:
+    # mesma normalização de _list_properties_stmt: strip e 0 == sem filtro
+    return (
+        (address_neighborhood or "").strip() or None,
+        (address_city or "").strip() or None,
+        (address_state or "").strip() or None,
+        capacity or None,
+        price_per_night or None,
+        after_id,
+        limit,
+        fields,
+    )
+
+
+def _property_list_stmt(params: tuple) -> Tuple[Select, List[int]]:
+    """
+    SELECT só das colunas pedidas, sem montar objetos Property. O id vem sempre
+    primeiro (keyset); devolve também a posição, na linha, de cada campo.
+    """
+    fields = params[7]
+    others = [f for f in fields if f != "id"]
+    stmt = _list_properties_stmt(
+        address_neighborhood=params[0],
+        address_city=params[1],
+        address_state=params[2],
+        capacity=params[3],
+        price_per_night=params[4],
+        columns=[Property.id, *(getattr(Property, f) for f in others)],
+    )
+    positions = [0 if f == "id" else 1 + others.index(f) for f in fields]
+    return keyset_page(stmt, Property.id, params[5], params[6] + 1), positions
 
-    return q.order_by(asc(Property.id)).all()
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        # mesmo formato do PropertyOut (pydantic): decimal como string
+        return str(value)
+    raise TypeError(f"{type(value).__name__} não serializável")
+
+
+def _serialize_page(rows: Sequence[Row], params: tuple, positions: List[int]) -> Tuple[bytes, Optional[int]]:
+    # as colunas já vêm no formato do PropertyOut (gravadas validadas): direto para
+    # JSON, sem objeto ORM nem validação pydantic por linha
+    page, next_after_id = split_page(rows, params[6])
+    fields = params[7]
+    body = orjson.dumps(
+        [{f: row[i] for f, i in zip(fields, positions)} for row in page],
+        default=_json_default,
+    )
+    return body, next_after_id
+
+
+def list_properties_json(
+    db: Session,
+    address_neighborhood: Optional[str] = None,
+    address_city: Optional[str] = None,
+    address_state: Optional[str] = None,
+    capacity: Optional[int] = None,
+    price_per_night: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    fields: Tuple[str, ...] = PROPERTY_LIST_FIELDS,
+) -> Tuple[bytes, Optional[int]]:
+    """
+    Página de GET /properties/list já serializada: (JSON, next_after_id), só
+    com `fields`. Servida do property_list_cache quando PROPERTY_LIST_CACHE=1.
+    """
+    params = _property_list_params(
+        address_neighborhood, address_city, address_state, capacity, price_per_night, after_id, limit,
+        fields,
+    )
+    # réplica: lê do cache, mas não guarda (ver app.db.replicas)
+    key = property_list_cache.key(params) if property_list_cache.enabled else None
+    if key is not None:
+        cached = property_list_cache.get(key)
+        if cached is not None:
+            return cached
+
+    stmt, positions = _property_list_stmt(params)
+    body, next_after_id = _serialize_page(db.execute(stmt).all(), params, positions)
+    if key is not None and not from_replica(db):
+        property_list_cache.set(key, body, next_after_id)
+    return body, next_after_id
+
+
+def _conflicts_stmt(property_id: int, start_date: date, end_date: date) -> Select:
+    # mesmo predicado da constraint reservations_no_overlap (só reservas ativas)
+    return select(Reservation.id).where(
+        Reservation.property_id == property_id,
+        Reservation.is_active,
+        DateRangeOverlaps(Reservation.start_date, Reservation.end_date, start_date, end_date),
+    )
 
 
 def find_conflicts(
@@ -47,25 +202,247 @@ def find_conflicts(
     end_date: date,
 ) -> List[int]:
 
-    stmt = select(Reservation.id).where(
-        Reservation.property_id == property_id,
-        Reservation.start_date <= end_date,
-        Reservation.end_date >= start_date,
-    )
+    stmt = _conflicts_stmt(property_id, start_date, end_date)
     return [row[0] for row in db.execute(stmt).all()]
 
 
-def check_availability(
+def _search_available_stmt(
+    start_date: date,
+    end_date: date,
+    guests: int,
+    address_neighborhood: Optional[str] = None,
+    address_city: Optional[str] = None,
+    address_state: Optional[str] = None,
+    price_per_night: Optional[int] = None,
+) -> Select:
+    return _list_properties_stmt(
+        capacity=guests,
+        address_neighborhood=address_neighborhood,
+        address_city=address_city,
+        address_state=address_state,
+        price_per_night=price_per_night,
+    ).where(~_conflicts_stmt(Property.id, start_date, end_date).exists())
+
+
+def search_available_properties(
     db: Session,
-    property_id: int,
     start_date: date,
     end_date: date,
-    guests_quantity: int,
+    guests: int,
+    address_neighborhood: Optional[str] = None,
+    address_city: Optional[str] = None,
+    address_state: Optional[str] = None,
+    price_per_night: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: int = 50,
 ) -> List[Property]:
+    """
+    Propriedades com os filtros de list_properties, capacidade para `guests` e
+    sem reserva ativa no período: um único SELECT com anti-join (NOT EXISTS).
+    """
 
-    prop = db.get(Property, property_id)
+    stmt = _search_available_stmt(
+        start_date,
+        end_date,
+        guests,
+        address_neighborhood=address_neighborhood,
+        address_city=address_city,
+        address_state=address_state,
+        price_per_night=price_per_night,
+    )
+    stmt = keyset_page(stmt, Property.id, after_id, limit)
+    return list(db.execute(stmt).scalars().all())
+
+
+def _next_available_stmt(
+    nights: int,
+    start_date: date,
+    end_date: date,
+    guests: Optional[int] = None,
+    address_neighborhood: Optional[str] = None,
+    address_city: Optional[str] = None,
+    address_state: Optional[str] = None,
+    price_per_night: Optional[int] = None,
+    after_id: Optional[int] = None,
+) -> Select:
+    """
+    Por propriedade, o último dia ocupado antes da primeira lacuna com
+    nights + 1 dias livres entre start_date e end_date.
+
+    As reservas ativas de cada propriedade não se sobrepõem (constraint
+    reservations_no_overlap), então, ordenadas por início, a lacuna depois de
+    cada uma vai até o início da seguinte: lead(start_date). Uma linha
+    sentinela ocupando o dia anterior a start_date cobre a lacuna inicial.
+    """
+    candidates = _list_properties_stmt(
+        capacity=guests,
+        address_neighborhood=address_neighborhood,
+        address_city=address_city,
+        address_state=address_state,
+        price_per_night=price_per_night,
+        columns=[Property.id],
+    ).order_by(None)
+    if after_id is not None:
+        candidates = candidates.where(Property.id > after_id)
+    candidates = candidates.subquery("candidates")
 
-    if start_date == end_date:
+    day_before = literal(start_date - timedelta(days=1), Date)
+    slots = union_all(
+        select(
+            candidates.c.id.label("property_id"),
+            day_before.label("start_date"),
+            day_before.label("end_date"),
+        ),
+        select(
+            Reservation.property_id,
+            case(
+                (Reservation.start_date < start_date, literal(start_date, Date)),
+                else_=Reservation.start_date,
+            ),
+            Reservation.end_date,
+        )
+        .join(candidates, candidates.c.id == Reservation.property_id)
+        .where(
+            Reservation.is_active,
+            DateRangeOverlaps(Reservation.start_date, Reservation.end_date, start_date, end_date),
+        ),
+    ).subquery("slots")
+
+    next_start = func.lead(slots.c.start_date).over(
+        partition_by=slots.c.property_id, order_by=slots.c.start_date
+    )
+    gaps = select(
+        slots.c.property_id,
+        slots.c.end_date.label("busy_until"),
+        func.coalesce(next_start, literal(end_date + timedelta(days=1), Date)).label("busy_from"),
+    ).subquery("gaps")
+
+    return (
+        select(gaps.c.property_id.label("id"), func.min(gaps.c.busy_until).label("busy_until"))
+        .where(DaysBetween(gaps.c.busy_until, gaps.c.busy_from) >= nights + 2)
+        .group_by(gaps.c.property_id)
+        .order_by(gaps.c.property_id)
+    )
+
+
+def _next_available_page(rows: Sequence[Row], nights: int, limit: int) -> Tuple[List[dict], Optional[int]]:
+    page, next_after_id = split_page(rows, limit)
+    stays = []
+    for row in page:
+        check_in = row.busy_until + timedelta(days=1)
+        stays.append({
+            "property_id": row.id,
+            "start_date": check_in,
+            "end_date": check_in + timedelta(days=nights),
+            "nights": nights,
+        })
+    return stays, next_after_id
+
+
+def search_next_available(
+    db: Session,
+    nights: int,
+    start_date: date,
+    end_date: date,
+    guests: Optional[int] = None,
+    address_neighborhood: Optional[str] = None,
+    address_city: Optional[str] = None,
+    address_state: Optional[str] = None,
+    price_per_night: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: int = 50,
+) -> Tuple[List[dict], Optional[int]]:
+    """
+    Datas flexíveis: a primeira estadia de `nights` noites livre entre
+    start_date e end_date em cada propriedade que tenha uma, em um único SELECT.
+    """
+    validate_stay_window(nights, start_date, end_date)
+    stmt = _next_available_stmt(
+        nights,
+        start_date,
+        end_date,
+        guests=guests,
+        address_neighborhood=address_neighborhood,
+        address_city=address_city,
+        address_state=address_state,
+        price_per_night=price_per_night,
+        after_id=after_id,
+    ).limit(limit + 1)
+    return _next_available_page(db.execute(stmt).all(), nights, limit)
+
+
+def _active_intervals_stmt(property_ids: Optional[List[int]] = None) -> Select:
+    q = select(
+        Reservation.property_id,
+        Reservation.start_date,
+        Reservation.end_date,
+        Reservation.id,
+    ).where(Reservation.is_active)
+    if property_ids is not None:
+        q = q.where(Reservation.property_id.in_(property_ids))
+    return q
+
+
+def _indexed_conflicts(
+    db: Session,
+    property_id: int,
+    start_date: date,
+    end_date: date,
+) -> List[int]:
+    """find_conflicts respondido pelo índice em memória (carrega a propriedade na falta)."""
+
+    found = availability_index.lookup(property_id, start_date, end_date)
+    if found is not None:
+        return found
+
+    token = availability_index.load_token()
+    rows = db.execute(_active_intervals_stmt([property_id])).all()
+    availability_index.load(property_id, [(s, e, i) for _, s, e, i in rows], token)
+
+    found = availability_index.lookup(property_id, start_date, end_date)
+    if found is None:
+        return find_conflicts(db, property_id, start_date, end_date)
+    return found
+
+
+def warm_availability_index(db: Session) -> int:
+    """Carga a frio do índice com as reservas ativas (até o limite de propriedades)."""
+    token = availability_index.load_token()
+    rows = db.execute(
+        _active_intervals_stmt().order_by(Reservation.property_id)
+    ).yield_per(10_000)
+    return availability_index.load_many(rows, token)
+
+
+def verify_availability_index(db: Session) -> List[int]:
+    """
+    Confere cada propriedade carregada contra o banco (mesmo predicado de
+    find_conflicts). Devolve as divergentes, que são descartadas do índice.
+    """
+    loaded = availability_index.loaded_property_ids()
+    if not loaded:
+        return []
+
+    current = {pid: [] for pid in loaded}
+    for pid, s, e, i in db.execute(_active_intervals_stmt(loaded)).all():
+        current[pid].append((s, e, i))
+
+    diverging = [pid for pid in loaded if availability_index.diverging(pid, current[pid])]
+    for pid in diverging:
+        availability_index.discard(pid)
+    return diverging
+
+
+def _validate_availability(
+    prop: Optional[Property],
+    start_date: date,
+    end_date: date,
+    guests_quantity: int,
+) -> None:
+    """Regras de disponibilidade que não dependem de outras reservas."""
+
+    # antes de qualquer SQL: no Postgres daterange(início, fim) falha com o intervalo invertido
+    if end_date <= start_date:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="A data de saída deve ser posterior à data de início (não podem ser iguais).",
@@ -83,11 +460,33 @@ def check_availability(
             detail="Capacidade insuficiente para a quantidade de hóspedes solicitada",
         )
 
-    if find_conflicts(db, property_id, start_date, end_date):
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Período indisponível para esta propriedade",
-        )
+
+def _raise_period_unavailable():
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Período indisponível para esta propriedade",
+    )
+
+
+def check_availability(
+    db: Session,
+    property_id: int,
+    start_date: date,
+    end_date: date,
+    guests_quantity: int,
+) -> List[Property]:
+
+    prop = db.get(Property, property_id)
+
+    _validate_availability(prop, start_date, end_date, guests_quantity)
+
+    conflicts = (
+        _indexed_conflicts(db, property_id, start_date, end_date)
+        if availability_index.enabled
+        else find_conflicts(db, property_id, start_date, end_date)
+    )
+    if conflicts:
+        _raise_period_unavailable()
 
     return [prop]
 
@@ -100,6 +499,7 @@ def create_property(db: Session, data: PropertyCreate) -> Property:
     except IntegrityError as e:
         db.rollback()
         raise ValueError("Já existe uma propriedade cadastrada nesse endereço.") from e
+    property_list_cache.invalidate()
     db.refresh(obj)
     return obj
 
@@ -114,4 +514,150 @@ def delete_property_by_id(db: Session, prop_id: int) -> bool:
     except IntegrityError as e:
         db.rollback()
         raise ValueError("debub par FK delete") from e
+    availability_index.discard(prop_id)
+    calendar_cache.invalidate(prop_id)
+    property_list_cache.invalidate()
+    return True
+
+
+# ---------- VERSÕES ASYNC (DB_ASYNC=1) ----------
+
+async def list_properties_json_async(
+    db: AsyncSession,
+    address_neighborhood: Optional[str] = None,
+    address_city: Optional[str] = None,
+    address_state: Optional[str] = None,
+    capacity: Optional[int] = None,
+    price_per_night: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    fields: Tuple[str, ...] = PROPERTY_LIST_FIELDS,
+) -> Tuple[bytes, Optional[int]]:
+    params = _property_list_params(
+        address_neighborhood, address_city, address_state, capacity, price_per_night, after_id, limit,
+        fields,
+    )
+    # réplica: lê do cache, mas não guarda (ver app.db.replicas)
+    key = property_list_cache.key(params) if property_list_cache.enabled else None
+    if key is not None:
+        cached = property_list_cache.get(key)
+        if cached is not None:
+            return cached
+
+    stmt, positions = _property_list_stmt(params)
+    body, next_after_id = _serialize_page((await db.execute(stmt)).all(), params, positions)
+    if key is not None and not from_replica(db):
+        property_list_cache.set(key, body, next_after_id)
+    return body, next_after_id
+
+
+async def search_next_available_async(
+    db: AsyncSession,
+    nights: int,
+    start_date: date,
+    end_date: date,
+    guests: Optional[int] = None,
+    address_neighborhood: Optional[str] = None,
+    address_city: Optional[str] = None,
+    address_state: Optional[str] = None,
+    price_per_night: Optional[int] = None,
+    after_id: Optional[int] = None,
+    limit: int = 50,
+) -> Tuple[List[dict], Optional[int]]:
+    validate_stay_window(nights, start_date, end_date)
+    stmt = _next_available_stmt(
+        nights,
+        start_date,
+        end_date,
+        guests=guests,
+        address_neighborhood=address_neighborhood,
+        address_city=address_city,
+        address_state=address_state,
+        price_per_night=price_per_night,
+        after_id=after_id,
+    ).limit(limit + 1)
+    return _next_available_page((await db.execute(stmt)).all(), nights, limit)
+
+
+async def find_conflicts_async(
+    db: AsyncSession,
+    property_id: int,
+    start_date: date,
+    end_date: date,
+) -> List[int]:
+
+    stmt = _conflicts_stmt(property_id, start_date, end_date)
+    return list((await db.execute(stmt)).scalars().all())
+
+
+async def _indexed_conflicts_async(
+    db: AsyncSession,
+    property_id: int,
+    start_date: date,
+    end_date: date,
+) -> List[int]:
+
+    found = availability_index.lookup(property_id, start_date, end_date)
+    if found is not None:
+        return found
+
+    token = availability_index.load_token()
+    rows = (await db.execute(_active_intervals_stmt([property_id]))).all()
+    availability_index.load(property_id, [(s, e, i) for _, s, e, i in rows], token)
+
+    found = availability_index.lookup(property_id, start_date, end_date)
+    if found is None:
+        return await find_conflicts_async(db, property_id, start_date, end_date)
+    return found
+
+
+async def check_availability_async(
+    db: AsyncSession,
+    property_id: int,
+    start_date: date,
+    end_date: date,
+    guests_quantity: int,
+) -> List[Property]:
+
+    prop = await db.get(Property, property_id)
+
+    _validate_availability(prop, start_date, end_date, guests_quantity)
+
+    conflicts = (
+        await _indexed_conflicts_async(db, property_id, start_date, end_date)
+        if availability_index.enabled
+        else await find_conflicts_async(db, property_id, start_date, end_date)
+    )
+    if conflicts:
+        _raise_period_unavailable()
+
+    return [prop]
+
+
+async def create_property_async(db: AsyncSession, data: PropertyCreate) -> Property:
+    obj = Property(**data.model_dump())
+    db.add(obj)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise ValueError("Já existe uma propriedade cadastrada nesse endereço.") from e
+    property_list_cache.invalidate()
+    await db.refresh(obj)
+    return obj
+
+
+async def delete_property_by_id_async(db: AsyncSession, prop_id: int) -> bool:
+    obj = await db.get(Property, prop_id)
+    if not obj:
+        return False
+    await db.delete(obj)
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise ValueError("debub par FK delete") from e
+    availability_index.discard(prop_id)
+    calendar_cache.invalidate(prop_id)
+    property_list_cache.invalidate()
     return True
@@ -0,0 +1,167 @@
+"""
+Cotações (POST /quotes): o total de muitas estadias (propriedade, entrada,
+saída) de uma vez, com regras de preço por data (temporadas, fins de semana).
+
+As estadias são agrupadas, pela data de entrada, em janelas de até
+MAX_QUOTE_NIGHTS noites. Em cada janela os preços por noite ficam numa matriz
+de centavos (int64): uma linha por propriedade da janela e uma coluna por
+noite. Ela começa com
+o price_per_night e as regras sobrescrevem as noites que cobrem (a última
+regra que cobre a noite vale). Com a soma acumulada de cada linha, o total de
+uma estadia é a diferença de duas posições, calculada para todos os itens de
+uma vez.
+
+Preços têm no máximo duas casas (Numeric(10, 2) no banco, condecimal nas
+regras), então a soma em centavos é exata e dá o mesmo que stay_total, a
+conta em Decimal com ROUND_HALF_UP usada por reservas e seeds.
+"""
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import Property
+from app.db.schema import QuoteItem, QuoteOverride
+
+CENT = Decimal("0.01")
+# janela máxima (em noites) de uma matriz e, portanto, de uma estadia
+MAX_QUOTE_NIGHTS = 731
+
+
+def stay_total(price_per_night, nights: int) -> Decimal:
+    """noites * preço, arredondado ao centavo com ROUND_HALF_UP."""
+    return (Decimal(nights) * Decimal(price_per_night)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def to_cents(price) -> int:
+    return int((Decimal(price) / CENT).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+class NightlyRates:
+    def __init__(self, base_cents: Dict[int, int], first_night: date, last_night: date):
+        self.first_night = first_night
+        self.nights = (last_night - first_night).days + 1
+        self._row = {property_id: i for i, property_id in enumerate(base_cents)}
+        base = np.fromiter(base_cents.values(), dtype=np.int64, count=len(base_cents))
+        self.cents = np.repeat(base[:, None], self.nights, axis=1)
+        # bit do dia da semana de cada noite (bit 0 = segunda, como date.weekday())
+        self._weekday_bits = 1 << ((np.arange(self.nights) + first_night.weekday()) % 7)
+
+    def override(
+        self,
+        property_id: int,
+        cents: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        weekdays: Optional[Sequence[int]] = None,
+    ) -> None:
+        """Preço `cents` nas noites de start_date a end_date (inclusivos) e, se dados, só nesses dias da semana."""
+        row = self._row.get(property_id)
+        if row is None:
+            return
+        lo = 0 if start_date is None else max(0, (start_date - self.first_night).days)
+        hi = self.nights if end_date is None else min(self.nights, (end_date - self.first_night).days + 1)
+        if lo >= hi:
+            return
+        nights = self.cents[row, lo:hi]
+        if weekdays is not None:
+            mask = sum(1 << w for w in set(weekdays))
+            nights[(self._weekday_bits[lo:hi] & mask) != 0] = cents
+        else:
+            nights[:] = cents
+
+    def totals(self, property_ids: Iterable[int], check_ins: Iterable[date], nights: np.ndarray) -> np.ndarray:
+        prefix = np.zeros((self.cents.shape[0], self.nights + 1), dtype=np.int64)
+        np.cumsum(self.cents, axis=1, out=prefix[:, 1:])
+        rows = np.fromiter((self._row[pid] for pid in property_ids), dtype=np.intp)
+        offsets = np.fromiter((d.toordinal() for d in check_ins), dtype=np.intp) - self.first_night.toordinal()
+        return prefix[rows, offsets + nights] - prefix[rows, offsets]
+
+
+def _error(index: int, item: QuoteItem, status_code: int, detail: str) -> dict:
+    return {
+        "index": index,
+        "status_code": status_code,
+        "detail": detail,
+        "property_id": item.property_id,
+        "start_date": item.start_date,
+        "end_date": item.end_date,
+        "nights": None,
+        "total_price": None,
+    }
+
+
+def _windows(stays: List[Tuple[int, QuoteItem]]) -> List[Tuple[date, date, List[Tuple[int, QuoteItem]]]]:
+    """(primeira noite, última noite, estadias) de janelas de até MAX_QUOTE_NIGHTS noites."""
+    windows = []
+    for index, item in sorted(stays, key=lambda stay: stay[1].start_date):
+        last = item.end_date - timedelta(days=1)
+        if windows and (max(windows[-1][1], last) - windows[-1][0]).days < MAX_QUOTE_NIGHTS:
+            first, window_last, members = windows[-1]
+            windows[-1] = (first, max(window_last, last), members)
+            members.append((index, item))
+        else:
+            windows.append((item.start_date, last, [(index, item)]))
+    return windows
+
+
+def _quote_window(
+    first: date,
+    last: date,
+    stays: List[Tuple[int, QuoteItem]],
+    prices: dict,
+    overrides: Sequence[QuoteOverride],
+    results: List[Optional[dict]],
+) -> None:
+    rates = NightlyRates(
+        {pid: to_cents(prices[pid]) for pid in sorted({item.property_id for _, item in stays})}, first, last
+    )
+    for rule in overrides:
+        rates.override(rule.property_id, to_cents(rule.price_per_night), rule.start_date, rule.end_date, rule.weekdays)
+    nights = np.fromiter(((item.end_date - item.start_date).days for _, item in stays), dtype=np.intp)
+    totals = rates.totals((item.property_id for _, item in stays), (item.start_date for _, item in stays), nights)
+    for (index, item), n, cents in zip(stays, nights.tolist(), totals.tolist()):
+        results[index] = {
+            "index": index,
+            "status_code": status.HTTP_200_OK,
+            "detail": None,
+            "property_id": item.property_id,
+            "start_date": item.start_date,
+            "end_date": item.end_date,
+            "nights": n,
+            "total_price": Decimal(cents).scaleb(-2),
+        }
+
+
+def quote_stays(db: Session, items: List[QuoteItem], overrides: Sequence[QuoteOverride] = ()) -> dict:
+    property_ids = sorted({item.property_id for item in items})
+    prices = dict(
+        db.execute(
+            select(Property.id, Property.price_per_night).where(Property.id.in_(property_ids))
+        ).all()
+    )
+
+    results: List[Optional[dict]] = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        if item.end_date <= item.start_date:
+            results[index] = _error(
+                index, item, status.HTTP_400_BAD_REQUEST, "A data final deve ser maior que a data inicial"
+            )
+        elif (item.end_date - item.start_date).days > MAX_QUOTE_NIGHTS:
+            results[index] = _error(
+                index, item, status.HTTP_400_BAD_REQUEST, f"A estadia passa de {MAX_QUOTE_NIGHTS} noites"
+            )
+        elif item.property_id not in prices:
+            results[index] = _error(index, item, status.HTTP_404_NOT_FOUND, "Propriedade não encontrada")
+        else:
+            valid.append((index, item))
+
+    for first, last, stays in _windows(valid):
+        _quote_window(first, last, stays, prices, overrides, results)
+
+    return {"quoted": len(valid), "failed": len(items) - len(valid), "results": results}
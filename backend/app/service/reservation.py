@@ -1,19 +1,26 @@
 from typing import Optional, List
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import asc, func, select
-from app.db.models import Reservation, Property
+from sqlalchemy import Date, Insert, Integer, Select, String, asc, func, insert, literal, select, true
+from app.db.models import Reservation, Property, RESERVATION_NO_OVERLAP
 from app.db.schema import ReservationCreate
+from app.service.availability_index import availability_index
+from app.service.calendar import calendar_cache
+from app.service.pagination import keyset_page
+from app.service.property import (
+    _conflicts_stmt,
+    _validate_availability,
+    _raise_period_unavailable,
+)
 from datetime import date
-from decimal import Decimal, ROUND_HALF_UP
 
 
-def _get_property_price(db: Session, property_id: int) -> int:
-    stmt = select(Property.price_per_night).where(Property.id == property_id)
-    result = db.execute(stmt).scalar_one_or_none()
-    if result is None:
-        raise ValueError("Propriedade não encontrada")
-    return int(result)
+def _integrity_error(e: IntegrityError) -> ValueError:
+    # a constraint de sobreposição pega o que passou pela checagem concorrentemente
+    if RESERVATION_NO_OVERLAP in str(e.orig):
+        return ValueError("Período indisponível para esta propriedade")
+    return ValueError("Não foi possível criar a reserva. Verifique os dados fornecidos.")
 
 
 def calculate_days_reserved(start_date: date, end_date: date) -> int:
@@ -24,48 +31,131 @@ def calculate_days_reserved(start_date: date, end_date: date) -> int:
     return delta.days
 
 
-def create_reservation(db: Session, data: ReservationCreate) -> Reservation:
-    price = _get_property_price(db, data.property_id) 
-    days = calculate_days_reserved(data.start_date, data.end_date)
+def _reservation_created(obj: Reservation) -> dict:
+    calendar_cache.invalidate(obj.property_id)
+    if availability_index.enabled:
+        availability_index.add(obj.property_id, obj.start_date, obj.end_date, obj.id)
+    message = f"Reserva Feita com Sucesso, o valor total será R${obj.total_price:.2f}"
+    return {
+        "message": message,
+        "reservation": obj,
+    }
 
-    total = (Decimal(days) * Decimal(price)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
-    obj = Reservation(**data.model_dump(exclude={"total_price"}), total_price=total)
-    db.add(obj)
+def _book_reservation_stmt(data: ReservationCreate, days: int) -> Insert:
+    """
+    INSERT ... SELECT ... RETURNING: só insere se a propriedade existe, comporta
+    os hóspedes e não tem conflito no período; o total sai do próprio SELECT.
+
+    price_per_night * days é exato (numeric(10, 2) vezes inteiro, sem
+    arredondamento), então dá o mesmo que stay_total(price, days).
+    """
+    source = select(
+        literal(data.property_id, Integer),
+        literal(data.client_name, String),
+        literal(data.client_email, String),
+        literal(data.start_date, Date),
+        literal(data.end_date, Date),
+        literal(data.guests_quantity, Integer),
+        Property.price_per_night * days,
+        true(),
+    ).where(
+        Property.id == data.property_id,
+        Property.capacity >= data.guests_quantity,
+        ~_conflicts_stmt(data.property_id, data.start_date, data.end_date).exists(),
+    )
+    columns = [
+        "property_id",
+        "client_name",
+        "client_email",
+        "start_date",
+        "end_date",
+        "guests_quantity",
+        "total_price",
+        "is_active",
+    ]
+    return insert(Reservation).from_select(columns, source).returning(Reservation)
+
+
+def _booking_days(data: ReservationCreate) -> int:
+    if data.start_date == data.end_date:
+        _validate_availability(None, data.start_date, data.end_date, data.guests_quantity)
+    return calculate_days_reserved(data.start_date, data.end_date)
+
+
+def book_reservation(db: Session, data: ReservationCreate) -> dict:
+    """
+    Caminho de reserva em um único statement. Se nada foi inserido, descobre o
+    motivo (404/409) com as mesmas regras de check_availability.
+    """
+    days = _booking_days(data)
 
     try:
+        obj = db.execute(_book_reservation_stmt(data, days)).scalars().first()
+        if obj is not None:
+            # desanexa para o commit não expirar os atributos (dispensa o refresh)
+            db.expunge(obj)
         db.commit()
-        db.refresh(obj)
     except IntegrityError as e:
         db.rollback()
-        raise ValueError(
-            "Não foi possível criar a reserva. Verifique os dados fornecidos."
-        ) from e
+        raise _integrity_error(e) from e
 
-    message = f"Reserva Feita com Sucesso, o valor total será R${total:.2f}"
-    return {
-        "message": message,
-        "reservation": obj,
-    }
+    if obj is None:
+        prop = db.get(Property, data.property_id)
+        _validate_availability(prop, data.start_date, data.end_date, data.guests_quantity)
+        _raise_period_unavailable()
 
+    return _reservation_created(obj)
 
-def list_reservations(
-    db: Session,
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _email_filter(client_email: str, match: str):
+    """
+    exact/prefix usam o índice btree em lower(client_email); contains (padrão,
+    com curinga à esquerda) só é atendido pelo índice trigram (pg_trgm).
+    """
+    email = func.lower(Reservation.client_email)
+    value = client_email.strip().lower()
+    if match == "exact":
+        return email == value
+    if match == "prefix":
+        return email.like(_like_escape(value) + "%", escape="\\")
+    return email.like("%" + _like_escape(value) + "%", escape="\\")
+
+
+def _list_reservations_stmt(
     client_email: Optional[str] = None,
     property_id: Optional[int] = None,
-) -> List[Reservation]:
+    match: str = "contains",
+) -> Select:
 
-    q = db.query(Reservation)
+    q = select(Reservation)
 
     if client_email:
-        q = q.filter(
-            func.lower(Reservation.client_email).like(f"%{client_email.lower()}%")
-        )
+        q = q.where(_email_filter(client_email, match))
 
     if property_id:
-        q = q.filter(Reservation.property_id == property_id)
+        q = q.where(Reservation.property_id == property_id)
+
+    return q.order_by(asc(Reservation.id))
+
+
+def list_reservations(
+    db: Session,
+    client_email: Optional[str] = None,
+    property_id: Optional[int] = None,
+    match: str = "contains",
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> List[Reservation]:
 
-    return q.order_by(asc(Reservation.id)).all()
+    stmt = keyset_page(
+        _list_reservations_stmt(client_email, property_id, match), Reservation.id, after_id, limit
+    )
+    return list(db.execute(stmt).scalars().all())
 
 
 def deactivate_reservation(db: Session, reservation_id: int) -> Optional[Reservation]:
@@ -79,4 +169,63 @@ def deactivate_reservation(db: Session, reservation_id: int) -> Optional[Reserva
     reservation.is_active = False
     db.commit()
     db.refresh(reservation)
+    calendar_cache.invalidate(reservation.property_id)
+    if availability_index.enabled:
+        availability_index.remove(reservation.property_id, reservation.id)
+    return reservation
+
+
+# ---------- VERSÕES ASYNC (DB_ASYNC=1) ----------
+
+async def book_reservation_async(db: AsyncSession, data: ReservationCreate) -> dict:
+    days = _booking_days(data)
+
+    try:
+        obj = (await db.execute(_book_reservation_stmt(data, days))).scalars().first()
+        if obj is not None:
+            db.expunge(obj)
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        raise _integrity_error(e) from e
+
+    if obj is None:
+        prop = await db.get(Property, data.property_id)
+        _validate_availability(prop, data.start_date, data.end_date, data.guests_quantity)
+        _raise_period_unavailable()
+
+    return _reservation_created(obj)
+
+
+async def list_reservations_async(
+    db: AsyncSession,
+    client_email: Optional[str] = None,
+    property_id: Optional[int] = None,
+    match: str = "contains",
+    after_id: Optional[int] = None,
+    limit: Optional[int] = None,
+) -> List[Reservation]:
+
+    stmt = keyset_page(
+        _list_reservations_stmt(client_email, property_id, match), Reservation.id, after_id, limit
+    )
+    return list((await db.execute(stmt)).scalars().all())
+
+
+async def deactivate_reservation_async(
+    db: AsyncSession, reservation_id: int
+) -> Optional[Reservation]:
+
+    reservation = await db.get(Reservation, reservation_id)
+    if not reservation:
+        return None
+    if reservation.is_active is False:
+        return reservation
+
+    reservation.is_active = False
+    await db.commit()
+    await db.refresh(reservation)
+    calendar_cache.invalidate(reservation.property_id)
+    if availability_index.enabled:
+        availability_index.remove(reservation.property_id, reservation.id)
     return reservation
@@ -0,0 +1,149 @@
+"""
+Criação de reservas em lote (POST /reservations/batch).
+
+Uma consulta carrega as propriedades do lote, outra traz as reservas ativas
+que caem na janela do lote. Os conflitos (com o banco e entre itens do próprio
+lote) são resolvidos em memória com intervalos ordenados por propriedade, na
+ordem do lote: o primeiro item vence. As linhas aceitas vão num único
+INSERT ... VALUES (...), (...) RETURNING.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.expressions import DateRangeOverlaps
+from app.db.models import Property, Reservation, RESERVATION_NO_OVERLAP
+from app.db.schema import ReservationCreate
+from app.service.availability_index import PropertyIntervals, availability_index
+from app.service.calendar import calendar_cache
+from app.service.property import _active_intervals_stmt, _validate_availability
+from app.service.quotes import stay_total
+from app.service.reservation import _integrity_error, calculate_days_reserved
+
+ALL_OR_NOTHING = "all_or_nothing"
+BEST_EFFORT = "best_effort"
+
+
+def _error(index: int, status_code: int, detail: str) -> dict:
+    return {"index": index, "status_code": status_code, "detail": detail, "reservation": None}
+
+
+def _plan(db: Session, items: List[ReservationCreate]) -> Tuple[List[Optional[dict]], List[Tuple[int, dict]]]:
+    """Resultado de erro por item (None = aceito) e as linhas a inserir."""
+
+    property_ids = sorted({item.property_id for item in items})
+    props = {
+        row.id: row
+        for row in db.execute(
+            select(Property.id, Property.capacity, Property.price_per_night).where(
+                Property.id.in_(property_ids)
+            )
+        )
+    }
+
+    results: List[Optional[dict]] = [None] * len(items)
+    candidates = []
+    for index, item in enumerate(items):
+        try:
+            _validate_availability(
+                props.get(item.property_id), item.start_date, item.end_date, item.guests_quantity
+            )
+            days = calculate_days_reserved(item.start_date, item.end_date)
+        except HTTPException as e:
+            results[index] = _error(index, e.status_code, e.detail)
+            continue
+        except ValueError as e:
+            results[index] = _error(index, status.HTTP_409_CONFLICT, str(e))
+            continue
+        candidates.append((index, item, days))
+
+    intervals: Dict[int, PropertyIntervals] = {}
+    if candidates:
+        window_start = min(item.start_date for _, item, _ in candidates)
+        window_end = max(item.end_date for _, item, _ in candidates)
+        existing = db.execute(
+            _active_intervals_stmt(sorted({item.property_id for _, item, _ in candidates})).where(
+                DateRangeOverlaps(Reservation.start_date, Reservation.end_date, window_start, window_end)
+            )
+        )
+        grouped: Dict[int, list] = {}
+        for property_id, start_date, end_date, reservation_id in existing:
+            grouped.setdefault(property_id, []).append((start_date, end_date, reservation_id))
+        intervals = {pid: PropertyIntervals(rows) for pid, rows in grouped.items()}
+
+    accepted = []
+    for index, item, days in candidates:
+        taken = intervals.setdefault(item.property_id, PropertyIntervals([]))
+        if taken.conflicts(item.start_date, item.end_date):
+            results[index] = _error(
+                index, status.HTTP_409_CONFLICT, "Período indisponível para esta propriedade"
+            )
+            continue
+        # ids negativos marcam itens do lote ainda não gravados
+        taken.add((item.start_date, item.end_date, -1 - index))
+
+        total = stay_total(props[item.property_id].price_per_night, days)
+        accepted.append((index, {**item.model_dump(), "total_price": total, "is_active": True}))
+
+    return results, accepted
+
+
+def _summary(mode: str, results: List[dict]) -> dict:
+    created = sum(1 for r in results if r["status_code"] == status.HTTP_201_CREATED)
+    return {
+        "mode": mode,
+        "created": created,
+        "failed": len(results) - created,
+        "results": results,
+    }
+
+
+def create_reservations_batch(
+    db: Session, items: List[ReservationCreate], mode: str = BEST_EFFORT
+) -> dict:
+    for attempt in range(2):
+        results, accepted = _plan(db, items)
+
+        if mode == ALL_OR_NOTHING and any(r is not None for r in results):
+            for index, _ in accepted:
+                results[index] = _error(
+                    index,
+                    status.HTTP_424_FAILED_DEPENDENCY,
+                    "Não criada: o lote é tudo-ou-nada e outro item falhou",
+                )
+            return _summary(mode, results)
+
+        try:
+            created = []
+            if accepted:
+                created = db.execute(
+                    insert(Reservation).returning(Reservation),
+                    [row for _, row in accepted],
+                ).scalars().all()
+                for obj in created:
+                    db.expunge(obj)
+            db.commit()
+        except IntegrityError as e:
+            db.rollback()
+            # uma reserva concorrente entrou entre o plano e o INSERT: replaneja uma vez
+            if attempt == 0 and RESERVATION_NO_OVERLAP in str(e.orig):
+                continue
+            raise _integrity_error(e) from e
+
+        # (property_id, start_date) é único entre os aceitos: casa o RETURNING com os itens
+        by_key = {(obj.property_id, obj.start_date): obj for obj in created}
+        for index, row in accepted:
+            obj = by_key[(row["property_id"], row["start_date"])]
+            results[index] = {
+                "index": index,
+                "status_code": status.HTTP_201_CREATED,
+                "detail": None,
+                "reservation": obj,
+            }
+            calendar_cache.invalidate(obj.property_id)
+            if availability_index.enabled:
+                availability_index.add(obj.property_id, obj.start_date, obj.end_date, obj.id)
+        return _summary(mode, results)
@@ -0,0 +1,150 @@
+"""
+Cache de respostas já serializadas (opcional, PROPERTY_LIST_CACHE=1).
+
+Guarda o corpo JSON pronto de GET /properties/list por combinação normalizada
+de filtros. A invalidação é por geração: toda escrita no catálogo incrementa um
+contador que faz parte da chave, então as entradas antigas simplesmente deixam
+de ser lidas e saem pelo LRU/TTL.
+
+O backend é plugável:
+  - "memory" (padrão): LRU + TTL no próprio processo. Cada worker tem o seu
+    cache e a sua geração; escritas feitas por outro worker só aparecem após o TTL.
+  - "shared": qualquer cliente no estilo Redis (get/set(ex=)/incr), com a
+    geração compartilhada entre os workers.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Protocol, Tuple
+
+from app.settings import settings
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    def generation(self) -> int: ...
+
+    def bump(self) -> int: ...
+
+    def clear(self) -> None: ...
+
+
+class InMemoryBackend:
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generation(self) -> int:
+        return self._generation
+
+    def bump(self) -> int:
+        with self._lock:
+            self._generation += 1
+            # nada da geração anterior volta a ser lido: libera a memória já
+            self._entries.clear()
+            return self._generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SharedStoreBackend:
+    """
+    Adaptador para um store compartilhado no estilo Redis. A expiração e a
+    evicção (ex.: maxmemory-policy allkeys-lru) ficam a cargo do próprio store.
+    """
+
+    def __init__(self, client: Any, prefix: str = "cache"):
+        self.client = client
+        self.prefix = prefix
+        self._generation_key = f"{prefix}:generation"
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(f"{self.prefix}:{key}")
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.client.set(f"{self.prefix}:{key}", value, ex=max(1, int(ttl)))
+
+    def generation(self) -> int:
+        return int(self.client.get(self._generation_key) or 0)
+
+    def bump(self) -> int:
+        return int(self.client.incr(self._generation_key))
+
+    def clear(self) -> None:
+        self.bump()
+
+
+class ResponseCache:
+    def __init__(self, backend: CacheBackend, enabled: bool = False, ttl: float = 30.0):
+        self.backend = backend
+        self.enabled = enabled
+        self.ttl = ttl
+
+    def key(self, params: Tuple[Hashable, ...]) -> str:
+        """
+        Chave da geração atual. Deve ser tirada antes da consulta: se uma escrita
+        acontecer no meio, o resultado vai para uma chave que já não é lida.
+        """
+        return f"{self.backend.generation()}:{params!r}"
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Optional[int]]]:
+        """(corpo, next_after_id) guardados, ou None."""
+        value = self.backend.get(key)
+        if value is None:
+            return None
+        head, _, body = value.partition(b"\n")
+        return body, int(head) if head else None
+
+    def set(self, key: str, body: bytes, next_after_id: Optional[int]) -> None:
+        head = b"" if next_after_id is None else str(next_after_id).encode()
+        self.backend.set(key, head + b"\n" + body, self.ttl)
+
+    def invalidate(self) -> None:
+        if self.enabled:
+            self.backend.bump()
+
+
+def _make_backend(kind: str, prefix: str) -> CacheBackend:
+    if kind == "shared":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("PROPERTY_LIST_CACHE_BACKEND=shared requer o pacote redis") from e
+        return SharedStoreBackend(redis.Redis.from_url(settings.cache_url), prefix)
+    return InMemoryBackend(settings.property_list_cache_max_entries)
+
+
+property_list_cache = ResponseCache(
+    _make_backend(settings.property_list_cache_backend, "properties:list"),
+    enabled=settings.property_list_cache,
+    ttl=settings.property_list_cache_ttl,
+)
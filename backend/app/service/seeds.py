@@ -1,12 +1,25 @@
+import json
+from dataclasses import dataclass
 from datetime import date
-from decimal import Decimal, ROUND_HALF_UP
-from typing import Dict, List, Tuple
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from fastapi import HTTPException, status
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import Date, Integer, String, and_, column, insert, select, values
 
 from app.db.models import Property, Reservation 
+from app.db.schema import PropertyCreate
+from app.service.availability_index import availability_index
+from app.service.bulk_import import _validation_messages
+from app.service.calendar import calendar_cache
+from app.service.response_cache import property_list_cache
+from app.service.quotes import stay_total
+
+# chaves por consulta de checagem: 4 parâmetros por reserva, abaixo do limite
+# de 32766 variáveis do SQLite
+SEED_CHECK_CHUNK = 5000
 
 
 def seed_properties_data() -> List[dict]:
@@ -141,64 +154,129 @@ def compute_total_price(price_per_night: Decimal, start_date: date, end_date: da
     days = (end_date - start_date).days
     if days <= 0:
         days = 1
-    return (price_per_night * Decimal(days)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return stay_total(price_per_night, days)
+
+
+# ---------- MANIFESTO ----------
+
+def _valid_property(index: int, raw: dict) -> dict:
+    try:
+        return PropertyCreate.model_validate(raw).model_dump()
+    except ValidationError as e:
+        raise ValueError(f"properties[{index}]: " + "; ".join(_validation_messages(e))) from None
+
+
+@dataclass
+class SeedManifest:
+    """Propriedades e reservas da seed; reservas apontam a propriedade por 'property_title'."""
+    properties: List[dict]
+    reservations: List[dict]
+
+    def __post_init__(self):
+        # as regras de POST /properties valem para o seed (strip, preço >= 0, rooms/capacity >= 1)
+        self.properties = [_valid_property(i, p) for i, p in enumerate(self.properties)]
+        titles = [p["title"] for p in self.properties]
+        if len(set(titles)) != len(titles):
+            raise ValueError("Manifesto com títulos de propriedade repetidos.")
+        # período invertido quebraria o daterange da exclusion constraint no Postgres
+        for i, r in enumerate(self.reservations):
+            if r["end_date"] <= r["start_date"]:
+                raise ValueError(f"reservations[{i}]: a data final deve ser maior que a data inicial")
+            if r["guests_quantity"] < 1:
+                raise ValueError(f"reservations[{i}]: guests_quantity deve ser pelo menos 1")
+
+
+def default_manifest() -> SeedManifest:
+    return SeedManifest(seed_properties_data(), seed_reservations_data())
+
+
+def load_seed_manifest(path: str) -> SeedManifest:
+    """
+    Lê um manifesto JSON {"properties": [...], "reservations": [...]} no formato
+    de seed_properties_data/seed_reservations_data (datas em ISO 8601).
+    """
+    with open(path, encoding="utf-8") as fh:
+        raw = json.load(fh)
+
+    properties = [
+        {**p, "price_per_night": Decimal(str(p["price_per_night"]))} for p in raw.get("properties", [])
+    ]
+    reservations = [
+        {
+            **r,
+            "start_date": date.fromisoformat(r["start_date"]),
+            "end_date": date.fromisoformat(r["end_date"]),
+        }
+        for r in raw.get("reservations", [])
+    ]
+    return SeedManifest(properties, reservations)
 
 
 # ---------- CHECAGENS / REGRAS ----------
 
-def _any_seed_property_exists(db: Session, titles: List[str]) -> List[str]:
-    """Retorna títulos já existentes dentre os títulos do seed."""
-    rows = db.query(Property).filter(Property.title.in_(titles)).all()
-    return [r.title for r in rows]
+def _chunks(items: list, size: int = SEED_CHECK_CHUNK) -> Iterator[list]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _existing_property_ids(db: Session, titles: List[str]) -> Dict[str, int]:
+    """title -> id das propriedades do manifesto que já estão no banco."""
+    found: Dict[str, int] = {}
+    for chunk in _chunks(titles):
+        found.update(db.execute(select(Property.title, Property.id).where(Property.title.in_(chunk))).all())
+    return found
 
 
 def _any_seed_reservation_exists(
-    db: Session, res_data: List[dict]
+    db: Session, res_data: List[dict], prop_ids: Dict[str, int]
 ) -> List[Tuple[str, str, date, date]]:
     """
     Checa se alguma reserva do seed já existe.
-    Considera um 'match' por (property_id, client_email, start_date, end_date).
+    Considera um 'match' por (property_id, client_email, start_date, end_date):
+    as chaves vão numa lista VALUES (CTE) com join em reservations, uma consulta
+    por bloco de SEED_CHECK_CHUNK reservas.
     Retorna lista de tuplas (property_title, client_email, start_date, end_date) já existentes.
     """
-    duplicates = []
-
-    # Mapear titles -> ids existentes no banco
-    titles = sorted({r["property_title"] for r in res_data})
-    props = db.query(Property).filter(Property.title.in_(titles)).all()
-    prop_by_title = {p.title: p for p in props}
-
-    for r in res_data:
-        p = prop_by_title.get(r["property_title"])
-        if not p:
-            # se a property ainda não existe, essa reserva ainda não pode existir (ok)
-            continue
+    # se a property ainda não existe, essa reserva ainda não pode existir (ok)
+    keys = [
+        (prop_ids[r["property_title"]], r["client_email"], r["start_date"], r["end_date"])
+        for r in res_data
+        if r["property_title"] in prop_ids
+    ]
+    title_by_id = {pid: title for title, pid in prop_ids.items()}
 
-        found = (
-            db.query(Reservation)
-            .filter(
+    duplicates = []
+    for chunk in _chunks(keys):
+        seed_keys = values(
+            column("property_id", Integer),
+            column("client_email", String),
+            column("start_date", Date),
+            column("end_date", Date),
+            name="seed_keys",
+        ).data(chunk).cte("seed_keys")
+        rows = db.execute(
+            select(seed_keys).join(
+                Reservation,
                 and_(
-                    Reservation.property_id == p.id,
-                    Reservation.client_email == r["client_email"],
-                    Reservation.start_date == r["start_date"],
-                    Reservation.end_date == r["end_date"],
-                )
+                    Reservation.property_id == seed_keys.c.property_id,
+                    Reservation.client_email == seed_keys.c.client_email,
+                    Reservation.start_date == seed_keys.c.start_date,
+                    Reservation.end_date == seed_keys.c.end_date,
+                ),
             )
-            .first()
         )
-        if found:
-            duplicates.append(
-                (r["property_title"], r["client_email"], r["start_date"], r["end_date"])
-            )
-
+        duplicates.extend(
+            (title_by_id[pid], email, start, end) for pid, email, start, end in rows
+        )
     return duplicates
 
 
-def _assert_seed_not_applied(db: Session):
+def _assert_seed_not_applied(db: Session, manifest: SeedManifest) -> None:
     """Se QUALQUER item do seed já existir, lança 409 e não cria nada."""
-    prop_titles = [p["title"] for p in seed_properties_data()]
-    prop_dupes = _any_seed_property_exists(db, prop_titles)
+    prop_ids = _existing_property_ids(db, [p["title"] for p in manifest.properties])
+    prop_dupes = list(prop_ids)
 
-    res_dupes = _any_seed_reservation_exists(db, seed_reservations_data())
+    res_dupes = _any_seed_reservation_exists(db, manifest.reservations, prop_ids) if prop_ids else []
 
     if prop_dupes or res_dupes:
         detail = {
@@ -218,82 +296,110 @@ def _assert_seed_not_applied(db: Session):
 
 
 # ---------- CRIAÇÃO ----------
-
-def seed_5_properties(db: Session) -> Dict[str, Property]:
-    """Cria exatamente 5 propriedades e retorna dict title -> Property."""
-    created_map: Dict[str, Property] = {}
-    for data in seed_properties_data():
-        obj = Property(**data)
-        db.add(obj)
-        db.flush()  # garante ID após INSERT
-        created_map[obj.title] = obj
-    return created_map
-
-
-def seed_5_reservations(
-    db: Session, props_by_title: Dict[str, Property]
-) -> List[Reservation]:
+# INSERT ... VALUES (...), (...) RETURNING em lotes (insertmanyvalues do
+# SQLAlchemy). O RETURNING traz a própria chave (título, property_id), então a
+# ordem das linhas devolvidas não importa e não precisa de sort_by_parameter_order,
+# que no SQLite volta a um INSERT por linha
+
+def seed_properties(db: Session, properties: List[dict]) -> Dict[str, int]:
+    """Cria as propriedades do manifesto e retorna dict title -> id."""
+    if not properties:
+        return {}
+    rows = db.execute(
+        insert(Property).returning(Property.title, Property.id),
+        properties,
+    )
+    return dict(rows.all())
+
+
+def seed_reservations(
+    db: Session, reservations: List[dict], properties: List[dict], prop_ids: Dict[str, int]
+) -> List[int]:
     """
-    Cria exatamente 5 reservas e JÁ PREENCHE total_price usando price_per_night da Property.
+    Cria as reservas do manifesto e JÁ PREENCHE total_price usando price_per_night da Property.
+    Retorna os property_id das reservas criadas.
     """
-    created: List[Reservation] = []
-    for r in seed_reservations_data():
-        p = props_by_title.get(r["property_title"])
-        if not p:
-            # Como o orquestrador sempre cria as 5 props antes, isso não deve ocorrer.
+    price_by_title = {p["title"]: p["price_per_night"] for p in properties}
+    rows = []
+    for r in reservations:
+        title = r["property_title"]
+        if title not in prop_ids:
+            # Como o orquestrador sempre cria as props antes, isso não deve ocorrer.
             raise HTTPException(
                 status_code=500,
-                detail=f"Property '{r['property_title']}' não foi criada.",
+                detail=f"Property '{title}' não foi criada.",
             )
-
-        total = compute_total_price(p.price_per_night, r["start_date"], r["end_date"])
-
-        obj = Reservation(
-            property_id=p.id,
-            client_name=r["client_name"],
-            client_email=r["client_email"],
-            start_date=r["start_date"],
-            end_date=r["end_date"],
-            guests_quantity=r["guests_quantity"],
-            total_price=total,  # <— já sobe calculado
-        )
-        db.add(obj)
-        db.flush()
-        created.append(obj)
-    return created
+        rows.append({
+            "property_id": prop_ids[title],
+            "client_name": r["client_name"],
+            "client_email": r["client_email"],
+            "start_date": r["start_date"],
+            "end_date": r["end_date"],
+            "guests_quantity": r["guests_quantity"],
+            "total_price": compute_total_price(price_by_title[title], r["start_date"], r["end_date"]),
+        })
+    if not rows:
+        return []
+    return db.execute(
+        insert(Reservation).returning(Reservation.property_id), rows
+    ).scalars().all()
 
 
 # ---------- ORQUESTRADOR ----------
 
-def apply_full_seed(db: Session) -> dict:
+def apply_full_seed(db: Session, manifest: Optional[SeedManifest] = None) -> dict:
     """
-    Orquestra o seed:
+    Orquestra o seed (por padrão o das 5 propriedades/5 reservas):
       1) Falha com 409 se já existe qualquer dado do seed
-      2) Cria 5 propriedades
-      3) Cria 5 reservas (2 na A, 2 na B, 1 na C; D e E sem reservas), com total_price calculado
+      2) Cria as propriedades
+      3) Cria as reservas, com total_price calculado
       4) Commita e retorna resumo
     """
-    _assert_seed_not_applied(db)
+    manifest = manifest or default_manifest()
+    _assert_seed_not_applied(db, manifest)
 
     try:
-        props_by_title = seed_5_properties(db)
-        res_created = seed_5_reservations(db, props_by_title)
+        prop_ids = seed_properties(db, manifest.properties)
+        res_property_ids = seed_reservations(db, manifest.reservations, manifest.properties, prop_ids)
         db.commit()
     except Exception:
         db.rollback()
         raise
+    property_list_cache.invalidate()
+    for pid in prop_ids.values():
+        calendar_cache.invalidate(pid)
+        if availability_index.enabled:
+            availability_index.discard(pid)
 
     # resumo para resposta
-    created_props = list(props_by_title.keys())
+    created_props = list(prop_ids.keys())
     # contabiliza reservas por propriedade (por título)
     counts: Dict[str, int] = {t: 0 for t in created_props}
-    tit_by_id = {p.id: t for t, p in props_by_title.items()}
-    for r in res_created:
-        counts[tit_by_id[r.property_id]] += 1
+    tit_by_id = {pid: t for t, pid in prop_ids.items()}
+    for pid in res_property_ids:
+        counts[tit_by_id[pid]] += 1
 
     return {
         "message": "Seed aplicada com sucesso.",
         "created_properties": created_props,
         "reservations_distribution": counts,
-        "reservations_total": len(res_created),
+        "reservations_total": len(res_property_ids),
     }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import argparse
+
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Aplica um manifesto de seed (JSON).")
+    parser.add_argument("manifest")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        result = apply_full_seed(db, load_seed_manifest(args.manifest))
+    print(f"{len(result['created_properties'])} propriedades e {result['reservations_total']} reservas criadas")
+
+
+if __name__ == "__main__":
+    main()
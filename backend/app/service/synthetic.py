@@ -0,0 +1,215 @@
+"""
+Gerador de dados sintéticos para carga e benchmarks.
+
+    python -m app.service.synthetic --scale 100 --seed 42
+    POST /seed?scale=1&seed=42
+
+Cada unidade de `scale` são SCALE_PROPERTIES propriedades com, em média,
+`reservations_per_property` reservas cada (scale=100 → 100k propriedades e
+~1M reservas). A mesma semente gera sempre o mesmo conteúdo (os ids dependem
+do que já existe no banco). As reservas de uma propriedade andam para frente
+no calendário com pelo menos um dia de folga entre elas, então nunca se
+sobrepõem (nem pela exclusion constraint, que compara com '[]').
+
+A carga vai em lotes. As propriedades entram com INSERT ... RETURNING id (as
+reservas precisam dos ids, e só os do próprio INSERT, nunca os de outra
+conexão); as reservas, dez vezes mais linhas, com COPY no Postgres (psycopg2)
+e executemany com insert() nos outros bancos. Tudo numa transação só,
+commitada no fim.
+"""
+import argparse
+import random
+import time
+import unicodedata
+from datetime import date
+from decimal import Decimal
+from typing import Iterator, List, Optional
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.db.models import Property, Reservation
+from app.db.replicas import note_write
+from app.service.availability_index import availability_index
+from app.service.bulk_import import copy_rows, supports_copy
+from app.service.calendar import calendar_cache
+from app.service.response_cache import property_list_cache
+
+SCALE_PROPERTIES = 1000
+DEFAULT_RESERVATIONS_PER_PROPERTY = 10
+BATCH_PROPERTIES = 10_000
+FIRST_DAY = date(2025, 1, 1)
+
+RESERVATION_COLUMNS = [
+    "property_id", "client_name", "client_email", "start_date", "end_date",
+    "guests_quantity", "total_price", "is_active",
+]
+
+_KINDS = ["Casa", "Chalé", "Apartamento", "Pousada", "Sítio", "Cabana", "Loft", "Fazenda"]
+_NAMES = ["do Sol", "da Serra", "das Palmeiras", "do Lago", "Vista Mar", "do Cedro",
+          "das Araucárias", "do Vale", "da Praia", "do Ipê", "Serena", "da Cachoeira"]
+_STREETS = ["Rua das Flores", "Av. Brasil", "Rua da Lagoa", "Alameda dos Anjos",
+            "Rua XV de Novembro", "Av. Beira Mar", "Rua do Comércio", "Travessa da Paz"]
+_NEIGHBORHOODS = ["Centro", "Jardim", "Lagoa", "Serra Verde", "Praia Grande", "Vila Nova",
+                  "Boa Vista", "Santa Luzia"]
+_CITIES = [
+    ("Florianópolis", "SC"), ("Gramado", "RS"), ("Paraty", "RJ"), ("Búzios", "RJ"),
+    ("Ouro Preto", "MG"), ("Diamantina", "MG"), ("Tiradentes", "MG"), ("Ubatuba", "SP"),
+    ("Campos do Jordão", "SP"), ("Porto Seguro", "BA"), ("Jericoacoara", "CE"),
+    ("Bonito", "MS"), ("Pirenópolis", "GO"), ("Fernando de Noronha", "PE"),
+    ("Maragogi", "AL"), ("Canela", "RS"),
+]
+_FIRST_NAMES = ["Ana", "Bruno", "Carla", "Diego", "Eduarda", "Felipe", "Gabriela", "Hugo",
+                "Isabela", "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rian",
+                "Sofia", "Tiago", "Vitória", "William"]
+_LAST_NAMES = ["Silva", "Souza", "Oliveira", "Santos", "Pereira", "Lima", "Carvalho",
+               "Ferreira", "Rodrigues", "Almeida", "Costa", "Gomes", "Martins", "Araújo"]
+_DOMAINS = ["example.com", "mail.com", "correio.com.br", "teste.org"]
+
+
+def _ascii(value: str) -> str:
+    return unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode().lower()
+
+
+# (nome, início do e-mail) já montados: o laço das reservas roda milhões de vezes
+_CLIENTS = [
+    (f"{first} {last}", f"{_ascii(first)}.{_ascii(last)}")
+    for first in _FIRST_NAMES
+    for last in _LAST_NAMES
+]
+
+
+def generate_properties(rnd: random.Random, count: int) -> Iterator[dict]:
+    for n in range(count):
+        city, state = rnd.choice(_CITIES)
+        rooms = rnd.randint(1, 6)
+        yield {
+            "title": f"{rnd.choice(_KINDS)} {rnd.choice(_NAMES)}",
+            "address_street": rnd.choice(_STREETS),
+            "address_number": str(rnd.randint(1, 9999)),
+            "address_neighborhood": rnd.choice(_NEIGHBORHOODS),
+            "address_city": city,
+            "address_state": state,
+            "country": "BRA",
+            "rooms": rooms,
+            "capacity": rooms * rnd.randint(1, 3),
+            # centavos inteiros: o total da reserva sai exato, sem arredondar
+            "price_per_night": Decimal(rnd.randint(80, 1500) * 100 + rnd.choice((0, 50, 90))).scaleb(-2),
+        }
+
+
+def generate_reservations(
+    rnd: random.Random, prop_id: int, prop: dict, average: int
+) -> Iterator[dict]:
+    """Reservas de uma propriedade, em ordem de data e sem sobreposição."""
+    random_ = rnd.random
+    day = FIRST_DAY.toordinal() + int(random_() * 31)
+    cents = int(prop["price_per_night"] * 100)
+    capacity = prop["capacity"]
+    for _ in range(int(random_() * (2 * average + 1))):
+        start = day + int(random_() * 21)
+        nights = 1 + int(random_() * 14)
+        name, email = _CLIENTS[int(random_() * len(_CLIENTS))]
+        yield {
+            "property_id": prop_id,
+            "client_name": name,
+            "client_email": f"{email}{1 + int(random_() * 99999)}@{_DOMAINS[int(random_() * len(_DOMAINS))]}",
+            "start_date": date.fromordinal(start),
+            "end_date": date.fromordinal(start + nights),
+            "guests_quantity": 1 + int(random_() * capacity),
+            "total_price": Decimal(cents * nights).scaleb(-2),
+            # ~5% canceladas: ficam fora da constraint e das buscas
+            "is_active": random_() >= 0.05,
+        }
+        day = start + nights + 1
+
+
+def _insert_rows(db: Session, model, columns: List[str], rows: List[dict]) -> None:
+    if not rows:
+        return
+    if supports_copy(db):
+        copy_rows(db, model.__tablename__, columns, rows)
+    else:
+        # Core direto na tabela: o bulk insert do ORM custa mais que o executemany;
+        # não passa pelos hooks da sessão, então marca a escrita à mão
+        note_write(db)
+        db.connection().execute(insert(model.__table__), rows)
+
+
+def _insert_properties(db: Session, props: List[dict]) -> List[int]:
+    """INSERT ... RETURNING id, na ordem de `props` (o COPY não devolve os ids)."""
+    stmt = insert(Property.__table__).returning(Property.__table__.c.id, sort_by_parameter_order=True)
+    return db.execute(stmt, props).scalars().all()
+
+
+def _load_batch(db: Session, rnd: random.Random, props: List[dict], average: int) -> int:
+    ids = _insert_properties(db, props)
+
+    reservations = [
+        r for prop_id, prop in zip(ids, props) for r in generate_reservations(rnd, prop_id, prop, average)
+    ]
+    _insert_rows(db, Reservation, RESERVATION_COLUMNS, reservations)
+    return len(reservations)
+
+
+def generate_dataset(
+    db: Session,
+    scale: int,
+    seed: int = 42,
+    reservations_per_property: int = DEFAULT_RESERVATIONS_PER_PROPERTY,
+    batch_properties: int = BATCH_PROPERTIES,
+) -> dict:
+    """Gera scale * SCALE_PROPERTIES propriedades com reservas e commita."""
+    rnd = random.Random(seed)
+    total_properties = scale * SCALE_PROPERTIES
+    total_reservations = 0
+    t0 = time.perf_counter()
+    try:
+        remaining = total_properties
+        while remaining:
+            size = min(batch_properties, remaining)
+            props = list(generate_properties(rnd, size))
+            total_reservations += _load_batch(db, rnd, props, reservations_per_property)
+            remaining -= size
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    property_list_cache.invalidate()
+    # carga em massa: mais barato zerar os caches do que invalidar propriedade por propriedade
+    calendar_cache.clear()
+    availability_index.clear()
+
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("ANALYZE properties"))
+        db.execute(text("ANALYZE reservations"))
+        db.commit()
+
+    return {
+        "message": "Dados sintéticos gerados com sucesso.",
+        "seed": seed,
+        "properties": total_properties,
+        "reservations": total_reservations,
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Gera propriedades e reservas sintéticas.")
+    parser.add_argument("--scale", type=int, default=1, help=f"unidades de {SCALE_PROPERTIES} propriedades")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reservations-per-property", type=int, default=DEFAULT_RESERVATIONS_PER_PROPERTY)
+    args = parser.parse_args(argv)
+
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        result = generate_dataset(db, args.scale, args.seed, args.reservations_per_property)
+    print(
+        f"{result['properties']} propriedades e {result['reservations']} reservas "
+        f"em {result['seconds']:.1f}s (seed {result['seed']})"
+    )
+
+
+if __name__ == "__main__":
+    main()
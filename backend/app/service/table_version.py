@@ -0,0 +1,93 @@
+"""
+ETags das listagens a partir de table_versions.
+
+A versão é lida antes da consulta da listagem: se uma escrita acontecer no
+meio, a resposta sai com a versão anterior e a próxima revalidação simplesmente
+não bate (nunca o contrário).
+
+A versão de uma tabela é a soma das suas linhas em table_versions (uma por
+conexão do Postgres que já escreveu nela; ver TableVersion).
+compact_table_versions dobra as linhas de conexões encerradas na linha 0 sem
+mudar a soma, para que o número de linhas não cresça com a troca de conexões.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.models import TableVersion
+
+
+_COMPACT_SQL = text(
+    """
+    WITH gone AS (
+        DELETE FROM table_versions t
+        WHERE t.backend <> 0
+          AND NOT EXISTS (SELECT 1 FROM pg_stat_activity a WHERE a.pid = t.backend)
+        RETURNING t.name, t.version
+    )
+    UPDATE table_versions v SET version = v.version + g.total
+    FROM (SELECT name, sum(version) AS total FROM gone GROUP BY name) g
+    WHERE v.name = g.name AND v.backend = 0
+    """
+)
+
+
+def _table_version_stmt(name: str) -> Select:
+    return select(func.coalesce(func.sum(TableVersion.version), 0)).where(TableVersion.name == name)
+
+
+def get_table_version(db: Session, name: str) -> int:
+    return int(db.execute(_table_version_stmt(name)).scalar_one())
+
+
+async def get_table_version_async(db: AsyncSession, name: str) -> int:
+    return int((await db.execute(_table_version_stmt(name))).scalar_one())
+
+
+def compact_table_versions(db: Session) -> int:
+    """Dobra na linha 0 as linhas de conexões que já não existem (só Postgres)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return 0
+    moved = db.execute(_COMPACT_SQL).rowcount
+    db.commit()
+    return moved
+
+
+def make_etag(request: Request, name: str, version: int) -> str:
+    # filtros/cursor diferentes são representações diferentes da mesma versão
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    digest = hashlib.blake2b(query.encode(), digest_size=8).hexdigest()
+    return f'"{name}-{version}-{digest}"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # comparação fraca (RFC 9110): ignora o prefixo W/
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """304 pronto se o cliente já tem esta versão; senão None."""
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
+
+
+def main() -> None:
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        moved = compact_table_versions(db)
+    print(f"table_versions: {moved} linhas de conexões encerradas compactadas")
+
+
+if __name__ == "__main__":
+    main()
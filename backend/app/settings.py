@@ -0,0 +1,173 @@
+"""
+Configuração da aplicação a partir do ambiente (.env via docker compose ou
+python-dotenv). Todos os os.getenv do projeto ficam aqui.
+"""
+import os
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.engine import URL, make_url
+
+load_dotenv()
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return default if value is None or value.strip() == "" else int(value)
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return default if value is None or value.strip() == "" else float(value)
+
+
+def _env_str(name: str, default: str) -> str:
+    value = os.getenv(name)
+    return default if value is None or value.strip() == "" else value.strip()
+
+
+@dataclass(frozen=True)
+class Settings:
+    # banco (mesmas variáveis do serviço db no docker compose)
+    db_name: str = "appdb"
+    db_user: str = "user"
+    db_password: str = "password"
+    db_host: str = "db"
+    db_port: int = 5432
+    # DATABASE_URL, se definida, tem precedência sobre as partes acima
+    database_url_override: Optional[str] = None
+
+    # réplicas de leitura (DATABASE_REPLICA_URLS, separadas por vírgula)
+    db_replica_urls: Tuple[str, ...] = field(default=(), repr=False)
+    # segundos fora da rotação depois de uma falha de conexão
+    db_replica_retry_after: float = 30.0
+    # 0 = desligado; leituras vão ao primário por N segundos após uma escrita do cliente
+    read_your_writes_seconds: float = 0.0
+
+    # pool por processo: pool_size conexões fixas + max_overflow temporárias
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800
+    # 0 = sem limite
+    db_statement_timeout_ms: int = 0
+
+    # None = pool_size + max_overflow (ver threadpool_tokens)
+    threadpool_size: Optional[int] = None
+
+    db_async: bool = False
+
+    # modo dev: loga statements idênticos repetidos numa mesma requisição
+    query_repeat_detector: bool = False
+    query_repeat_threshold: int = 3
+
+    # 0 = desligado; fração das consultas lentas com EXPLAIN gravado em arquivo
+    slow_query_ms: float = 0.0
+    slow_query_explain_sample: float = 0.0
+    slow_query_plan_file: str = "slow_query_plans.log"
+
+    # manifesto JSON usado por POST /seed no lugar da seed fixa
+    seed_manifest: Optional[str] = None
+
+    availability_index: bool = False
+    availability_index_max_properties: int = 10_000
+    availability_index_max_age: float = 60.0
+
+    property_list_cache: bool = False
+    property_list_cache_backend: str = "memory"
+    property_list_cache_ttl: float = 30.0
+    property_list_cache_max_entries: int = 1024
+    calendar_cache: bool = False
+    calendar_cache_ttl: float = 30.0
+    calendar_cache_max_entries: int = 10_000
+    cache_url: str = field(default="redis://localhost:6379/0", repr=False)
+
+    @property
+    def database_url(self) -> str:
+        if self.database_url_override:
+            return self.database_url_override
+        return URL.create(
+            "postgresql+psycopg2",
+            username=self.db_user,
+            password=self.db_password,
+            host=self.db_host,
+            port=self.db_port,
+            database=self.db_name,
+        ).render_as_string(hide_password=False)
+
+    @property
+    def async_database_url(self) -> str:
+        return make_url(self.database_url).set(drivername="postgresql+asyncpg").render_as_string(
+            hide_password=False
+        )
+
+    @property
+    def async_replica_urls(self) -> Tuple[str, ...]:
+        return tuple(
+            make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+            for url in self.db_replica_urls
+        )
+
+    @property
+    def threadpool_tokens(self) -> int:
+        """
+        Threads para as rotas sync. Com mais threads que conexões, as excedentes
+        ficam bloqueadas no checkout do pool (e estouram db_pool_timeout); com o
+        mesmo número, o excesso espera na fila do anyio sem ocupar thread.
+        """
+        if self.threadpool_size is not None:
+            return self.threadpool_size
+        return self.db_pool_size + self.db_max_overflow
+
+
+def load_settings() -> Settings:
+    return Settings(
+        db_name=_env_str("POSTGRES_DB", "appdb"),
+        db_user=_env_str("POSTGRES_USER", "user"),
+        db_password=_env_str("POSTGRES_PASSWORD", "password"),
+        db_host=_env_str("DB_HOST", "db"),
+        db_port=_env_int("DB_PORT", 5432),
+        database_url_override=os.getenv("DATABASE_URL") or None,
+        db_replica_urls=tuple(
+            url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+        ),
+        db_replica_retry_after=_env_float("DB_REPLICA_RETRY_AFTER", 30.0),
+        read_your_writes_seconds=_env_float("READ_YOUR_WRITES_SECONDS", 0.0),
+        db_pool_size=_env_int("DB_POOL_SIZE", 10),
+        db_max_overflow=_env_int("DB_MAX_OVERFLOW", 10),
+        db_pool_timeout=_env_float("DB_POOL_TIMEOUT", 30.0),
+        db_pool_pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+        db_pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+        db_statement_timeout_ms=_env_int("DB_STATEMENT_TIMEOUT_MS", 0),
+        threadpool_size=_env_int("THREADPOOL_SIZE", 0) or None,
+        db_async=_env_bool("DB_ASYNC", False),
+        query_repeat_detector=_env_bool("QUERY_REPEAT_DETECTOR", False),
+        query_repeat_threshold=_env_int("QUERY_REPEAT_THRESHOLD", 3),
+        slow_query_ms=_env_float("SLOW_QUERY_MS", 0.0),
+        slow_query_explain_sample=_env_float("SLOW_QUERY_EXPLAIN_SAMPLE", 0.0),
+        slow_query_plan_file=_env_str("SLOW_QUERY_PLAN_FILE", "slow_query_plans.log"),
+        seed_manifest=os.getenv("SEED_MANIFEST") or None,
+        availability_index=_env_bool("AVAILABILITY_INDEX", False),
+        availability_index_max_properties=_env_int("AVAILABILITY_INDEX_MAX_PROPERTIES", 10_000),
+        availability_index_max_age=_env_float("AVAILABILITY_INDEX_MAX_AGE", 60.0),
+        property_list_cache=_env_bool("PROPERTY_LIST_CACHE", False),
+        property_list_cache_backend=_env_str("PROPERTY_LIST_CACHE_BACKEND", "memory"),
+        property_list_cache_ttl=_env_float("PROPERTY_LIST_CACHE_TTL", 30.0),
+        property_list_cache_max_entries=_env_int("PROPERTY_LIST_CACHE_MAX_ENTRIES", 1024),
+        calendar_cache=_env_bool("CALENDAR_CACHE", False),
+        calendar_cache_ttl=_env_float("CALENDAR_CACHE_TTL", 30.0),
+        calendar_cache_max_entries=_env_int("CALENDAR_CACHE_MAX_ENTRIES", 10_000),
+        cache_url=_env_str("CACHE_URL", "redis://localhost:6379/0"),
+    )
+
+
+settings = load_settings()
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 import pytest
 
@@ -7,6 +7,7 @@ from app.db.models import Property, Reservation
 from fastapi.testclient import TestClient
 from app.main import app
 from app.db.session import get_db  
+from app.db.query_budget import count_queries as _count_queries, query_budget as _query_budget
 
 from sqlalchemy import create_engine
 from sqlalchemy.pool import StaticPool
@@ -20,11 +21,38 @@ def engine():
         poolclass=StaticPool,
         future=True,
     )
+
+    # SAVEPOINT de verdade no pysqlite (receita da documentação do SQLAlchemy): sem isso o
+    # driver só abre a transação no primeiro DML e um RELEASE commita a transação do teste
+    @event.listens_for(eng, "connect")
+    def _no_implicit_begin(dbapi_connection, _):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(eng, "begin")
+    def _explicit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(eng)
     yield eng
     Base.metadata.drop_all(eng)
     eng.dispose()
 
+@pytest.fixture()
+def pg_engine():
+    """Postgres de verdade (TEST_POSTGRES_URL, banco descartável); sem ela, pula."""
+    import os
+
+    url = os.getenv("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL não definida")
+    eng = create_engine(url)
+    Base.metadata.drop_all(eng)
+    Base.metadata.create_all(eng)
+    yield eng
+    Base.metadata.drop_all(eng)
+    eng.dispose()
+
+
 @pytest.fixture()
 def db_session(engine):
     connection = engine.connect()
@@ -38,6 +66,18 @@ def db_session(engine):
         trans.rollback()
         connection.close()
 
+@pytest.fixture()
+def count_queries(db_session):
+    """with count_queries() as q: ...  ->  q.statements (SQL enviado pela sessão de teste)."""
+    return lambda: _count_queries(db_session.get_bind())
+
+
+@pytest.fixture()
+def query_budget(db_session):
+    """with query_budget(2): ...  ->  falha se o bloco enviar mais de 2 statements."""
+    return lambda max_statements: _query_budget(db_session.get_bind(), max_statements)
+
+
 def _mk_property(session, **over):
     p = Property(
         title=over.get("title", "Casa Teste"),
@@ -85,3 +125,31 @@ def client(db_session):
         yield c
     app.dependency_overrides.clear()
 
+
+@pytest.fixture()
+def async_client():
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from app.main import create_app
+    from app.db.session import get_async_db
+
+    eng = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    AsyncTestingSession = async_sessionmaker(bind=eng, autoflush=False, expire_on_commit=False)
+
+    async def _create_all():
+        async with eng.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def _get_async_db_override():
+        async with AsyncTestingSession() as db:
+            yield db
+
+    async_app = create_app(async_mode=True)
+    async_app.dependency_overrides[get_async_db] = _get_async_db_override
+    with TestClient(async_app) as c:
+        c.portal.call(_create_all)
+        yield c
+        c.portal.call(eng.dispose)
@@ -0,0 +1,110 @@
+import inspect
+
+from app.routes.properties_async import router as properties_async_router
+from app.routes.reservations_async import router as reservations_async_router
+
+
+def _property_payload(**over):
+    payload = {
+        "title": "Casa Async",
+        "address_street": "Rua Beta",
+        "address_number": "55",
+        "address_neighborhood": "Centro",
+        "address_city": "Florianópolis",
+        "address_state": "SC",
+        "country": "BRA",
+        "rooms": 2,
+        "capacity": 4,
+        "price_per_night": 120,
+    }
+    payload.update(over)
+    return payload
+
+
+def test_async_routes_sao_corrotinas():
+    for route in properties_async_router.routes + reservations_async_router.routes:
+        assert inspect.iscoroutinefunction(route.endpoint), route.path
+
+
+def test_async_fluxo_property_reserva_cancelamento(async_client):
+    p = async_client.post("/properties", json=_property_payload())
+    assert p.status_code == 201, p.text
+    prop_id = p.json()["id"]
+
+    listed = async_client.get("/properties/list", params={"address_city": "Florianópolis"})
+    assert [x["id"] for x in listed.json()] == [prop_id]
+
+    ok = async_client.get("/properties/availability", params={
+        "property_id": prop_id,
+        "start_date": "2025-09-01",
+        "end_date": "2025-09-04",
+        "guests_quantity": 2,
+    })
+    assert ok.status_code == 200
+
+    created = async_client.post("/reservations", json={
+        "property_id": prop_id,
+        "client_name": "Fulana",
+        "client_email": "fulana@example.com",
+        "start_date": "2025-09-01",
+        "end_date": "2025-09-04",
+        "guests_quantity": 2,
+    })
+    assert created.status_code == 201, created.text
+    res = created.json()["reservation"]
+    assert res["total_price"] == 360.0
+
+    conflito = async_client.get("/properties/availability", params={
+        "property_id": prop_id,
+        "start_date": "2025-09-02",
+        "end_date": "2025-09-03",
+        "guests_quantity": 2,
+    })
+    assert conflito.status_code == 409
+
+    cancel = async_client.put(f"/reservations/{res['id']}/cancel")
+    assert cancel.status_code == 200
+    assert cancel.json()["is_active"] is False
+
+    by_email = async_client.get("/reservations", params={"client_email": "FULANA"})
+    assert [x["id"] for x in by_email.json()] == [res["id"]]
+
+
+def test_async_erros_404(async_client):
+    r = async_client.get("/properties/availability", params={
+        "property_id": 999,
+        "start_date": "2025-09-01",
+        "end_date": "2025-09-04",
+        "guests_quantity": 2,
+    })
+    assert r.status_code == 404
+    assert async_client.delete("/properties/999").status_code == 404
+    assert async_client.put("/reservations/999/cancel").status_code == 404
+
+
+def test_async_mantem_rotas_sem_versao_async(async_client):
+    paths = async_client.app.openapi()["paths"]
+    assert "/properties/search" in paths
+
+
+def test_async_list__etag_e_304(async_client):
+    first = async_client.get("/properties/list")
+    etag = first.headers["etag"]
+    assert async_client.get("/properties/list", headers={"If-None-Match": etag}).status_code == 304
+
+    async_client.post("/properties", json=_property_payload())
+    assert async_client.get("/properties/list", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_async_availability_batch(async_client):
+    p = async_client.post("/properties", json=_property_payload()).json()
+    async_client.post("/reservations", json={
+        "property_id": p["id"], "client_name": "Ana", "client_email": "ana@example.com",
+        "start_date": "2025-11-01", "end_date": "2025-11-03", "guests_quantity": 2,
+    })
+    items = [
+        {"property_id": p["id"], "start_date": d1, "end_date": d2, "guests_quantity": 2}
+        for d1, d2 in [("2025-11-02", "2025-11-04"), ("2025-11-04", "2025-11-06")]
+    ]
+    r = async_client.post("/properties/availability/batch", json={"items": items})
+    assert [x["available"] for x in r.json()["results"]] == [False, True]
@@ -0,0 +1,117 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.db.schema import ReservationCreate
+from app.service.availability_index import AvailabilityIndex, availability_index
+from app.service.property import (
+    check_availability,
+    find_conflicts,
+    verify_availability_index,
+    warm_availability_index,
+)
+from app.service.reservation import book_reservation, deactivate_reservation
+from app.tests.factories import persist_property, persist_reservation
+
+
+@pytest.fixture()
+def index_on(monkeypatch):
+    monkeypatch.setattr(availability_index, "enabled", True)
+    availability_index.clear()
+    yield availability_index
+    availability_index.clear()
+
+
+def test_index_conflitos_com_extremos_inclusivos():
+    idx = AvailabilityIndex(enabled=True)
+    idx.load(1, [(date(2025, 9, 1), date(2025, 9, 4), 10), (date(2025, 9, 10), date(2025, 9, 12), 11)], idx.load_token())
+
+    assert idx.lookup(1, date(2025, 9, 4), date(2025, 9, 6)) == [10]
+    assert idx.lookup(1, date(2025, 9, 5), date(2025, 9, 9)) == []
+    assert idx.lookup(1, date(2025, 8, 1), date(2025, 12, 1)) == [10, 11]
+    assert idx.lookup(2, date(2025, 9, 1), date(2025, 9, 2)) is None
+
+
+def test_index_eviction_lru_e_expiracao():
+    idx = AvailabilityIndex(enabled=True, max_properties=2)
+    for pid in (1, 2):
+        idx.load(pid, [], idx.load_token())
+    idx.lookup(1, date(2025, 1, 1), date(2025, 1, 2))
+    idx.load(3, [], idx.load_token())
+    assert 1 in idx and 3 in idx and 2 not in idx
+
+    idx.max_age = -1
+    assert idx.lookup(1, date(2025, 1, 1), date(2025, 1, 2)) is None
+    assert 1 not in idx
+
+
+def test_index_descarta_carga_concorrente_com_escrita():
+    idx = AvailabilityIndex(enabled=True)
+    token = idx.load_token()
+    idx.add(1, date(2025, 9, 1), date(2025, 9, 2), 99)
+    assert idx.load(1, [], token) is False
+    assert 1 not in idx
+
+
+def test_check_availability_usa_o_indice_depois_da_carga(db_session, index_on, count_queries):
+    prop = persist_property(db_session)
+    persist_reservation(db_session, property_id=prop.id, start_date=date(2025, 9, 1), end_date=date(2025, 9, 4))
+
+    check_availability(db_session, prop.id, date(2025, 9, 10), date(2025, 9, 12), 2)
+    assert prop.id in index_on
+
+    with count_queries() as q:
+        check_availability(db_session, prop.id, date(2025, 9, 20), date(2025, 9, 22), 2)
+    assert not any("reservations" in s for s in q.statements)
+
+    with pytest.raises(HTTPException) as ex:
+        check_availability(db_session, prop.id, date(2025, 9, 3), date(2025, 9, 5), 2)
+    assert ex.value.status_code == 409
+
+
+def test_indice_acompanha_reserva_e_cancelamento(db_session, index_on):
+    prop = persist_property(db_session)
+    check_availability(db_session, prop.id, date(2025, 9, 1), date(2025, 9, 4), 2)
+
+    created = book_reservation(db_session, ReservationCreate(
+        property_id=prop.id,
+        client_name="A",
+        client_email="a@x.com",
+        start_date=date(2025, 9, 1),
+        end_date=date(2025, 9, 4),
+        guests_quantity=2,
+    ))["reservation"]
+    assert index_on.lookup(prop.id, date(2025, 9, 2), date(2025, 9, 3)) == [created.id]
+
+    deactivate_reservation(db_session, created.id)
+    assert index_on.lookup(prop.id, date(2025, 9, 2), date(2025, 9, 3)) == []
+
+
+def test_carga_a_frio_e_consistencia_com_find_conflicts(db_session, index_on):
+    rnd = random.Random(7)
+    props = [persist_property(db_session, title=f"Casa {i}") for i in range(3)]
+    for prop in props:
+        day = date(2025, 1, 1)
+        for _ in range(15):
+            day += timedelta(days=rnd.randint(1, 6))
+            end = day + timedelta(days=rnd.randint(1, 4))
+            persist_reservation(
+                db_session, property_id=prop.id, start_date=day, end_date=end,
+                is_active=rnd.random() > 0.2,
+            )
+            day = end + timedelta(days=1)
+
+    assert warm_availability_index(db_session) == 3
+    assert verify_availability_index(db_session) == []
+
+    for _ in range(200):
+        prop = rnd.choice(props)
+        start = date(2025, 1, 1) + timedelta(days=rnd.randint(0, 200))
+        end = start + timedelta(days=rnd.randint(1, 10))
+        assert index_on.lookup(prop.id, start, end) == find_conflicts(db_session, prop.id, start, end)
+
+    persist_reservation(db_session, property_id=props[0].id, start_date=date(2026, 1, 1), end_date=date(2026, 1, 2))
+    assert verify_availability_index(db_session) == [props[0].id]
+    assert props[0].id not in index_on
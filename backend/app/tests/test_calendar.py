@@ -0,0 +1,214 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from app.service.calendar import calendar_cache
+from app.service.property import find_conflicts
+from app.tests.conftest import _mk_property, _mk_reservation
+
+
+@pytest.fixture()
+def cache_on(monkeypatch):
+    monkeypatch.setattr(calendar_cache, "enabled", True)
+    yield calendar_cache
+    calendar_cache._entries.clear()
+    calendar_cache._months_by_property.clear()
+
+
+@pytest.fixture()
+def prop(db_session):
+    prop = _mk_property(db_session)
+    # atravessa a virada de mês; a cancelada não ocupa
+    _mk_reservation(db_session, property_id=prop.id, start_date=date(2025, 8, 30), end_date=date(2025, 9, 2))
+    _mk_reservation(db_session, property_id=prop.id, start_date=date(2025, 9, 10), end_date=date(2025, 9, 10))
+    _mk_reservation(db_session, property_id=prop.id, start_date=date(2025, 9, 20), end_date=date(2025, 9, 22),
+                    is_active=False)
+    return prop
+
+
+def _calendar(client, prop_id, start, end, **params):
+    return client.get(f"/properties/{prop_id}/calendar", params={"from": start, "to": end, **params})
+
+
+def test_calendario_em_periodos(client, prop):
+    r = _calendar(client, prop.id, "2025-08-29", "2025-09-12")
+    assert r.status_code == 200
+    assert r.json() == {
+        "property_id": prop.id,
+        "from": "2025-08-29",
+        "to": "2025-09-12",
+        "occupied": [
+            {"start": "2025-08-30", "end": "2025-09-02"},
+            {"start": "2025-09-10", "end": "2025-09-10"},
+        ],
+        "free": [
+            {"start": "2025-08-29", "end": "2025-08-29"},
+            {"start": "2025-09-03", "end": "2025-09-09"},
+            {"start": "2025-09-11", "end": "2025-09-12"},
+        ],
+    }
+
+
+def test_calendario_em_bitmap(client, prop):
+    r = _calendar(client, prop.id, "2025-08-29", "2025-09-12", format="bitmap")
+    assert r.json()["bitmap"] == "011110000000100"
+    assert "occupied" not in r.json()
+
+
+def test_calendario_erros(client, prop):
+    assert _calendar(client, 999_999, "2025-09-01", "2025-09-30").status_code == 404
+    assert _calendar(client, prop.id, "2025-09-10", "2025-09-01").status_code == 400
+    assert _calendar(client, prop.id, "2025-01-01", "2026-01-02").status_code == 400
+    assert client.get(f"/properties/{prop.id}/calendar").status_code == 422
+
+
+def test_calendario_uma_consulta_e_depois_cache(client, prop, cache_on, query_budget):
+    prop_id = prop.id
+    with query_budget(1):
+        # três meses, uma consulta de intervalo
+        first = _calendar(client, prop_id, "2025-08-01", "2025-10-31")
+    with query_budget(0):
+        again = _calendar(client, prop_id, "2025-08-15", "2025-09-15")
+    assert first.status_code == again.status_code == 200
+    assert again.json()["occupied"][0] == {"start": "2025-08-30", "end": "2025-09-02"}
+
+
+def test_calendario_reserva_nova_invalida_so_a_propriedade(client, db_session, prop, cache_on, query_budget):
+    prop_id, other_id = prop.id, _mk_property(db_session, address_number="77").id
+    _calendar(client, prop_id, "2025-09-01", "2025-09-30")
+    _calendar(client, other_id, "2025-09-01", "2025-09-30")
+
+    r = client.post("/reservations", json={
+        "property_id": prop_id, "client_name": "Ana", "client_email": "ana@example.com",
+        "start_date": "2025-09-15", "end_date": "2025-09-16", "guests_quantity": 2,
+    })
+    assert r.status_code == 201
+
+    bitmap = _calendar(client, prop_id, "2025-09-14", "2025-09-17", format="bitmap").json()["bitmap"]
+    assert bitmap == "0110"
+    with query_budget(0):
+        assert _calendar(client, other_id, "2025-09-01", "2025-09-30").status_code == 200
+
+
+def test_calendario_cancelamento_invalida(client, db_session, cache_on):
+    prop_id = _mk_property(db_session).id
+    res_id = _mk_reservation(db_session, property_id=prop_id, start_date=date(2025, 9, 2),
+                             end_date=date(2025, 9, 3)).id
+    assert _calendar(client, prop_id, "2025-09-01", "2025-09-04", format="bitmap").json()["bitmap"] == "0110"
+
+    assert client.put(f"/reservations/{res_id}/cancel").status_code == 200
+    assert _calendar(client, prop_id, "2025-09-01", "2025-09-04", format="bitmap").json()["bitmap"] == "0000"
+
+
+def _next(client, prop_id, nights, start, end):
+    return client.get(f"/properties/{prop_id}/next-available", params={"nights": nights, "from": start, "to": end})
+
+
+def test_proxima_janela_de_uma_propriedade(client, prop):
+    # entrada e saída ocupam dias: 3 noites pedem 4 dias livres
+    assert _next(client, prop.id, 3, "2025-09-01", "2025-09-30").json() == {
+        "property_id": prop.id, "start_date": "2025-09-03", "end_date": "2025-09-06", "nights": 3,
+    }
+    # 7 noites não cabem em 03..09; a reserva cancelada de 20..22 não conta
+    assert _next(client, prop.id, 7, "2025-09-01", "2025-09-30").json()["start_date"] == "2025-09-11"
+    assert _next(client, prop.id, 7, "2025-09-01", "2025-09-17").status_code == 409
+
+
+def test_proxima_janela_erros(client, prop):
+    assert _next(client, 999_999, 3, "2025-09-01", "2025-09-30").status_code == 404
+    assert _next(client, prop.id, 3, "2025-09-01", "2025-09-03").status_code == 400
+    assert _next(client, prop.id, 0, "2025-09-01", "2025-09-30").status_code == 422
+
+
+def test_proxima_janela_usa_o_cache_do_calendario(client, prop, cache_on, query_budget):
+    prop_id = prop.id
+    _calendar(client, prop_id, "2025-09-01", "2025-09-30")
+    with query_budget(0):
+        assert _next(client, prop_id, 2, "2025-09-01", "2025-09-30").status_code == 200
+
+
+def _search_next(client, **params):
+    return client.get("/properties/next-available", params=params)
+
+
+def test_datas_flexiveis_varias_propriedades(client, db_session, query_budget):
+    busy = _mk_property(db_session, address_number="1").id
+    free = _mk_property(db_session, address_number="2").id
+    small = _mk_property(db_session, address_number="3", capacity=2).id
+    late = _mk_property(db_session, address_number="4").id
+    _mk_reservation(db_session, property_id=busy, start_date=date(2025, 2, 25), end_date=date(2025, 4, 2))
+    _mk_reservation(db_session, property_id=late, start_date=date(2025, 3, 1), end_date=date(2025, 3, 10))
+    _mk_reservation(db_session, property_id=late, start_date=date(2025, 3, 12), end_date=date(2025, 3, 20))
+
+    with query_budget(1):
+        r = _search_next(client, nights=3, **{"from": "2025-03-01", "to": "2025-03-31"}, guests=4)
+    assert r.status_code == 200
+    assert [(s["property_id"], s["start_date"], s["end_date"]) for s in r.json()] == [
+        (free, "2025-03-01", "2025-03-04"),
+        (late, "2025-03-21", "2025-03-24"),
+    ]
+    assert small not in [s["property_id"] for s in r.json()]
+
+    first = _search_next(client, nights=3, **{"from": "2025-03-01", "to": "2025-03-31"}, limit=1)
+    assert [s["property_id"] for s in first.json()] == [free]
+    rest = _search_next(client, nights=3, **{"from": "2025-03-01", "to": "2025-03-31"},
+                        cursor=first.headers["X-Next-Cursor"])
+    assert [s["property_id"] for s in rest.json()] == [small, late]
+
+
+def test_datas_flexiveis_igual_a_forca_bruta(client, db_session):
+    rnd = random.Random(7)
+    ids = [_mk_property(db_session, address_number=str(i)).id for i in range(15)]
+    for pid in ids:
+        day = date(2025, 1, 1) + timedelta(days=rnd.randint(0, 40))
+        while day < date(2025, 5, 1):
+            nights = rnd.randint(1, 6)
+            _mk_reservation(db_session, property_id=pid, start_date=day, end_date=day + timedelta(days=nights),
+                            is_active=rnd.random() > 0.2)
+            day += timedelta(days=nights + 1 + rnd.choice([0, 0, 1, 2, 4]))
+
+    start, end = date(2025, 2, 1), date(2025, 3, 15)
+    for nights in (1, 3, 5):
+        r = _search_next(client, nights=nights, **{"from": start.isoformat(), "to": end.isoformat()})
+        got = {s["property_id"]: s["start_date"] for s in r.json()}
+        expected = {}
+        for pid in ids:
+            day = start
+            while day + timedelta(days=nights) <= end:
+                if not find_conflicts(db_session, pid, day, day + timedelta(days=nights)):
+                    expected[pid] = day.isoformat()
+                    break
+                day += timedelta(days=1)
+        assert got == expected
+
+
+def test_calendario_async(async_client):
+    payload = {
+        "title": "Casa Async", "address_street": "Rua A", "address_number": "1",
+        "address_neighborhood": "Centro", "address_city": "Paraty", "address_state": "RJ",
+        "rooms": 1, "capacity": 2, "price_per_night": "100.00",
+    }
+    prop_id = async_client.post("/properties", json=payload).json()["id"]
+    async_client.post("/reservations", json={
+        "property_id": prop_id, "client_name": "Ana", "client_email": "ana@example.com",
+        "start_date": "2025-09-02", "end_date": "2025-09-03", "guests_quantity": 2,
+    })
+    r = _calendar(async_client, prop_id, "2025-09-01", "2025-09-04", format="bitmap")
+    assert r.json()["bitmap"] == "0110"
+
+
+def test_proxima_janela_async(async_client):
+    payload = {
+        "title": "Casa Async", "address_street": "Rua A", "address_number": "1",
+        "address_neighborhood": "Centro", "address_city": "Paraty", "address_state": "RJ",
+        "rooms": 1, "capacity": 2, "price_per_night": "100.00",
+    }
+    prop_id = async_client.post("/properties", json=payload).json()["id"]
+    async_client.post("/reservations", json={
+        "property_id": prop_id, "client_name": "Ana", "client_email": "ana@example.com",
+        "start_date": "2025-09-01", "end_date": "2025-09-03", "guests_quantity": 2,
+    })
+    assert _next(async_client, prop_id, 2, "2025-09-01", "2025-09-30").json()["start_date"] == "2025-09-04"
+    r = _search_next(async_client, nights=2, **{"from": "2025-09-01", "to": "2025-09-30"})
+    assert r.json() == [{"property_id": prop_id, "start_date": "2025-09-04", "end_date": "2025-09-06", "nights": 2}]
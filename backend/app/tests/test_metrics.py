@@ -0,0 +1,84 @@
+import pytest
+
+from app.metrics import (
+    DB_QUERIES,
+    LATENCY,
+    REQUESTS,
+    Counter,
+    Histogram,
+    Registry,
+    instrument_engine,
+    uninstrument_engine,
+)
+from app.tests.conftest import _mk_property
+
+
+@pytest.fixture()
+def instrumented_db(engine):
+    instrument_engine(engine)
+    yield
+    uninstrument_engine(engine)
+
+
+def test_registry_formato_texto_prometheus():
+    reg = Registry()
+    hits = reg.register(Counter("hits_total", "Hits.", ("route",)))
+    latency = reg.register(Histogram("lat_seconds", "Latência.", ("route",), buckets=(0.1, 1.0)))
+    hits.inc(("/a",))
+    hits.inc(("/a",))
+    latency.observe(("/a",), 0.05)
+    latency.observe(("/a",), 0.5)
+    latency.observe(("/a",), 3.0)
+    reg.add_collector(lambda: [
+        ("pool_in_use", "Em uso.", "gauge", {"engine": "sync"}, 2),
+        ("pool_total", "Total.", "counter", {"engine": "sync"}, 7),
+        ("pool_in_use", "Em uso.", "gauge", {"engine": "async"}, 0),
+    ])
+
+    text = reg.render()
+    assert '# TYPE hits_total counter\nhits_total{route="/a"} 2\n' in text
+    assert 'lat_seconds_bucket{route="/a",le="0.1"} 1\n' in text
+    assert 'lat_seconds_bucket{route="/a",le="1.0"} 2\n' in text
+    assert 'lat_seconds_bucket{route="/a",le="+Inf"} 3\n' in text
+    assert 'lat_seconds_sum{route="/a"} 3.55\n' in text
+    assert 'lat_seconds_count{route="/a"} 3\n' in text
+    # família agrupada mesmo com os coletores intercalando nomes
+    assert text.count("# TYPE pool_in_use gauge") == 1
+    assert 'pool_in_use{engine="sync"} 2\npool_in_use{engine="async"} 0\n' in text
+
+
+def test_metrics__rota_status_e_consultas_por_requisicao(client, db_session, instrumented_db):
+    _mk_property(db_session)
+    labels = ("GET", "/properties/list")
+    before_requests = REQUESTS.value(labels + ("200",))
+    before_latency = LATENCY.count(labels)
+    before_queries = DB_QUERIES.count(labels)
+
+    r = client.get("/properties/list")
+    assert r.status_code == 200
+
+    assert REQUESTS.value(labels + ("200",)) == before_requests + 1
+    assert LATENCY.count(labels) == before_latency + 1
+    assert DB_QUERIES.count(labels) == before_queries + 1
+
+    text = client.get("/metrics").text
+    assert 'http_requests_total{method="GET",route="/properties/list",status="200"}' in text
+    assert 'http_request_db_queries_bucket{method="GET",route="/properties/list",le="0"}' in text
+    assert 'db_pool_checked_out{engine="sync"}' in text
+
+
+def test_metrics__conta_consultas_da_requisicao(client, db_session, instrumented_db):
+    _mk_property(db_session)
+    labels = ("GET", "/properties/list")
+    before = DB_QUERIES.total(labels)
+
+    client.get("/properties/list")
+
+    # versão da tabela (ETag) + a listagem
+    assert DB_QUERIES.total(labels) - before == 2
+
+
+def test_metrics__rota_inexistente_nao_explode_cardinalidade(client):
+    client.get("/nao/existe/1")
+    client.get("/nao/existe/2")
+    assert REQUESTS.value(("GET", "<unmatched>", "404")) >= 2
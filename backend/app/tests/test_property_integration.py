@@ -1,4 +1,10 @@
 from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import get_db
+from app.main import app
 from app.tests.conftest import _mk_property, _mk_reservation
 
 
@@ -48,6 +54,42 @@ def test_availability_endpoint__ok(client, db_session):
     assert r.json()["message"]
 
 
+def _inverted_availability(client, property_id):
+    return client.get("/properties/availability", params={
+        "property_id": property_id,
+        "start_date": "2025-12-10",
+        "end_date": "2025-12-05",
+        "guests_quantity": 2,
+    })
+
+
+def test_availability_endpoint__datas_invertidas_409_sem_consultar_reservas(client, db_session, count_queries):
+    p = _mk_property(db_session)
+    with count_queries() as q:
+        r = _inverted_availability(client, p.id)
+    assert r.status_code == 409
+    assert "data de saída" in r.json()["detail"]
+    assert not any("reservations" in sql for sql in q.statements)
+
+
+def test_availability_endpoint__datas_invertidas_no_postgres(pg_engine):
+    # sem a checagem, daterange('2025-12-10', '2025-12-05', '[]') virava 500
+    Session = sessionmaker(bind=pg_engine)
+
+    def _pg_db():
+        with Session() as db:
+            yield db
+
+    with Session() as db:
+        prop_id = _mk_property(db).id
+    app.dependency_overrides[get_db] = _pg_db
+    try:
+        with TestClient(app) as c:
+            assert _inverted_availability(c, prop_id).status_code == 409
+    finally:
+        app.dependency_overrides.clear()
+
+
 def test_availability_endpoint__faltando_parametros(client):
     r = client.get("/properties/availability", params={
         "property_id": 1,
@@ -86,3 +128,257 @@ def test_delete_property_endpoint__204_e_404(client, db_session):
 
     r2 = client.delete(f"/properties/{p.id}")  
     assert r2.status_code == 404
+
+
+def test_search_endpoint__exclui_ocupadas_e_pagina(client, db_session):
+    livre = _mk_property(db_session, capacity=4)
+    ocupada = _mk_property(db_session, capacity=4)
+    _mk_reservation(db_session, property_id=ocupada.id, start_date=date(2025, 8, 10), end_date=date(2025, 8, 12))
+
+    params = {"start_date": "2025-08-11", "end_date": "2025-08-13", "guests": 2, "address_city": "Florianópolis"}
+    r = client.get("/properties/search", params=params)
+    assert r.status_code == 200
+    assert [x["id"] for x in r.json()] == [livre.id]
+
+    r = client.get("/properties/search", params={**params, "after_id": livre.id})
+    assert r.json() == []
+
+
+def test_search_endpoint__datas_invalidas(client):
+    r = client.get("/properties/search", params={"start_date": "2025-08-13", "end_date": "2025-08-13", "guests": 2})
+    assert r.status_code == 400
+
+    r = client.get("/properties/search", params={"start_date": "2025-08-13", "end_date": "2025-08-15"})
+    assert r.status_code == 422
+
+
+def test_list_properties_endpoint__paginacao_keyset(client, db_session):
+    ids = [_mk_property(db_session).id for _ in range(5)]
+
+    r = client.get("/properties/list", params={"limit": 2})
+    assert [x["id"] for x in r.json()] == ids[:2]
+    assert 'rel="next"' in r.headers["link"]
+
+    seen = [x["id"] for x in r.json()]
+    while "x-next-cursor" in r.headers:
+        r = client.get("/properties/list", params={"limit": 2, "cursor": r.headers["x-next-cursor"]})
+        seen += [x["id"] for x in r.json()]
+    assert seen == ids
+    assert "link" not in r.headers
+
+
+def test_list_properties_endpoint__limites_da_pagina(client):
+    assert client.get("/properties/list", params={"limit": 501}).status_code == 422
+    assert client.get("/properties/list", params={"limit": 0}).status_code == 422
+    assert client.get("/properties/list", params={"cursor": "lixo"}).status_code == 400
+
+
+def test_list_properties_endpoint__etag_e_304(client, db_session):
+    _mk_property(db_session)
+    r = client.get("/properties/list", params={"address_state": "SC"})
+    etag = r.headers["etag"]
+
+    again = client.get("/properties/list", params={"address_state": "SC"}, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+    # outros filtros: outra representação
+    other = client.get("/properties/list", params={"address_state": "MG"}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+    _mk_property(db_session, address_number="999")
+    changed = client.get("/properties/list", params={"address_state": "SC"}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert len(changed.json()) == 2
+
+
+def test_list_properties_endpoint__mesmo_json_do_property_out(client, db_session):
+    from typing import List
+
+    from pydantic import TypeAdapter
+
+    from app.db.models import Property
+    from app.db.schema import PropertyOut
+
+    _mk_property(db_session, title="Casa \"Aspas\" Ção", country="BRA", price_per_night=149.9)
+    _mk_property(db_session, country="BRA")
+
+    r = client.get("/properties/list")
+    rows = db_session.query(Property).order_by(Property.id).all()
+    page = TypeAdapter(List[PropertyOut])
+    # o caminho por colunas devolve os mesmos bytes que a validação do PropertyOut
+    assert r.content == page.dump_json(page.validate_python(rows, from_attributes=True))
+
+
+def test_list_properties_endpoint__fields(client, db_session):
+    prop = _mk_property(db_session)
+
+    r = client.get("/properties/list", params={"fields": "price_per_night, title"})
+    assert r.status_code == 200
+    assert r.json() == [{"title": prop.title, "price_per_night": "150.00"}]
+
+    # sem o id no corpo, a paginação continua pelo id
+    _mk_property(db_session)
+    r = client.get("/properties/list", params={"fields": "title", "limit": 1})
+    assert list(r.json()[0]) == ["title"]
+    assert "x-next-cursor" in r.headers
+
+    bad = client.get("/properties/list", params={"fields": "title,senha"})
+    assert bad.status_code == 400
+    assert "senha" in bad.json()["detail"]
+
+
+def _bulk_row(**over):
+    row = {
+        "title": "Casa Lote",
+        "address_street": "Rua Gama",
+        "address_number": "1",
+        "address_neighborhood": "Centro",
+        "address_city": "Curitiba",
+        "address_state": "PR",
+        "country": "BRA",
+        "rooms": 2,
+        "capacity": 4,
+        "price_per_night": "150.00",
+    }
+    row.update(over)
+    return row
+
+
+def test_bulk_import_ndjson__relatorio_por_linha(client):
+    import json
+
+    lines = [
+        json.dumps(_bulk_row(title="Casa 1")),
+        json.dumps(_bulk_row(title="Casa 2", capacity=0)),
+        "{quebrado",
+        "",
+        json.dumps(_bulk_row(title="Casa 3")),
+    ]
+    r = client.post(
+        "/properties/bulk",
+        content="\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert (body["received"], body["inserted"], body["failed"]) == (4, 2, 2)
+    assert [e["line"] for e in body["errors"]] == [2, 3]
+    assert "capacity" in body["errors"][0]["errors"][0]
+
+    titles = [x["title"] for x in client.get("/properties/list", params={"address_city": "Curitiba"}).json()]
+    assert titles == ["Casa 1", "Casa 3"]
+
+
+def test_bulk_import_csv__em_varios_lotes(client, monkeypatch):
+    import app.routes.properties as properties_router
+    monkeypatch.setattr(properties_router, "BULK_CHUNK_ROWS", 2)
+
+    header = list(_bulk_row())
+    lines = [",".join(header)]
+    for i in range(5):
+        row = _bulk_row(title=f"Casa, {i}", country="")
+        lines.append(",".join(f'"{row[c]}"' for c in header))
+    lines.append("so,duas")
+
+    r = client.post("/properties/bulk", content="\r\n".join(lines), headers={"Content-Type": "text/csv"})
+    body = r.json()
+    assert (body["received"], body["inserted"], body["failed"]) == (6, 5, 1)
+    assert body["errors"][0]["line"] == 7
+
+    listed = client.get("/properties/list", params={"address_city": "Curitiba"}).json()
+    assert [x["title"] for x in listed] == [f"Casa, {i}" for i in range(5)]
+    assert {x["country"] for x in listed} == {"BRA"}
+
+
+def test_bulk_import_csv__quebra_entre_aspas_e_aspas_abertas(client):
+    header = list(_bulk_row())
+    lines = [",".join(header)]
+    for title in ("Casa\nde dois andares", "Casa Simples"):
+        row = _bulk_row(title=title)
+        lines.append(",".join(f'"{row[c]}"' for c in header))
+    lines.append(",".join(str(v) for v in _bulk_row(title='"Aspas').values()))
+    lines.append(",".join(str(v) for v in _bulk_row(title="Depois").values()))
+
+    r = client.post("/properties/bulk", content="\n".join(lines), headers={"Content-Type": "text/csv"})
+    body = r.json()
+    # o registro da linha 2 ocupa as linhas 2 e 3; as aspas abertas na 5 engolem o resto
+    assert (body["received"], body["inserted"], body["failed"]) == (3, 2, 1)
+    assert body["errors"][0]["line"] == 5
+    assert "linhas 5 a 6" in body["errors"][0]["errors"][0]
+
+    listed = client.get("/properties/list", params={"address_city": "Curitiba"}).json()
+    assert [x["title"] for x in listed] == ["Casa\nde dois andares", "Casa Simples"]
+
+
+def test_bulk_import__linha_recusada_pelo_banco_nao_derruba_o_lote(client, db_session):
+    import json
+
+    conn = db_session.connection()
+    conn.exec_driver_sql(
+        "CREATE TEMP TRIGGER recusa_titulo BEFORE INSERT ON properties WHEN NEW.title = 'Recusada' "
+        "BEGIN SELECT RAISE(ABORT, 'titulo recusado'); END"
+    )
+    try:
+        lines = [json.dumps(_bulk_row(title=f"Casa {i}")) for i in range(1, 8)]
+        lines[4] = json.dumps(_bulk_row(title="Recusada"))
+        r = client.post(
+            "/properties/bulk", content="\n".join(lines), headers={"Content-Type": "application/x-ndjson"}
+        )
+    finally:
+        conn.exec_driver_sql("DROP TRIGGER recusa_titulo")
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert (body["received"], body["inserted"], body["failed"]) == (7, 6, 1)
+    assert body["errors"] == [{"line": 5, "errors": ["erro ao gravar: titulo recusado"]}]
+    titles = [x["title"] for x in client.get("/properties/list", params={"address_city": "Curitiba"}).json()]
+    assert titles == ["Casa 1", "Casa 2", "Casa 3", "Casa 4", "Casa 6", "Casa 7"]
+
+
+def _check_item(property_id, start, end, guests=2):
+    return {"property_id": property_id, "start_date": start, "end_date": end, "guests_quantity": guests}
+
+
+def test_availability_batch__resultado_por_item(client, db_session, count_queries):
+    p1 = _mk_property(db_session, capacity=4)
+    p2 = _mk_property(db_session, address_number="2")
+    _mk_reservation(db_session, property_id=p1.id, start_date=date(2025, 12, 1), end_date=date(2025, 12, 5))
+    _mk_reservation(db_session, property_id=p1.id, start_date=date(2025, 12, 20), end_date=date(2025, 12, 22),
+                    is_active=False)
+
+    items = [
+        _check_item(p1.id, "2025-12-06", "2025-12-08"),  # livre
+        _check_item(p1.id, "2025-12-05", "2025-12-07"),  # encosta na saída: ocupado
+        _check_item(p1.id, "2025-12-20", "2025-12-22"),  # só reserva cancelada
+        _check_item(p2.id, "2025-12-01", "2025-12-05"),  # outra propriedade
+        _check_item(9999, "2025-12-01", "2025-12-02"),   # propriedade inexistente
+        _check_item(p1.id, "2025-12-10", "2025-12-12", guests=5),  # capacidade
+        _check_item(p1.id, "2025-12-10", "2025-12-10"),  # datas iguais
+        _check_item(p1.id, "2025-12-10", "2025-12-09"),  # datas invertidas
+    ]
+    with count_queries() as q:
+        r = client.post("/properties/availability/batch", json={"items": items})
+    assert r.status_code == 200, r.text
+    body = r.json()
+
+    assert [x["status_code"] for x in body["results"]] == [200, 409, 200, 200, 404, 409, 409, 400]
+    assert [x["available"] for x in body["results"]][:4] == [True, False, True, True]
+    assert (body["checked"], body["available"], body["unavailable"]) == (8, 3, 5)
+    assert "indisponível" in body["results"][1]["detail"]
+    assert body["results"][0]["detail"] is None
+    assert q.count == 2  # propriedades (IN) + VALUES x reservas
+
+
+def test_availability_batch__sem_itens_validos_uma_consulta(client, count_queries):
+    with count_queries() as q:
+        r = client.post("/properties/availability/batch", json={"items": [_check_item(9999, "2025-12-01", "2025-12-02")]})
+    assert r.json()["results"][0]["status_code"] == 404
+    assert q.count == 1
+
+
+def test_availability_batch__limites(client):
+    assert client.post("/properties/availability/batch", json={"items": []}).status_code == 422
+    item = _check_item(1, "2025-12-01", "2025-12-02", guests=0)
+    assert client.post("/properties/availability/batch", json={"items": [item]}).status_code == 422
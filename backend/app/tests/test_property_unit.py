@@ -2,6 +2,7 @@ import pytest
 from datetime import date, timedelta
 from app.service.property import (
     list_properties,
+    search_available_properties,
     find_conflicts,
     check_availability,
     create_property,
@@ -156,3 +157,35 @@ def test_delete_property_by_id(db_session):
 
     ok2 = delete_property_by_id(db_session, p.id)
     assert ok2 is False
+
+
+def test_search_available_properties__anti_join(db_session):
+    livre = _mk_property(db_session, capacity=4, address_city="Florianópolis")
+    ocupada = _mk_property(db_session, capacity=4, address_city="Florianópolis")
+    cancelada = _mk_property(db_session, capacity=4, address_city="Florianópolis")
+    _mk_property(db_session, capacity=2, address_city="Florianópolis")
+    _mk_property(db_session, capacity=4, address_city="São Paulo")
+
+    _mk_reservation(db_session, property_id=ocupada.id, start_date=date(2025, 8, 10), end_date=date(2025, 8, 15))
+    _mk_reservation(
+        db_session, property_id=cancelada.id, start_date=date(2025, 8, 10), end_date=date(2025, 8, 15), is_active=False
+    )
+    _mk_reservation(db_session, property_id=livre.id, start_date=date(2025, 8, 1), end_date=date(2025, 8, 5))
+
+    res = search_available_properties(
+        db_session, date(2025, 8, 12), date(2025, 8, 14), guests=3, address_city="Florianópolis"
+    )
+    assert [x.id for x in res] == [livre.id, cancelada.id]
+
+    res = search_available_properties(
+        db_session, date(2025, 8, 12), date(2025, 8, 14), guests=3, address_city="Florianópolis", after_id=livre.id, limit=1
+    )
+    assert [x.id for x in res] == [cancelada.id]
+
+
+def test_list_properties__keyset(db_session):
+    ids = [_mk_property(db_session).id for _ in range(5)]
+
+    assert [x.id for x in list_properties(db_session, limit=2)] == ids[:2]
+    assert [x.id for x in list_properties(db_session, after_id=ids[1], limit=2)] == ids[2:4]
+    assert [x.id for x in list_properties(db_session, after_id=ids[-1])] == []
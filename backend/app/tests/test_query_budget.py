@@ -0,0 +1,125 @@
+import logging
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.models import Property
+from app.db.query_budget import QueryBudgetExceeded, repeated_query_detector
+from app.metrics import MetricsMiddleware, instrument_engine, uninstrument_engine
+from app.tests.conftest import _mk_property, _mk_reservation
+
+
+@pytest.fixture()
+def detector_on(engine, monkeypatch):
+    monkeypatch.setattr(repeated_query_detector, "enabled", True)
+    instrument_engine(engine)
+    yield repeated_query_detector
+    uninstrument_engine(engine)
+
+
+def _reservation_payload(property_id):
+    return {
+        "property_id": property_id,
+        "client_name": "Ana",
+        "client_email": "ana@example.com",
+        "start_date": "2025-09-10",
+        "end_date": "2025-09-12",
+        "guests_quantity": 2,
+    }
+
+
+def test_query_budget_estourado_lista_os_statements(client, db_session, query_budget):
+    _mk_property(db_session)
+    with pytest.raises(QueryBudgetExceeded) as ex:
+        with query_budget(1):
+            client.get("/properties/list")
+    assert "2 statements, orçamento de 1" in str(ex.value)
+    assert "table_versions" in str(ex.value)
+
+
+# orçamentos dos caminhos quentes: subir um destes números é uma regressão
+def test_orcamento_post_reservations(client, db_session, query_budget):
+    payload = _reservation_payload(_mk_property(db_session).id)
+    with query_budget(1):
+        r = client.post("/reservations", json=payload)
+    assert r.status_code == 201
+
+
+def test_orcamento_post_reservations_conflito(client, db_session, query_budget):
+    payload = _reservation_payload(_mk_property(db_session).id)
+    client.post("/reservations", json=payload)
+    # INSERT que não insere + diagnóstico do motivo
+    with query_budget(2):
+        r = client.post("/reservations", json=payload)
+    assert r.status_code == 409
+
+
+@pytest.mark.parametrize(
+    "path, params, budget",
+    [
+        ("/properties/list", {}, 2),
+        ("/properties/search", {"start_date": "2025-09-01", "end_date": "2025-09-05", "guests": 2}, 1),
+        ("/properties/availability", {"start_date": "2025-10-01", "end_date": "2025-10-05", "guests_quantity": 2}, 2),
+        ("/reservations", {}, 2),
+    ],
+)
+def test_orcamento_leituras(client, db_session, query_budget, path, params, budget):
+    prop = _mk_property(db_session)
+    for day in (1, 10, 20):
+        _mk_reservation(db_session, property_id=prop.id,
+                        start_date=date(2025, 9, day), end_date=date(2025, 9, day + 2))
+    if path == "/properties/availability":
+        params = {**params, "property_id": prop.id}
+
+    with query_budget(budget):
+        r = client.get(path, params=params)
+    assert r.status_code == 200
+
+
+@pytest.fixture()
+def n_plus_one_client(engine):
+    # rota de propósito com uma consulta por item
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/props/{prop_id}/n1")
+    def n_plus_one(prop_id: int):
+        with Session(engine) as db:
+            for _ in range(5):
+                db.execute(select(Property.title).where(Property.id == prop_id)).all()
+        return {}
+
+    with TestClient(app) as c:
+        yield c
+
+
+def test_detector_aponta_consulta_repetida(n_plus_one_client, detector_on, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.db.queries"):
+        assert n_plus_one_client.get("/props/1/n1").status_code == 200
+
+    messages = [rec.getMessage() for rec in caplog.records]
+    assert any(
+        m.startswith("possível N+1 em GET /props/{prop_id}/n1: statement repetido 5 vezes: SELECT")
+        for m in messages
+    )
+
+
+def test_seed_nao_repete_statements(client, detector_on, caplog, query_budget):
+    # checagem das propriedades + INSERT das propriedades + INSERT das reservas
+    with caplog.at_level(logging.WARNING, logger="app.db.queries"), query_budget(3):
+        assert client.post("/seed").status_code == 201
+    # de novo: checagem das propriedades + VALUES das reservas, e 409
+    with caplog.at_level(logging.WARNING, logger="app.db.queries"), query_budget(2):
+        assert client.post("/seed").status_code == 409
+    assert not caplog.records
+
+
+def test_detector_desligado_nao_loga(client, caplog):
+    client.post("/seed")
+    with caplog.at_level(logging.WARNING, logger="app.db.queries"):
+        client.post("/seed")
+    assert not caplog.records
@@ -0,0 +1,94 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert, text
+
+from app.db.models import Property, Reservation
+from app.service.reservation import _list_reservations_stmt
+from app.service.property import (
+    _conflicts_stmt,
+    _list_properties_stmt,
+    _search_available_stmt,
+)
+
+
+@pytest.fixture()
+def seeded(db_session):
+    # cardinalidade parecida com a real: muitas cidades/estados, poucas linhas por valor
+    cities = ["Pirapora"] + [f"Cidade {i}" for i in range(99)]
+    db_session.execute(insert(Property), [
+        {
+            "title": f"Casa {i}",
+            "address_street": "Rua A",
+            "address_number": str(i),
+            "address_neighborhood": f"Bairro {i % 20}",
+            "address_city": cities[i % len(cities)],
+            "address_state": f"U{i % 27}",
+            "country": "BRA",
+            "rooms": 2,
+            "capacity": 1 + i % 8,
+            "price_per_night": 100 + i % 300,
+        }
+        for i in range(2000)
+    ])
+    first_id = db_session.execute(text("SELECT min(id) FROM properties")).scalar()
+    db_session.execute(insert(Reservation), [
+        {
+            "property_id": first_id + p,
+            "client_name": "X",
+            "client_email": f"x{p}_{k}@example.com",
+            "start_date": date(2025, 1, 1) + timedelta(days=7 * k),
+            "end_date": date(2025, 1, 3) + timedelta(days=7 * k),
+            "guests_quantity": 1,
+            "is_active": k % 5 != 0,
+        }
+        for p in range(2000)
+        for k in range(10)
+    ])
+    db_session.execute(text("ANALYZE"))
+    return db_session
+
+
+def _plan(db, stmt) -> str:
+    compiled = stmt.compile(db.get_bind())
+    params = compiled.construct_params()
+    rows = db.connection().exec_driver_sql(
+        "EXPLAIN QUERY PLAN " + str(compiled),
+        tuple(params[name] for name in compiled.positiontup),
+    ).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def test_find_conflicts_usa_indice_parcial(seeded):
+    plan = _plan(seeded, _conflicts_stmt(42, date(2025, 2, 1), date(2025, 2, 4)))
+    assert "USING INDEX ix_reservations_active_property_dates (property_id=?" in plan
+
+
+@pytest.mark.parametrize(
+    "filters, index",
+    [
+        ({"address_city": "Pirapora", "capacity": 4, "price_per_night": 250},
+         "ix_properties_city_neighborhood_capacity_price (address_city=?"),
+        ({"address_city": "Pirapora", "address_neighborhood": "Bairro 3"},
+         "ix_properties_city_neighborhood_capacity_price (address_city=? AND address_neighborhood=?"),
+        ({"address_state": "U3"}, "ix_properties_state_city (address_state=?"),
+    ],
+)
+def test_list_properties_usa_indice_composto(seeded, filters, index):
+    plan = _plan(seeded, _list_properties_stmt(**filters))
+    assert f"SEARCH properties USING INDEX {index}" in plan
+
+
+def test_search_anti_join_usa_indices(seeded):
+    plan = _plan(
+        seeded,
+        _search_available_stmt(date(2025, 2, 1), date(2025, 2, 4), 2, address_city="Pirapora"),
+    )
+    assert "SEARCH properties USING INDEX ix_properties_city_neighborhood_capacity_price" in plan
+    assert "SEARCH reservations USING INDEX ix_reservations_active_property_dates" in plan
+    assert "SCAN reservations" not in plan
+
+
+def test_busca_email_exata_usa_indice_funcional(seeded):
+    plan = _plan(seeded, _list_reservations_stmt("X42_3@example.com", match="exact"))
+    assert "SEARCH reservations USING INDEX ix_reservations_client_email_lower" in plan
@@ -0,0 +1,133 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from app.service.quotes import MAX_QUOTE_NIGHTS, NightlyRates, stay_total
+from app.tests.conftest import _mk_property
+
+
+def _quote(client, items, overrides=()):
+    return client.post("/quotes", json={"items": items, "overrides": list(overrides)})
+
+
+def _item(property_id, start, end):
+    return {"property_id": property_id, "start_date": start, "end_date": end}
+
+
+def test_stay_total_arredonda_half_up():
+    assert stay_total(Decimal("55.50"), 3) == Decimal("166.50")
+    assert stay_total(Decimal("0.125"), 1) == Decimal("0.13")
+    assert stay_total(150, 2) == Decimal("300.00")
+
+
+def test_cotacao_preco_base_e_erros_por_item(client, db_session, count_queries):
+    p = _mk_property(db_session, price_per_night=Decimal("55.50")).id
+    items = [
+        _item(p, "2025-12-01", "2025-12-04"),
+        _item(9999, "2025-12-01", "2025-12-02"),
+        _item(p, "2025-12-04", "2025-12-04"),
+    ]
+    with count_queries() as q:
+        r = _quote(client, items)
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert (body["quoted"], body["failed"]) == (1, 2)
+    assert [x["status_code"] for x in body["results"]] == [200, 404, 400]
+    assert body["results"][0]["nights"] == 3
+    assert Decimal(body["results"][0]["total_price"]) == Decimal("166.50")
+    assert body["results"][1]["total_price"] is None
+    assert q.count == 1
+
+
+def test_regra_com_lista_de_dias_vazia_nao_cobre_nenhuma_noite():
+    rates = NightlyRates({1: 10000}, date(2026, 1, 1), date(2026, 1, 7))
+    rates.override(1, 99, weekdays=[])
+    assert rates.cents.tolist() == [[10000] * 7]
+
+
+def test_cotacao_fim_de_semana_e_temporada(client, db_session):
+    p = _mk_property(db_session, price_per_night=Decimal("100.00")).id
+    overrides = [
+        {"property_id": p, "price_per_night": "150.00", "weekdays": [4, 5]},  # sexta e sábado
+        {"property_id": p, "price_per_night": "300.00", "start_date": "2025-12-24", "end_date": "2025-12-25"},
+    ]
+    # a última regra vale: temporada numa sexta
+    friday = _quote(client, [_item(p, "2025-12-26", "2025-12-27")], overrides + [
+        {"property_id": p, "price_per_night": "280.00", "start_date": "2025-12-26", "end_date": "2025-12-26"},
+    ]).json()["results"][0]
+    assert Decimal(friday["total_price"]) == Decimal("280.00")
+    # 2025-12-19 é sexta: sex, sáb, dom, seg
+    items = [_item(p, "2025-12-19", "2025-12-23"), _item(p, "2025-12-23", "2025-12-27")]
+    totals = [Decimal(x["total_price"]) for x in _quote(client, items, overrides).json()["results"]]
+    # ter 100, qua e qui 300 (temporada), sex 150 (fora da temporada, fim de semana)
+    assert totals == [Decimal("500.00"), Decimal("850.00")]
+
+
+def _nightly(base, rules, day):
+    price = base
+    for rule in rules:
+        start = date.fromisoformat(rule["start_date"]) if "start_date" in rule else date.min
+        end = date.fromisoformat(rule["end_date"]) if "end_date" in rule else date.max
+        if start <= day <= end and (not rule.get("weekdays") or day.weekday() in rule["weekdays"]):
+            price = Decimal(rule["price_per_night"])
+    return price
+
+
+def test_cotacao_igual_ao_decimal_noite_a_noite(client, db_session):
+    rnd = random.Random(3)
+    prices = {}
+    for i in range(8):
+        price = Decimal(rnd.randint(5000, 90000)).scaleb(-2)
+        prices[_mk_property(db_session, address_number=str(i), price_per_night=price).id] = price
+    ids = list(prices)
+
+    overrides = []
+    for _ in range(20):
+        rule = {"property_id": rnd.choice(ids), "price_per_night": str(Decimal(rnd.randint(100, 99999)).scaleb(-2))}
+        if rnd.random() < 0.7:
+            start = date(2026, 1, 1) + timedelta(days=rnd.randint(0, 80))
+            rule["start_date"] = start.isoformat()
+            rule["end_date"] = (start + timedelta(days=rnd.randint(0, 20))).isoformat()
+        if rnd.random() < 0.5:
+            rule["weekdays"] = rnd.sample(range(7), rnd.randint(1, 3))
+        overrides.append(rule)
+
+    items = []
+    for _ in range(200):
+        start = date(2026, 1, 1) + timedelta(days=rnd.randint(0, 90))
+        items.append(_item(rnd.choice(ids), start.isoformat(), (start + timedelta(days=rnd.randint(1, 14))).isoformat()))
+
+    results = _quote(client, items, overrides).json()["results"]
+    for item, result in zip(items, results):
+        start, end = date.fromisoformat(item["start_date"]), date.fromisoformat(item["end_date"])
+        rules = [o for o in overrides if o["property_id"] == item["property_id"]]
+        expected = sum(
+            (_nightly(prices[item["property_id"]], rules, start + timedelta(days=n)) for n in range((end - start).days)),
+            Decimal(0),
+        ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        assert Decimal(result["total_price"]) == expected
+
+
+def test_cotacao_limites(client, db_session):
+    p = _mk_property(db_session).id
+    assert client.post("/quotes", json={"items": []}).status_code == 422
+    bad_override = {"property_id": p, "price_per_night": "10.001"}
+    assert _quote(client, [_item(p, "2026-01-01", "2026-01-02")], [bad_override]).status_code == 422
+    no_weekdays = {"property_id": p, "price_per_night": "10.00", "weekdays": []}
+    assert _quote(client, [_item(p, "2026-01-01", "2026-01-02")], [no_weekdays]).status_code == 422
+
+    # longa demais: 400 só no item
+    too_long = (date(2026, 1, 10) + timedelta(days=MAX_QUOTE_NIGHTS + 1)).isoformat()
+    r = _quote(client, [_item(p, "2026-01-01", "2026-01-02"), _item(p, "2026-01-10", too_long)])
+    assert r.status_code == 200
+    assert [x["status_code"] for x in r.json()["results"]] == [200, 400]
+
+
+def test_cotacao_estadias_distantes_em_janelas_separadas(client, db_session):
+    p = _mk_property(db_session, price_per_night=Decimal("100.00")).id
+    weekend = {"property_id": p, "price_per_night": "150.00", "weekdays": [4, 5]}
+    # 2026-01-02 e 2031-01-03 são sextas, muito além de MAX_QUOTE_NIGHTS uma da outra
+    items = [_item(p, "2031-01-03", "2031-01-05"), _item(p, "2026-01-02", "2026-01-05")]
+    r = _quote(client, items, [weekend])
+    assert r.status_code == 200
+    assert [Decimal(x["total_price"]) for x in r.json()["results"]] == [Decimal("300.00"), Decimal("400.00")]
@@ -0,0 +1,189 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.db.session as db_session_module
+from app.db.base import Base
+from app.db.replicas import PRIMARY_COOKIE, ReadYourWritesMiddleware, ReplicaSet
+from app.db.session import get_db
+from app.main import create_app
+from app.tests.conftest import _mk_property
+
+
+def _sqlite_file(path):
+    eng = create_engine(f"sqlite+pysqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(eng)
+    return eng
+
+
+@pytest.fixture()
+def primary(tmp_path):
+    eng = _sqlite_file(tmp_path / "primary.db")
+    yield eng
+    eng.dispose()
+
+
+@pytest.fixture()
+def replica_engines(tmp_path):
+    engines = [_sqlite_file(tmp_path / f"replica{i}.db") for i in range(2)]
+    for i, eng in enumerate(engines):
+        with sessionmaker(bind=eng)() as s:
+            _mk_property(s, title=f"Réplica {i}", country="BRA")
+    yield engines
+    for eng in engines:
+        eng.dispose()
+
+
+def _client(primary, replicas, monkeypatch, window=0):
+    monkeypatch.setattr(db_session_module, "read_replicas", ReplicaSet(replicas))
+    Primary = sessionmaker(bind=primary, autoflush=False)
+
+    def _get_db_override():
+        with Primary() as db:
+            yield db
+
+    app = create_app(async_mode=False)
+    app.dependency_overrides[get_db] = _get_db_override
+    if window:
+        app.add_middleware(ReadYourWritesMiddleware, window_seconds=window)
+    return TestClient(app)
+
+
+def _titles(client):
+    r = client.get("/properties/list")
+    assert r.status_code == 200
+    return [p["title"] for p in r.json()]
+
+
+def test_leituras_alternam_entre_replicas(primary, replica_engines, monkeypatch):
+    with _client(primary, replica_engines, monkeypatch) as c:
+        assert [_titles(c) for _ in range(3)] == [["Réplica 0"], ["Réplica 1"], ["Réplica 0"]]
+
+
+def test_replica_fora_do_ar_sai_da_rotacao(primary, replica_engines, tmp_path, monkeypatch):
+    broken = create_engine(f"sqlite+pysqlite:///{tmp_path}/nao/existe.db")
+    with _client(primary, [broken, replica_engines[1]], monkeypatch) as c:
+        assert _titles(c) == ["Réplica 1"]
+        assert _titles(c) == ["Réplica 1"]
+        health = c.get("/health/pool").json()
+    assert health["replicas"]["sync"] == [
+        {"replica": 0, "healthy": False},
+        {"replica": 1, "healthy": True},
+    ]
+
+
+def test_sem_replica_saudavel_le_do_primario(primary, tmp_path, monkeypatch):
+    with sessionmaker(bind=primary)() as s:
+        _mk_property(s, title="Primário", country="BRA")
+    broken = create_engine(f"sqlite+pysqlite:///{tmp_path}/nao/existe.db")
+    with _client(primary, [broken], monkeypatch) as c:
+        assert _titles(c) == ["Primário"]
+
+
+def test_leitura_da_replica_nao_enche_os_caches(primary, replica_engines, monkeypatch):
+    from app.service.calendar import calendar_cache
+    from app.service.response_cache import InMemoryBackend, property_list_cache
+
+    monkeypatch.setattr(property_list_cache, "backend", InMemoryBackend())
+    monkeypatch.setattr(property_list_cache, "enabled", True)
+    monkeypatch.setattr(calendar_cache, "enabled", True)
+    with sessionmaker(bind=primary)() as s:
+        _mk_property(s, title="Primário", country="BRA")
+    try:
+        with _client(primary, replica_engines[:1], monkeypatch, window=5) as c:
+            # a réplica pode estar atrasada: responde, mas não guarda
+            assert _titles(c) == ["Réplica 0"]
+            assert c.get("/properties/1/calendar", params={"from": "2025-09-01", "to": "2025-09-30"}).status_code == 200
+            assert len(property_list_cache.backend) == 0
+            assert calendar_cache.get(1, (2025, 9)) is None
+
+            # no primário (read your writes), guarda
+            c.cookies.set(PRIMARY_COOKIE, "9999999999")
+            assert _titles(c) == ["Primário"]
+            c.get("/properties/1/calendar", params={"from": "2025-09-01", "to": "2025-09-30"})
+            assert len(property_list_cache.backend) == 1
+            assert calendar_cache.get(1, (2025, 9)) is not None
+    finally:
+        calendar_cache.clear()
+
+
+def test_replica_volta_depois_de_retry_after(replica_engines):
+    now = [0.0]
+    replicas = ReplicaSet(replica_engines, retry_after=10, clock=lambda: now[0])
+    replicas.mark_down(replica_engines[0])
+    assert list(replicas.candidates()) == [replica_engines[1]]
+    now[0] = 10.0
+    assert set(replicas.candidates()) == set(replica_engines)
+
+
+def test_read_your_writes_le_do_primario_depois_do_post(primary, replica_engines, monkeypatch):
+    payload = {
+        "title": "Nova", "address_street": "Rua A", "address_number": "1",
+        "address_neighborhood": "Centro", "address_city": "Paraty", "address_state": "RJ",
+        "rooms": 1, "capacity": 2, "price_per_night": "100.00",
+    }
+    with _client(primary, replica_engines[:1], monkeypatch, window=5) as c:
+        assert _titles(c) == ["Réplica 0"]
+        r = c.post("/properties", json=payload)
+        assert r.status_code == 201
+        assert PRIMARY_COOKIE in r.cookies
+        # a réplica ainda não tem a escrita; o cliente lê do primário
+        assert _titles(c) == ["Nova"]
+
+        c.cookies.clear()
+        assert _titles(c) == ["Réplica 0"]
+
+
+def test_post_so_de_leitura_nao_marca_cookie(primary, replica_engines, monkeypatch):
+    with sessionmaker(bind=primary)() as s:
+        prop_id = _mk_property(s, title="Primário", country="BRA").id
+    stay = {"property_id": prop_id, "start_date": "2026-01-01", "end_date": "2026-01-03"}
+    with _client(primary, replica_engines[:1], monkeypatch, window=5) as c:
+        quote = c.post("/quotes", json={"items": [stay]})
+        batch = c.post("/properties/availability/batch", json={"items": [{**stay, "guests_quantity": 2}]})
+        invalid = c.post("/properties", json={})
+        cancel_missing = c.put("/reservations/999999/cancel")
+    assert quote.status_code == batch.status_code == 200
+    assert (invalid.status_code, cancel_missing.status_code) == (422, 404)
+    for r in (quote, batch, invalid, cancel_missing):
+        assert PRIMARY_COOKIE not in r.cookies
+
+
+def test_reserva_e_cancelamento_marcam_cookie(primary, replica_engines, monkeypatch):
+    with sessionmaker(bind=primary)() as s:
+        prop_id = _mk_property(s, title="Primário", country="BRA").id
+    booking = {
+        "property_id": prop_id, "client_name": "Ana", "client_email": "ana@example.com",
+        "start_date": "2026-01-01", "end_date": "2026-01-03", "guests_quantity": 2,
+    }
+    with _client(primary, replica_engines[:1], monkeypatch, window=5) as c:
+        created = c.post("/reservations", json=booking)
+        c.cookies.clear()
+        cancelled = c.put(f"/reservations/{created.json()['reservation']['id']}/cancel")
+    assert PRIMARY_COOKIE in created.cookies
+    assert PRIMARY_COOKIE in cancelled.cookies
+
+
+def test_seed_sintetico_marca_cookie(primary, replica_engines, monkeypatch):
+    with _client(primary, replica_engines[:1], monkeypatch, window=5) as c:
+        r = c.post("/seed", params={"scale": 1, "seed": 1})
+    assert r.status_code == 201
+    assert PRIMARY_COOKIE in r.cookies
+
+
+def test_sem_janela_post_nao_marca_cookie(primary, replica_engines, monkeypatch):
+    with _client(primary, replica_engines[:1], monkeypatch) as c:
+        r = c.post("/properties", json={})
+    assert PRIMARY_COOKIE not in r.cookies
+
+
+def test_rota_async_le_da_replica(async_client, replica_engines, monkeypatch):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    replica = create_async_engine(f"sqlite+aiosqlite:///{replica_engines[0].url.database}")
+    monkeypatch.setattr(db_session_module, "async_read_replicas", ReplicaSet([replica]))
+    r = async_client.get("/properties/list")
+    assert r.status_code == 200
+    assert [p["title"] for p in r.json()] == ["Réplica 0"]
+    async_client.portal.call(replica.dispose)
@@ -0,0 +1,103 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models import Reservation
+from app.db.schema import ReservationCreate
+from app.service.reservation import _integrity_error, book_reservation
+from app.tests.factories import persist_property
+
+WORKERS = 8
+
+
+@pytest.fixture()
+def file_sessionmaker(tmp_path):
+    # cada thread precisa da própria conexão: SQLite em arquivo, não em memória
+    eng = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'concurrency.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(eng)
+    yield sessionmaker(bind=eng, autoflush=False, autocommit=False)
+    eng.dispose()
+
+
+def _payload(property_id, i):
+    return ReservationCreate(
+        property_id=property_id,
+        client_name=f"Cliente {i}",
+        client_email=f"cliente{i}@example.com",
+        start_date=date(2025, 12, 20),
+        end_date=date(2025, 12, 27),
+        guests_quantity=2,
+    )
+
+
+def _fire(Session, fn, property_id):
+    barrier = threading.Barrier(WORKERS)
+
+    def attempt(i):
+        with Session() as db:
+            barrier.wait()
+            try:
+                fn(db, _payload(property_id, i))
+                return "ok"
+            except (HTTPException, ValueError):
+                return "conflito"
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        return list(pool.map(attempt, range(WORKERS)))
+
+
+def test_reservas_paralelas_mesmas_noites_so_uma_vence(file_sessionmaker):
+    with file_sessionmaker() as db:
+        prop_id = persist_property(db, price_per_night=Decimal("100.00")).id
+
+    results = _fire(file_sessionmaker, book_reservation, prop_id)
+
+    assert results.count("ok") == 1
+    assert results.count("conflito") == WORKERS - 1
+    with file_sessionmaker() as db:
+        count = db.execute(
+            select(func.count()).where(Reservation.property_id == prop_id)
+        ).scalar_one()
+    assert count == 1
+
+
+def test_violacao_da_constraint_vira_conflito(file_sessionmaker):
+    with file_sessionmaker() as db:
+        prop_id = persist_property(db).id
+        book_reservation(db, _payload(prop_id, 1))
+
+        # a corrida que passa pelo NOT EXISTS de book_reservation esbarra na constraint,
+        # e o erro sai com a mensagem que o endpoint devolve como 409
+        db.add(Reservation(**_payload(prop_id, 2).model_dump(), total_price=0))
+        with pytest.raises(IntegrityError) as ex:
+            db.commit()
+        db.rollback()
+        assert str(_integrity_error(ex.value)) == "Período indisponível para esta propriedade"
+
+
+def test_reserva_cancelada_libera_o_periodo(client, db_session):
+    prop = persist_property(db_session)
+    payload = {
+        "property_id": prop.id,
+        "client_name": "A",
+        "client_email": "a@x.com",
+        "start_date": "2025-12-20",
+        "end_date": "2025-12-27",
+        "guests_quantity": 2,
+    }
+    first = client.post("/reservations", json=payload).json()["reservation"]
+    assert client.post("/reservations", json=payload).status_code == 409
+
+    client.put(f"/reservations/{first['id']}/cancel")
+    assert client.post("/reservations", json=payload).status_code == 201
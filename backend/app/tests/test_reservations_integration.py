@@ -142,3 +142,165 @@ def test_cancel_reservation__404_nao_existe(client):
     resp = client.put("/reservations/999999/cancel")
     assert resp.status_code == 404
     assert resp.json()["detail"] == "Reservation not found"
+
+
+def test_list_reservations__paginacao_segue_o_link(client, db_session):
+    prop = _persist_property(db_session)
+    created = []
+    for day in (1, 5, 9):
+        resp = client.post("/reservations", json={
+            "property_id": prop.id,
+            "client_name": "P",
+            "client_email": "p@example.com",
+            "start_date": f"2025-10-{day:02d}",
+            "end_date": f"2025-10-{day + 2:02d}",
+            "guests_quantity": 1,
+        })
+        created.append(resp.json()["reservation"]["id"])
+
+    first = client.get("/reservations", params={"limit": 2, "client_email": "p@"})
+    assert [x["id"] for x in first.json()] == created[:2]
+
+    next_url = first.headers["link"].split(";")[0].strip("<>")
+    second = client.get(next_url)
+    assert [x["id"] for x in second.json()] == created[2:]
+    assert "link" not in second.headers
+
+    by_id = client.get("/reservations", params={"after_id": created[0]})
+    assert [x["id"] for x in by_id.json()] == created[1:]
+
+
+def test_export_reservations__ndjson_e_csv_com_filtros(client, db_session, monkeypatch):
+    import csv
+    import io
+    import json
+    from app.service import export
+
+    p1 = _persist_property(db_session)
+    p2 = _persist_property(db_session)
+    for i, prop in enumerate((p1, p1, p2)):
+        client.post("/reservations", json={
+            "property_id": prop.id,
+            "client_name": f"Cliente {i}",
+            "client_email": f"c{i}@example.com",
+            "start_date": f"2025-11-{1 + i * 5:02d}",
+            "end_date": f"2025-11-{3 + i * 5:02d}",
+            "guests_quantity": 1,
+        })
+
+    r = client.get("/reservations/export", params={"property_id": p1.id})
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [x["client_email"] for x in lines] == ["c0@example.com", "c1@example.com"]
+    assert lines[0]["total_price"] == "200.00" and lines[0]["is_active"] is True
+    assert lines[0]["start_date"] == "2025-11-01"
+
+    # força vários chunks para garantir que nada se perde entre eles
+    monkeypatch.setattr(export, "CHUNK_ROWS", 1)
+    r = client.get("/reservations/export", params={"format": "csv"})
+    assert r.headers["content-type"].startswith("text/csv")
+    assert "reservations.csv" in r.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(r.text)))
+    assert len(rows) == 3
+    assert rows[2]["client_email"] == "c2@example.com"
+    assert rows[2]["is_active"] == "true"
+
+    assert client.get("/reservations/export", params={"format": "xml"}).status_code == 422
+
+
+def _batch_item(property_id, start, end, guests=2, email="lote@example.com"):
+    return {
+        "property_id": property_id,
+        "client_name": "Lote",
+        "client_email": email,
+        "start_date": start,
+        "end_date": end,
+        "guests_quantity": guests,
+    }
+
+
+def test_reservations_batch__best_effort_resultado_por_item(client, db_session):
+    p1 = _persist_property(db_session, price_per_night=Decimal("100.00"), capacity=4)
+    p2 = _persist_property(db_session, price_per_night=Decimal("55.50"))
+    client.post("/reservations", json=_batch_item(p1.id, "2025-12-01", "2025-12-05"))
+
+    items = [
+        _batch_item(p1.id, "2025-12-10", "2025-12-12"),  # ok
+        _batch_item(p1.id, "2025-12-04", "2025-12-06"),  # conflito com o banco
+        _batch_item(p1.id, "2025-12-11", "2025-12-14"),  # conflito com o item 0
+        _batch_item(p2.id, "2025-12-11", "2025-12-14"),  # ok (outra propriedade)
+        _batch_item(9999, "2025-12-01", "2025-12-02"),   # propriedade inexistente
+        _batch_item(p1.id, "2025-12-20", "2025-12-22", guests=5),  # capacidade
+        _batch_item(p1.id, "2025-12-20", "2025-12-20"),  # datas iguais
+    ]
+    r = client.post("/reservations/batch", json={"items": items})
+    assert r.status_code == 200, r.text
+    body = r.json()
+
+    assert [x["status_code"] for x in body["results"]] == [201, 409, 409, 201, 404, 409, 409]
+    assert (body["created"], body["failed"]) == (2, 5)
+    assert body["results"][3]["reservation"]["total_price"] == 166.5
+    assert "indisponível" in body["results"][2]["detail"]
+
+    ids = {x["id"] for x in client.get("/reservations").json()}
+    assert {body["results"][0]["reservation"]["id"], body["results"][3]["reservation"]["id"]} <= ids
+    assert len(ids) == 3
+
+
+def test_reservations_batch__tudo_ou_nada(client, db_session):
+    prop = _persist_property(db_session)
+    items = [
+        _batch_item(prop.id, "2026-01-01", "2026-01-03"),
+        _batch_item(prop.id, "2026-01-02", "2026-01-04"),
+    ]
+    r = client.post("/reservations/batch", json={"mode": "all_or_nothing", "items": items})
+    body = r.json()
+    assert [x["status_code"] for x in body["results"]] == [424, 409]
+    assert body["created"] == 0
+    assert client.get("/reservations").json() == []
+
+    items[1] = _batch_item(prop.id, "2026-01-05", "2026-01-07")
+    r = client.post("/reservations/batch", json={"mode": "all_or_nothing", "items": items})
+    assert r.json()["created"] == 2
+
+
+def test_reservations_batch__poucos_statements(client, db_session, count_queries):
+    props = [_persist_property(db_session, title=f"Casa {i}") for i in range(5)]
+    items = [
+        _batch_item(p.id, f"2026-02-{day:02d}", f"2026-02-{day + 1:02d}")
+        for p in props
+        for day in range(1, 20, 3)
+    ]
+
+    with count_queries() as q:
+        r = client.post("/reservations/batch", json={"items": items})
+
+    assert r.json()["created"] == len(items)
+    assert q.count == 3  # propriedades, reservas da janela, INSERT multi-linha
+    assert q.statements[-1].startswith("INSERT INTO reservations")
+
+
+def test_reservations_batch__limites(client):
+    assert client.post("/reservations/batch", json={"items": []}).status_code == 422
+    assert client.post("/reservations/batch", json={"mode": "x", "items": [_batch_item(1, "2026-01-01", "2026-01-02")]}).status_code == 422
+
+
+def test_list_reservations__etag_muda_com_cancelamento(client, db_session):
+    prop = _persist_property(db_session)
+    created = client.post("/reservations", json={
+        "property_id": prop.id,
+        "client_name": "A",
+        "client_email": "a@x.com",
+        "start_date": "2025-09-10",
+        "end_date": "2025-09-12",
+        "guests_quantity": 1,
+    }).json()
+
+    etag = client.get("/reservations").headers["etag"]
+    assert client.get("/reservations", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+
+    client.put(f"/reservations/{created['reservation']['id']}/cancel")
+    r = client.get("/reservations", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()[0]["is_active"] is False
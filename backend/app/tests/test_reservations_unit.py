@@ -2,14 +2,16 @@ import pytest
 from datetime import date
 from decimal import Decimal
 
+from fastapi import HTTPException
+
 from app.service.reservation import (
-    _get_property_price,
     calculate_days_reserved,
-    create_reservation,
+    book_reservation,
     list_reservations,
     deactivate_reservation,
 )
 from app.db.schema import ReservationCreate
+from app.service.quotes import stay_total
 from app.tests.factories import persist_property, persist_reservation
 
 
@@ -23,16 +25,7 @@ def test_calculate_days_reserved_erro():
     with pytest.raises(ValueError):
         calculate_days_reserved(date(2025, 9, 5), date(2025, 9, 4))
 
-def test_get_property_price_ok(db_session):
-    p = persist_property(db_session, price_per_night=Decimal("150.00"))
-    price = _get_property_price(db_session, p.id)
-    assert price == 150
-
-def test_get_property_price_not_found(db_session):
-    with pytest.raises(ValueError):
-        _get_property_price(db_session, 999)
-
-def test_create_reservation_calcula_total_e_persiste(db_session):
+def test_book_reservation_calcula_total_e_persiste(db_session):
     p = persist_property(db_session, price_per_night=Decimal("80.00"))
 
     payload = ReservationCreate(
@@ -44,13 +37,73 @@ def test_create_reservation_calcula_total_e_persiste(db_session):
         guests_quantity=2,
     )
 
-    resp = create_reservation(db_session, payload)
+    resp = book_reservation(db_session, payload)
     obj = resp["reservation"]
     assert resp["message"].startswith("Reserva Feita com Sucesso")
     # 3 * 80 = 240.00
     assert Decimal(obj.total_price) == Decimal("240.00")
     assert obj.is_active is True
 
+def _payload(property_id, **over):
+    data = dict(
+        property_id=property_id,
+        client_name="Ciclano",
+        client_email="ciclano@example.com",
+        start_date=date(2025, 9, 10),
+        end_date=date(2025, 9, 13),
+        guests_quantity=2,
+    )
+    data.update(over)
+    return ReservationCreate(**data)
+
+
+def test_book_reservation_um_unico_statement(db_session, query_budget):
+    p = persist_property(db_session, price_per_night=Decimal("80.50"))
+
+    with query_budget(1) as q:
+        resp = book_reservation(db_session, _payload(p.id))
+
+    assert q.statements[0].startswith("INSERT INTO reservations")
+    obj = resp["reservation"]
+    assert obj.id is not None and obj.is_active is True
+    assert Decimal(obj.total_price) == Decimal("241.50")
+    assert "R$241.50" in resp["message"]
+
+
+@pytest.mark.parametrize(
+    "over, status_code, detail",
+    [
+        ({"property_id": 9999}, 404, "propriedade não encontrada"),
+        ({"guests_quantity": 7}, 409, "capacidade insuficiente"),
+        ({"end_date": date(2025, 9, 1)}, 409, "data de saída"),
+        ({"start_date": date(2025, 9, 11), "end_date": date(2025, 9, 13)}, 409, "período indisponível"),
+    ],
+)
+def test_book_reservation_erros(db_session, over, status_code, detail):
+    p = persist_property(db_session, capacity=6)
+    persist_reservation(
+        db_session, property_id=p.id, start_date=date(2025, 9, 12), end_date=date(2025, 9, 14)
+    )
+    payload = _payload(p.id, start_date=date(2025, 9, 1), end_date=date(2025, 9, 4))
+    payload = payload.model_copy(update=over)
+
+    with pytest.raises(HTTPException) as ex:
+        book_reservation(db_session, payload)
+    assert ex.value.status_code == status_code
+    assert detail in ex.value.detail.lower()
+
+
+@pytest.mark.parametrize("price", ["99.90", "0.01", "33.33", "12345.67", "80.05"])
+def test_book_reservation_total_igual_ao_stay_total(db_session, price):
+    p = persist_property(db_session, price_per_night=Decimal(price))
+    for k, nights in enumerate((1, 3, 7, 29)):
+        start = date(2026, 1 + k, 1)
+        obj = book_reservation(
+            db_session, _payload(p.id, start_date=start, end_date=date(2026, 1 + k, 1 + nights))
+        )["reservation"]
+        assert Decimal(obj.total_price) == stay_total(Decimal(price), nights)
+
+
 def test_list_reservations_filtros(db_session):
     p1 = persist_property(db_session)
     p2 = persist_property(db_session, title="Chalé", price_per_night=Decimal("200.00"))
@@ -69,6 +122,29 @@ def test_list_reservations_filtros(db_session):
     assert len(only_p2) == 1
     assert only_p2[0].property_id == p2.id
 
+@pytest.mark.parametrize(
+    "match, term, expected",
+    [
+        ("exact", "Ana@Ex.com", ["ana@ex.com"]),
+        ("exact", "ana", []),
+        ("prefix", "ana", ["ana@ex.com", "ana_maria@ex.com"]),
+        ("prefix", "ana_", ["ana_maria@ex.com"]),
+        ("contains", "ex.com", ["ana@ex.com", "ana_maria@ex.com", "joana@ex.com"]),
+        ("contains", "%", []),
+    ],
+)
+def test_list_reservations_match_email(db_session, match, term, expected):
+    p = persist_property(db_session)
+    for k, email in enumerate(["ana@ex.com", "ana_maria@ex.com", "joana@ex.com"]):
+        persist_reservation(
+            db_session, property_id=p.id, client_email=email,
+            start_date=date(2025, 10, 1 + 5 * k), end_date=date(2025, 10, 3 + 5 * k),
+        )
+
+    out = list_reservations(db_session, client_email=term, match=match)
+    assert [r.client_email for r in out] == expected
+
+
 def test_deactivate_reservation_ok(db_session):
     p = persist_property(db_session)
     res = persist_reservation(db_session, property_id=p.id, is_active=True)
@@ -86,15 +162,7 @@ def test_deactivate_reservation_ja_inativa(db_session):
     assert out.is_active is False
 
 
-def _noop_check_availability(*args, **kwargs):
-    return None
-
-
-def test_create_reservation_endpoint__201(client, db_session, monkeypatch):
-
-    import app.routes.reservations as reservations_router
-    monkeypatch.setattr(reservations_router, "check_availability", _noop_check_availability)
-
+def test_create_reservation_endpoint__201(client, db_session):
     p = persist_property(db_session, price_per_night=Decimal("100.00"))
 
     payload = {
@@ -117,10 +185,7 @@ def test_create_reservation_endpoint__201(client, db_session, monkeypatch):
     assert total == Decimal("300.00")
 
 
-def test_create_reservation_endpoint__409_property_nao_existe(client, db_session, monkeypatch):
-    import app.routes.reservations as reservations_router
-    monkeypatch.setattr(reservations_router, "check_availability", _noop_check_availability)
-
+def test_create_reservation_endpoint__404_property_nao_existe(client, db_session):
     payload = {
         "property_id": 9999,
         "client_name": "Zé",
@@ -130,14 +195,17 @@ def test_create_reservation_endpoint__409_property_nao_existe(client, db_session
         "guests_quantity": 1
     }
     r = client.post("/reservations", json=payload)
-    assert r.status_code == 409
+    assert r.status_code == 404
     assert "Propriedade" in r.json()["detail"]
 
 
 def test_list_reservations_endpoint__sem_filtros(client, db_session):
     p = persist_property(db_session)
     persist_reservation(db_session, property_id=p.id, client_email="a@x.com")
-    persist_reservation(db_session, property_id=p.id, client_email="b@y.com")
+    persist_reservation(
+        db_session, property_id=p.id, client_email="b@y.com",
+        start_date=date(2025, 10, 1), end_date=date(2025, 10, 4),
+    )
 
     r = client.get("/reservations")
     assert r.status_code == 200
@@ -149,7 +217,10 @@ def test_list_reservations_endpoint__sem_filtros(client, db_session):
 def test_list_reservations_endpoint__filtro_email(client, db_session):
     p = persist_property(db_session)
     persist_reservation(db_session, property_id=p.id, client_email="alfa@ex.com")
-    persist_reservation(db_session, property_id=p.id, client_email="beta@ex.com")
+    persist_reservation(
+        db_session, property_id=p.id, client_email="beta@ex.com",
+        start_date=date(2025, 10, 1), end_date=date(2025, 10, 4),
+    )
 
     r = client.get("/reservations", params={"client_email": "alfa@ex.com"})
     assert r.status_code == 200
@@ -158,6 +229,11 @@ def test_list_reservations_endpoint__filtro_email(client, db_session):
     assert data[0]["client_email"] == "alfa@ex.com"
 
 
+def test_list_reservations_endpoint__match_invalido(client):
+    r = client.get("/reservations", params={"client_email": "a", "match": "regex"})
+    assert r.status_code == 422
+
+
 def test_deactivate_reservation_endpoint__200(client, db_session):
     p = persist_property(db_session)
     res = persist_reservation(db_session, property_id=p.id, is_active=True)
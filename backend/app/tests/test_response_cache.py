@@ -0,0 +1,107 @@
+import time
+
+import pytest
+
+from app.db.schema import PropertyCreate
+from app.service.property import create_property, delete_property_by_id
+from app.service.response_cache import (
+    InMemoryBackend,
+    ResponseCache,
+    SharedStoreBackend,
+    property_list_cache,
+)
+from app.tests.factories import persist_property
+
+
+class FakeSharedStore:
+    """Imita o subconjunto do cliente Redis usado pelo SharedStoreBackend."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self.data[key]
+            return None
+        return value
+
+    def set(self, key, value, ex=None):
+        self.data[key] = (value, time.monotonic() + ex if ex else None)
+
+    def incr(self, key):
+        value = int(self.get(key) or 0) + 1
+        self.data[key] = (str(value).encode(), None)
+        return value
+
+
+@pytest.fixture(params=["memory", "shared"])
+def cache_on(request, monkeypatch):
+    backend = InMemoryBackend() if request.param == "memory" else SharedStoreBackend(FakeSharedStore())
+    monkeypatch.setattr(property_list_cache, "backend", backend)
+    monkeypatch.setattr(property_list_cache, "enabled", True)
+    return property_list_cache
+
+
+def test_backend_em_memoria_lru_e_ttl():
+    backend = InMemoryBackend(max_entries=2)
+    backend.set("a", b"1", 30)
+    backend.set("b", b"2", 30)
+    backend.get("a")
+    backend.set("c", b"3", 30)
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1" and backend.get("c") == b"3"
+
+    backend.set("d", b"4", -1)
+    assert backend.get("d") is None
+
+
+@pytest.mark.parametrize("backend", [InMemoryBackend(), SharedStoreBackend(FakeSharedStore())])
+def test_geracao_invalida_as_chaves(backend):
+    cache = ResponseCache(backend, enabled=True)
+    key = cache.key(("Centro", None))
+    cache.set(key, b"[]", 7)
+    assert cache.get(key) == (b"[]", 7)
+
+    cache.invalidate()
+    assert cache.key(("Centro", None)) != key
+    assert cache.get(cache.key(("Centro", None))) is None
+
+
+def test_list_endpoint__cache_hit_nao_consulta_o_banco(client, db_session, cache_on, count_queries):
+    persist_property(db_session, address_city="Pirapora", country="BRA")
+
+    first = client.get("/properties/list", params={"address_city": "Pirapora"})
+    # mesma página com filtro equivalente após normalização
+    with count_queries() as q:
+        second = client.get("/properties/list", params={"address_city": " Pirapora ", "capacity": 0})
+
+    assert first.status_code == second.status_code == 200
+    assert second.content == first.content
+    # só a leitura da versão para o ETag; a listagem sai do cache
+    assert q.count == 1 and "table_versions" in q.statements[0]
+
+
+def test_list_endpoint__escritas_invalidam(client, db_session, cache_on):
+    p = persist_property(db_session, address_city="Pirapora", country="BRA")
+    assert len(client.get("/properties/list").json()) == 1
+
+    create_property(db_session, PropertyCreate(
+        title="Nova", address_street="Rua B", address_number="9",
+        address_neighborhood="Centro", address_city="Pirapora", address_state="MG",
+        country="BRA", rooms=1, capacity=2, price_per_night=90,
+    ))
+    assert len(client.get("/properties/list").json()) == 2
+
+    delete_property_by_id(db_session, p.id)
+    assert [x["title"] for x in client.get("/properties/list").json()] == ["Nova"]
+
+
+def test_list_endpoint__cache_guarda_o_cursor(client, db_session, cache_on):
+    for i in range(3):
+        persist_property(db_session, address_number=str(i), country="BRA")
+
+    first = client.get("/properties/list", params={"limit": 2})
+    second = client.get("/properties/list", params={"limit": 2})
+    assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+    assert second.headers["Link"] == first.headers["Link"]
@@ -0,0 +1,127 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.db.models import Property, Reservation
+from app.service.availability_index import availability_index
+from app.service.calendar import calendar_cache
+from app.service.seeds import SEED_CHECK_CHUNK, apply_full_seed, load_seed_manifest
+
+
+def _write_manifest(tmp_path, n_properties, n_reservations):
+    properties = [
+        {
+            "title": f"Imóvel {i}",
+            "address_street": "Rua A",
+            "address_number": str(i),
+            "address_neighborhood": "Centro",
+            "address_city": "Diamantina",
+            "address_state": "MG",
+            "country": "BRA",
+            "rooms": 2,
+            "capacity": 4,
+            "price_per_night": "199.90",
+        }
+        for i in range(n_properties)
+    ]
+    reservations = []
+    for i in range(n_reservations):
+        start = date(2025, 1, 1) + timedelta(days=3 * (i // n_properties))
+        reservations.append({
+            "property_title": f"Imóvel {i % n_properties}",
+            "client_name": "Cliente",
+            "client_email": f"c{i}@example.com",
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=2)).isoformat(),
+            "guests_quantity": 2,
+        })
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({"properties": properties, "reservations": reservations}), encoding="utf-8")
+    return str(path)
+
+
+def test_manifesto_grande_custa_poucos_statements(tmp_path, db_session, count_queries):
+    n = SEED_CHECK_CHUNK + 500
+    manifest = load_seed_manifest(_write_manifest(tmp_path, 100, n))
+
+    with count_queries() as q:
+        result = apply_full_seed(db_session, manifest)
+    assert result["reservations_total"] == n
+    assert result["reservations_distribution"]["Imóvel 0"] == n // 100
+    # 1 checagem + INSERTs de até 1000 linhas cada (insertmanyvalues), nunca um por linha
+    assert q.count <= 1 + 1 + (n // 1000 + 1)
+    row = db_session.execute(select(func.sum(Reservation.total_price))).scalar_one()
+    assert float(row) == pytest.approx(n * 2 * 199.90)
+
+    # reaplicado: títulos (1) + VALUES em blocos de SEED_CHECK_CHUNK (2)
+    with count_queries() as q, pytest.raises(HTTPException) as ex:
+        apply_full_seed(db_session, manifest)
+    assert ex.value.status_code == 409
+    assert len(ex.value.detail["reservations_duplicated"]) == n
+    assert q.count == 3
+
+
+def test_manifesto_com_titulo_repetido(tmp_path):
+    path = tmp_path / "dup.json"
+    prop = {"title": "X", "price_per_night": 1}
+    path.write_text(json.dumps({"properties": [prop, prop]}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_seed_manifest(str(path))
+
+
+def _manifest_file(tmp_path, properties, reservations=()):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({"properties": properties, "reservations": list(reservations)}), encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("over, campo", [
+    ({"price_per_night": "-1.00"}, "price_per_night"),
+    ({"rooms": 0}, "rooms"),
+    ({"capacity": -2}, "capacity"),
+    ({"title": "   "}, "title"),
+])
+def test_manifesto_valida_propriedades_como_a_api(tmp_path, over, campo):
+    prop = json.loads(open(_write_manifest(tmp_path, 1, 0), encoding="utf-8").read())["properties"][0]
+    with pytest.raises(ValueError, match=rf"properties\[0\]: {campo}"):
+        load_seed_manifest(_manifest_file(tmp_path, [{**prop, **over}]))
+
+
+def test_manifesto_normaliza_propriedades(tmp_path, db_session):
+    prop = json.loads(open(_write_manifest(tmp_path, 1, 0), encoding="utf-8").read())["properties"][0]
+    prop.pop("country", None)
+    manifest = load_seed_manifest(_manifest_file(tmp_path, [{**prop, "title": "  Casa  "}]))
+    assert manifest.properties[0]["title"] == "Casa"
+    apply_full_seed(db_session, manifest)
+    assert db_session.execute(select(Property.title, Property.country)).one() == ("Casa", "BRA")
+
+
+def test_manifesto_recusa_reserva_com_datas_invertidas(tmp_path):
+    data = json.loads(open(_write_manifest(tmp_path, 1, 1), encoding="utf-8").read())
+    data["reservations"][0]["end_date"] = "2024-12-31"
+    with pytest.raises(ValueError, match=r"reservations\[0\]"):
+        load_seed_manifest(_manifest_file(tmp_path, data["properties"], data["reservations"]))
+
+
+def test_seed_invalida_calendario_e_indice_das_propriedades(db_session, monkeypatch):
+    monkeypatch.setattr(calendar_cache, "enabled", True)
+    monkeypatch.setattr(availability_index, "enabled", True)
+    # ids podem ser reaproveitados (SQLite sem AUTOINCREMENT): sobras de propriedades apagadas
+    for pid in range(1, 51):
+        calendar_cache.set(pid, (2025, 9), "0" * 30, calendar_cache.generation(pid))
+        availability_index.load(pid, [], availability_index.load_token())
+    try:
+        result = apply_full_seed(db_session)
+        seeded = db_session.execute(
+            select(Property.id).where(Property.title.in_(result["created_properties"]))
+        ).scalars().all()
+        assert len(seeded) == 5
+        for pid in seeded:
+            assert calendar_cache.get(pid, (2025, 9)) is None
+            assert pid not in availability_index
+    finally:
+        calendar_cache.clear()
+        availability_index.clear()
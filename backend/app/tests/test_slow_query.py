@@ -0,0 +1,76 @@
+import logging
+from datetime import date
+
+import pytest
+from sqlalchemy import event, text
+
+from app.db.slow_query import SlowQueryLog, explain_prefix, normalize_sql, param_shape
+from app.tests.conftest import _mk_property
+
+
+@pytest.fixture()
+def slow_log(engine, tmp_path):
+    # limite ínfimo: toda consulta é "lenta"; sampler fixo = sempre explica
+    log = SlowQueryLog(threshold_ms=0.000001, explain_sample=1.0,
+                       plan_file=str(tmp_path / "plans.log"), sampler=lambda: 0.0)
+    log.attach(engine)
+    yield log
+    log.detach(engine)
+
+
+def test_normalize_sql_colapsa_espacos_e_listas_do_in():
+    sql = "SELECT id\n  FROM properties\n WHERE id IN (?, ?, ?) AND city = ?"
+    assert normalize_sql(sql) == "SELECT id FROM properties WHERE id IN (...) AND city = ?"
+    assert normalize_sql("... IN (%(id_1_1)s, %(id_1_2)s)") == "... IN (...)"
+
+
+def test_param_shape_mostra_tipos_e_nao_valores():
+    assert param_shape({"email": "ana@example.com", "d": date(2025, 9, 1), "x": None}) == \
+        "{email: str, d: date, x: NULL}"
+    assert param_shape(("ana@example.com", 3)) == "(str, int)"
+    assert param_shape([(1, "a"), (2, "b")], executemany=True) == "2 x (int, str)"
+
+
+def test_explain_prefix_so_usa_analyze_em_select():
+    assert explain_prefix("postgresql", "  select id from properties") == "EXPLAIN (ANALYZE, BUFFERS) "
+    # CTE pode escrever (WITH x AS (DELETE ... RETURNING ...)): ANALYZE a executaria de novo
+    cte = "WITH gone AS (DELETE FROM reservations RETURNING id) SELECT count(*) FROM gone"
+    assert explain_prefix("postgresql", cte) == "EXPLAIN "
+    assert explain_prefix("sqlite", cte) == "EXPLAIN QUERY PLAN "
+    assert explain_prefix("postgresql", "INSERT INTO properties DEFAULT VALUES") is None
+    assert explain_prefix("mysql", "SELECT 1") is None
+
+
+def test_desligado_nao_registra_hooks(engine):
+    log = SlowQueryLog(threshold_ms=0)
+    log.attach(engine)
+    assert not log.enabled
+    assert not event.contains(engine, "after_cursor_execute", log._after)
+
+
+def test_consulta_lenta_loga_rota_sql_e_formato(client, db_session, slow_log, caplog):
+    _mk_property(db_session, country="BRA")
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger="app.db.slow_query"):
+        r = client.get("/properties/list")
+    assert r.status_code == 200
+
+    records = [rec for rec in caplog.records if "FROM properties" in rec.sql]
+    assert records
+    rec = records[0]
+    assert rec.route == "GET /properties/list"
+    assert "\n" not in rec.sql
+    assert rec.duration_ms > 0
+    assert "ana@" not in rec.getMessage()
+
+
+def test_amostragem_grava_plano_em_arquivo(db_session, slow_log, caplog):
+    _mk_property(db_session, country="BRA")
+    db_session.execute(text("SELECT id FROM properties WHERE address_city = :city"), {"city": "Florianópolis"})
+
+    plans = open(slow_log.plan_file, encoding="utf-8").read()
+    assert "<fora de requisição> " in plans
+    assert "-- SELECT id FROM properties WHERE address_city = ?" in plans
+    assert "SCAN properties" in plans or "SEARCH properties" in plans
+    # INSERT não é explicado (ANALYZE executaria de novo)
+    assert "-- INSERT" not in plans
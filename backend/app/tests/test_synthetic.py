@@ -0,0 +1,93 @@
+import random
+from itertools import groupby
+
+from sqlalchemy import event, func, insert, select
+
+from app.db.models import Property, Reservation
+from app.service.availability_index import availability_index
+from app.service.calendar import calendar_cache
+from app.service.synthetic import SCALE_PROPERTIES, generate_dataset, generate_properties, generate_reservations
+from app.service.seeds import compute_total_price
+
+
+def _sample(seed):
+    rnd = random.Random(seed)
+    props = list(generate_properties(rnd, 50))
+    return props, [r for i, p in enumerate(props) for r in generate_reservations(rnd, i, p, 10)]
+
+
+def test_mesma_semente_gera_os_mesmos_dados():
+    assert _sample(7) == _sample(7)
+    assert _sample(7) != _sample(8)
+
+
+def test_total_price_bate_com_a_regra_do_seed():
+    props, reservations = _sample(3)
+    for r in reservations:
+        price = props[r["property_id"]]["price_per_night"]
+        assert r["total_price"] == compute_total_price(price, r["start_date"], r["end_date"])
+        assert 1 <= r["guests_quantity"] <= props[r["property_id"]]["capacity"]
+
+
+def test_post_seed_scale_gera_reservas_sem_sobreposicao(client, db_session):
+    r = client.post("/seed", params={"scale": 1, "seed": 5})
+    assert r.status_code == 201
+    body = r.json()
+    assert body["properties"] == SCALE_PROPERTIES
+    assert body["reservations"] > 0
+
+    assert db_session.execute(select(func.count()).select_from(Property)).scalar_one() == SCALE_PROPERTIES
+    rows = db_session.execute(
+        select(Reservation.property_id, Reservation.start_date, Reservation.end_date)
+        .order_by(Reservation.property_id, Reservation.start_date)
+    ).all()
+    assert len(rows) == body["reservations"]
+    for _, group in groupby(rows, key=lambda row: row.property_id):
+        group = list(group)
+        # '[]' na constraint: o fim de uma e o início da próxima não podem coincidir
+        assert all(prev.end_date < nxt.start_date for prev, nxt in zip(group, group[1:]))
+
+
+def test_post_seed_scale_limitado(client):
+    assert client.post("/seed", params={"scale": 0}).status_code == 422
+    assert client.post("/seed", params={"scale": 101}).status_code == 422
+
+
+def test_post_seed_scale_zera_calendario_e_indice(client, monkeypatch):
+    monkeypatch.setattr(calendar_cache, "enabled", True)
+    monkeypatch.setattr(availability_index, "enabled", True)
+    stale = calendar_cache.generation(1)
+    calendar_cache.set(1, (2025, 9), "0" * 30, stale)
+    availability_index.load(1, [], availability_index.load_token())
+
+    assert client.post("/seed", params={"scale": 1, "seed": 5}).status_code == 201
+
+    assert calendar_cache.get(1, (2025, 9)) is None
+    assert 1 not in availability_index
+    # um mês calculado antes da carga não é guardado depois dela
+    calendar_cache.set(1, (2025, 10), "0" * 31, stale)
+    assert calendar_cache.get(1, (2025, 10)) is None
+
+
+def test_reservas_so_para_as_propriedades_do_proprio_insert(db_session):
+    # outra "conexão" grava uma propriedade logo antes do INSERT do lote
+    conn = db_session.connection()
+    stray = []
+
+    @event.listens_for(conn, "before_execute")
+    def _concurrent_insert(conn_, clauseelement, *args):
+        if stray or getattr(clauseelement, "table", None) is not Property.__table__:
+            return
+        stray.append(None)
+        row = next(generate_properties(random.Random(0), 1))
+        stray[0] = conn_.execute(insert(Property.__table__).returning(Property.id), row).scalar_one()
+
+    try:
+        generate_dataset(db_session, scale=1, seed=5, batch_properties=SCALE_PROPERTIES // 2)
+    finally:
+        event.remove(conn, "before_execute", _concurrent_insert)
+
+    orphan = db_session.execute(
+        select(func.count()).select_from(Reservation).where(Reservation.property_id == stray[0])
+    ).scalar_one()
+    assert orphan == 0
@@ -0,0 +1,83 @@
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models import Property, TableVersion
+from app.service.table_version import compact_table_versions, get_table_version
+
+
+def _property_row(i):
+    return {
+        "title": f"Casa {i}", "address_street": "Rua A", "address_number": str(i),
+        "address_neighborhood": "Centro", "address_city": "Paraty", "address_state": "RJ",
+        "country": "BRA", "rooms": 1, "capacity": 2, "price_per_night": 100,
+    }
+
+
+def test_versao_e_a_soma_das_linhas_da_tabela(db_session):
+    before = get_table_version(db_session, "properties")
+    db_session.execute(insert(TableVersion), [
+        {"name": "properties", "backend": 101, "version": 3},
+        {"name": "properties", "backend": 102, "version": 4},
+        {"name": "reservations", "backend": 101, "version": 50},
+    ])
+    assert get_table_version(db_session, "properties") == before + 7
+    assert get_table_version(db_session, "nao_existe") == 0
+
+
+def _create_all_twice_keeps_counting(eng):
+    Base.metadata.create_all(eng)
+    with eng.begin() as conn:
+        conn.execute(insert(Property), [_property_row(1)])
+    before = _version(eng)
+    Base.metadata.create_all(eng)  # init_db() de novo num banco pronto
+    with eng.begin() as conn:
+        conn.execute(insert(Property), [_property_row(2)])
+    assert _version(eng) == before + 1
+
+
+def test_create_all_repetido_no_sqlite(tmp_path):
+    eng = create_engine(f"sqlite+pysqlite:///{tmp_path / 'twice.db'}")
+    try:
+        _create_all_twice_keeps_counting(eng)
+    finally:
+        eng.dispose()
+
+
+def test_create_all_repetido_no_postgres(pg_engine):
+    _create_all_twice_keeps_counting(pg_engine)
+
+
+def test_escritores_concorrentes_nao_se_bloqueiam(pg_engine):
+    # o trigger antigo fazia UPDATE numa linha compartilhada: o segundo INSERT
+    # esperava o commit do primeiro e estourava o lock_timeout
+    base = _version(pg_engine)
+    first, second = pg_engine.connect(), pg_engine.connect()
+    try:
+        for conn in (first, second):
+            conn.execute(text("SET lock_timeout = '2s'"))
+        first.execute(insert(Property), [_property_row(1)])
+        second.execute(insert(Property), [_property_row(2)])
+
+        # o incremento só aparece com o commit, junto com os dados
+        assert _version(pg_engine) == base
+        second.commit()
+        assert _version(pg_engine) == base + 1
+        first.commit()
+        assert _version(pg_engine) == base + 2
+    finally:
+        first.close()
+        second.close()
+
+    # conexões encerradas: as linhas delas vão para a linha 0, a soma não muda
+    pg_engine.dispose()
+    with Session(pg_engine) as db:
+        compact_table_versions(db)
+        assert get_table_version(db, "properties") == base + 2
+        backends = db.execute(text("SELECT backend FROM table_versions WHERE name = 'properties'")).scalars()
+        assert list(backends) == [0]
+
+
+def _version(eng):
+    with Session(eng) as db:
+        return get_table_version(db, "properties")
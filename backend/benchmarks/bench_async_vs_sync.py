@@ -0,0 +1,129 @@
+"""
+Compara throughput das rotas sync (threadpool) e async (AsyncSession).
+
+Uso (dentro do container backend, com o banco migrado e a seed aplicada):
+
+    python -m benchmarks.bench_async_vs_sync
+    BENCH_CONCURRENCY=50,200 BENCH_DURATION=5 python -m benchmarks.bench_async_vs_sync
+
+Cada nível de concorrência abre N clientes simultâneos contra
+GET /properties/availability, em processo (httpx + ASGITransport), e
+reporta req/s, p50 e p99 para os dois modos.
+"""
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.db.models import Property
+from app.db.session import (
+    SQLALCHEMY_DATABASE_URL,
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    get_db,
+    get_async_db,
+)
+from app.main import create_app
+
+CONCURRENCY = [int(c) for c in os.getenv("BENCH_CONCURRENCY", "50,200,1000").split(",")]
+DURATION = float(os.getenv("BENCH_DURATION", "10"))
+POOL_SIZE = int(os.getenv("BENCH_POOL_SIZE", "20"))
+
+
+def _build_app(async_mode: bool):
+    app = create_app(async_mode=async_mode)
+    if async_mode:
+        eng = create_async_engine(
+            ASYNC_SQLALCHEMY_DATABASE_URL, pool_size=POOL_SIZE, max_overflow=0
+        )
+        Session = async_sessionmaker(bind=eng, autoflush=False, expire_on_commit=False)
+
+        async def _db():
+            async with Session() as db:
+                yield db
+
+        app.dependency_overrides[get_async_db] = _db
+    else:
+        eng = create_engine(SQLALCHEMY_DATABASE_URL, pool_size=POOL_SIZE, max_overflow=0)
+        Session = sessionmaker(bind=eng, autoflush=False, autocommit=False)
+
+        def _db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = _db
+    return app, eng
+
+
+def _pick_property_id() -> int:
+    eng = create_engine(SQLALCHEMY_DATABASE_URL)
+    with eng.connect() as conn:
+        prop_id = conn.execute(select(Property.id).limit(1)).scalar()
+    eng.dispose()
+    if prop_id is None:
+        raise SystemExit("Nenhuma propriedade encontrada: rode POST /seed antes.")
+    return prop_id
+
+
+async def _run_level(app, concurrency: int, params: dict) -> dict:
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + DURATION
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                r = await client.get("/properties/availability", params=params)
+                latencies.append(time.perf_counter() - t0)
+                if r.status_code >= 500:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+async def main():
+    params = {
+        "property_id": _pick_property_id(),
+        "start_date": "2030-01-10",
+        "end_date": "2030-01-12",
+        "guests_quantity": 1,
+    }
+    print(f"{'modo':<6} {'clientes':>8} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'erros':>6}")
+    for async_mode in (False, True):
+        app, eng = _build_app(async_mode)
+        for concurrency in CONCURRENCY:
+            stats = await _run_level(app, concurrency, params)
+            print(
+                f"{'async' if async_mode else 'sync':<6} {concurrency:>8} "
+                f"{stats['rps']:>10.1f} {stats['p50_ms']:>9.2f} "
+                f"{stats['p99_ms']:>9.2f} {stats['errors']:>6}"
+            )
+        if async_mode:
+            await eng.dispose()
+        else:
+            eng.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+"""
+Benchmark da busca de reservas por client_email (GET /reservations?client_email=&match=).
+
+Uso (Postgres do docker compose, com as migrações aplicadas):
+
+    python -m benchmarks.bench_email_search
+    BENCH_EMAIL_RESERVATIONS=10000000 python -m benchmarks.bench_email_search
+
+Na primeira execução popula o banco com BENCH_EMAIL_RESERVATIONS reservas
+(10M por padrão) via generate_series, espalhadas por 1000 propriedades em
+janelas que nunca se sobrepõem. Para cada modo (exact, prefix, contains) mede a
+latência com os índices desligados (enable_indexscan/enable_bitmapscan = off,
+equivale ao antigo seq scan) e ligados, e imprime o plano da consulta indexada.
+"""
+import os
+import random
+import statistics
+import time
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.db.models import Reservation
+from app.db.session import SQLALCHEMY_DATABASE_URL
+from app.service.reservation import _list_reservations_stmt, list_reservations
+
+RESERVATIONS = int(os.getenv("BENCH_EMAIL_RESERVATIONS", "10000000"))
+QUERIES = int(os.getenv("BENCH_QUERIES", "50"))
+PROPERTIES = 1000
+
+POPULATE_PROPERTIES = text(
+    """
+    INSERT INTO properties (title, address_street, address_number, address_neighborhood,
+                            address_city, address_state, country, rooms, capacity, price_per_night)
+    SELECT 'EmailBench ' || g, 'Rua ' || g, g::text, 'Centro', 'Cidade', 'MG', 'BRA', 2, 4, 100
+    FROM generate_series(1, :n) AS g
+    """
+)
+
+# reserva g vai para a propriedade g % n, na semana g / n: nunca se sobrepõem
+POPULATE_RESERVATIONS = text(
+    """
+    INSERT INTO reservations (property_id, client_name, client_email, start_date, end_date,
+                              guests_quantity, total_price, is_active)
+    SELECT p.first_id + g % :n, 'Bench', 'cliente' || g || '@bench' || (g % 97) || '.com',
+           DATE '2000-01-01' + (g / :n) * 2,
+           DATE '2000-01-01' + (g / :n) * 2 + 1,
+           1, 100, true
+    FROM generate_series(0, :total - 1) AS g,
+         (SELECT min(id) AS first_id FROM properties WHERE title LIKE 'EmailBench %') AS p
+    """
+)
+
+
+def _populate(db: Session) -> None:
+    existing = db.execute(
+        select(func.count()).select_from(Reservation).where(Reservation.client_name == "Bench")
+    ).scalar_one()
+    if existing >= RESERVATIONS:
+        return
+    t0 = time.perf_counter()
+    db.execute(POPULATE_PROPERTIES, {"n": PROPERTIES})
+    db.execute(POPULATE_RESERVATIONS, {"n": PROPERTIES, "total": RESERVATIONS})
+    db.commit()
+    db.execute(text("ANALYZE reservations"))
+    db.commit()
+    print(f"dataset criado em {time.perf_counter() - t0:.1f}s")
+
+
+def _term(rnd: random.Random, match: str) -> str:
+    g = rnd.randrange(RESERVATIONS)
+    if match == "exact":
+        return f"cliente{g}@bench{g % 97}.com"
+    if match == "prefix":
+        return f"cliente{g}@"
+    return f"{g}@bench"
+
+
+def _measure(db: Session, match: str, indexes: bool) -> list:
+    flag = "on" if indexes else "off"
+    db.execute(text(f"SET enable_indexscan = {flag}"))
+    db.execute(text(f"SET enable_bitmapscan = {flag}"))
+    rnd = random.Random(42)
+    latencies = []
+    for _ in range(QUERIES):
+        term = _term(rnd, match)
+        t0 = time.perf_counter()
+        list_reservations(db, client_email=term, match=match, limit=100)
+        latencies.append(time.perf_counter() - t0)
+    latencies.sort()
+    return latencies
+
+
+def main():
+    eng = create_engine(SQLALCHEMY_DATABASE_URL)
+    with Session(eng) as db:
+        _populate(db)
+
+        for match in ("exact", "prefix", "contains"):
+            for indexes in (False, True):
+                lat = _measure(db, match, indexes)
+                print(f"{match:<8} índices {'on ' if indexes else 'off'}: "
+                      f"p50 {statistics.median(lat) * 1000:.2f} ms, "
+                      f"p99 {lat[int(QUERIES * 0.99) - 1] * 1000:.2f} ms")
+
+            stmt = _list_reservations_stmt(_term(random.Random(7), match), match=match).limit(100)
+            sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+            for (line,) in db.execute(text("EXPLAIN (ANALYZE, BUFFERS) " + sql)):
+                print("   ", line)
+        db.rollback()
+    eng.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Linhas/s da serialização de GET /properties/list: objetos ORM validados pelo
+PropertyOut (caminho antigo) x colunas direto para JSON com orjson (atual).
+
+Uso (não precisa do Postgres):
+
+    python -m benchmarks.bench_list_serialization
+    BENCH_ROWS=5000 BENCH_PAGE=500 python -m benchmarks.bench_list_serialization
+
+Popula um SQLite em memória com BENCH_ROWS propriedades e mede páginas de
+BENCH_PAGE linhas (consulta + serialização, sem HTTP), também com
+fields=id,title,price_per_night.
+"""
+import os
+import time
+from decimal import Decimal
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.db.models import Property
+from app.db.schema import PropertyOut
+from app.service.pagination import split_page
+from app.service.property import list_properties, list_properties_json, parse_property_fields
+
+ROWS = int(os.getenv("BENCH_ROWS", "2000"))
+PAGE = int(os.getenv("BENCH_PAGE", "500"))
+REPEAT = int(os.getenv("BENCH_REPEAT", "5"))
+ROUNDS = int(os.getenv("BENCH_ROUNDS", "20"))
+
+_PROPERTY_PAGE = TypeAdapter(List[PropertyOut])
+
+
+def _populate(db: Session) -> None:
+    db.execute(insert(Property), [
+        {
+            "title": f"Casa {i}", "address_street": "Rua das Flores", "address_number": str(i),
+            "address_neighborhood": "Centro", "address_city": "Florianópolis", "address_state": "SC",
+            "country": "BRA", "rooms": 1 + i % 5, "capacity": 2 + i % 8,
+            "price_per_night": Decimal(100 + i % 400) + Decimal("0.90"),
+        }
+        for i in range(ROWS)
+    ])
+    db.commit()
+
+
+def _orm_page(db: Session) -> bytes:
+    rows = list_properties(db, limit=PAGE + 1)
+    page, _ = split_page(rows, PAGE)
+    body = _PROPERTY_PAGE.dump_json(_PROPERTY_PAGE.validate_python(page, from_attributes=True))
+    db.expunge_all()  # como numa requisição nova: sem identity map reaproveitado
+    return body
+
+
+def _rows_per_second(fn) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        for _ in range(ROUNDS):
+            fn()
+        best = min(best, time.perf_counter() - t0)
+    return ROUNDS * PAGE / best
+
+
+def main():
+    eng = create_engine("sqlite://")
+    Base.metadata.create_all(eng)
+    with Session(eng) as db:
+        _populate(db)
+        sparse = parse_property_fields("id,title,price_per_night")
+        assert _orm_page(db) == list_properties_json(db, limit=PAGE)[0]
+
+        results = [
+            ("ORM + PropertyOut", _rows_per_second(lambda: _orm_page(db))),
+            ("colunas + orjson", _rows_per_second(lambda: list_properties_json(db, limit=PAGE))),
+            ("colunas + orjson, 3 campos", _rows_per_second(
+                lambda: list_properties_json(db, limit=PAGE, fields=sparse)
+            )),
+        ]
+    eng.dispose()
+
+    base = results[0][1]
+    print(f"páginas de {PAGE} linhas (SQLite em memória, consulta + serialização)")
+    for name, rate in results:
+        print(f"{name:28s} {rate:12,.0f} linhas/s  ({rate / base:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
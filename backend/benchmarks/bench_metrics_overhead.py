@@ -0,0 +1,96 @@
+"""
+Custo da coleta de métricas por requisição (meta: < 50µs).
+
+Uso (não precisa do Postgres):
+
+    python -m benchmarks.bench_metrics_overhead
+    BENCH_REQUESTS=500000 python -m benchmarks.bench_metrics_overhead
+
+Mede, em processo, uma app ASGI mínima chamada direto (sem HTTP) com e sem o
+MetricsMiddleware, e um `SELECT 1` no SQLite em memória com e sem os hooks de
+cursor. A diferença entre as duas medições é o overhead da instrumentação; a
+requisição "típica" soma o middleware com BENCH_QUERIES consultas.
+"""
+import asyncio
+import os
+import time
+
+from sqlalchemy import create_engine, text
+
+from app.metrics import MetricsMiddleware, RequestStats, _current, instrument_engine, uninstrument_engine
+
+REQUESTS = int(os.getenv("BENCH_REQUESTS", "200000"))
+REPEAT = int(os.getenv("BENCH_REPEAT", "5"))
+QUERIES = int(os.getenv("BENCH_QUERIES", "3"))
+BUDGET_US = 50.0
+
+
+class _Route:
+    path = "/properties/{prop_id}"
+
+
+async def _app(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def _send(message):
+    pass
+
+
+async def _run(app, n: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/properties/1"}
+    t0 = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), _receive, _send)
+    return time.perf_counter() - t0
+
+
+def _queries(instrumented: bool, n: int) -> float:
+    eng = create_engine("sqlite://")
+    if instrumented:
+        instrument_engine(eng)
+    # como dentro de uma requisição: os hooks acumulam num RequestStats
+    token = _current.set(RequestStats())
+    with eng.connect() as conn:
+        stmt = text("SELECT 1")
+        conn.execute(stmt)
+        t0 = time.perf_counter()
+        for _ in range(n):
+            conn.execute(stmt)
+        elapsed = time.perf_counter() - t0
+    _current.reset(token)
+    uninstrument_engine(eng)
+    eng.dispose()
+    return elapsed
+
+
+def _best(fn) -> float:
+    # menor de REPEAT rodadas: descarta ruído de GC/escalonamento
+    return min(fn() for _ in range(REPEAT))
+
+
+def main():
+    wrapped = MetricsMiddleware(_app)
+    asyncio.run(_run(wrapped, 1000))  # aquecimento
+    bare = _best(lambda: asyncio.run(_run(_app, REQUESTS)))
+    with_mw = _best(lambda: asyncio.run(_run(wrapped, REQUESTS)))
+    middleware_us = (with_mw - bare) / REQUESTS * 1e6
+
+    n = REQUESTS // 4
+    per_query_us = (_best(lambda: _queries(True, n)) - _best(lambda: _queries(False, n))) / n * 1e6
+
+    total_us = middleware_us + QUERIES * per_query_us
+    print(f"middleware:      {middleware_us:6.2f} µs/requisição")
+    print(f"hooks de cursor: {per_query_us:6.2f} µs/consulta")
+    print(f"requisição com {QUERIES} consultas: {total_us:6.2f} µs "
+          f"({'OK' if total_us < BUDGET_US else 'ACIMA'} da meta de {BUDGET_US:.0f} µs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Cotações/s: total noite a noite em Decimal (laço em Python) x matriz de
+centavos do NumPy com soma acumulada (app.service.quotes.NightlyRates).
+
+Uso (não precisa do Postgres):
+
+    python -m benchmarks.bench_quotes
+    BENCH_PROPERTIES=5000 BENCH_ITEMS=5000 python -m benchmarks.bench_quotes
+
+Cada propriedade tem preço de fim de semana (sexta e sábado) e uma temporada;
+as estadias têm de 1 a 14 noites dentro de um ano. Os dois caminhos precisam
+dar o mesmo total, centavo a centavo.
+"""
+import os
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+
+from app.service.quotes import NightlyRates, to_cents
+
+PROPERTIES = int(os.getenv("BENCH_PROPERTIES", "2000"))
+ITEMS = int(os.getenv("BENCH_ITEMS", "5000"))
+REPEAT = int(os.getenv("BENCH_REPEAT", "5"))
+
+FIRST = date(2026, 1, 1)
+WEEKEND = (4, 5)
+
+
+def _dataset(rnd: random.Random):
+    base = {pid: Decimal(rnd.randint(8000, 150000)).scaleb(-2) for pid in range(1, PROPERTIES + 1)}
+    rules = []
+    for pid, price in base.items():
+        season = FIRST + timedelta(days=rnd.randint(0, 300))
+        rules.append((pid, (price * Decimal("1.2")).quantize(Decimal("0.01")), None, None, WEEKEND))
+        rules.append((pid, price * 2, season, season + timedelta(days=30), None))
+    items = []
+    for _ in range(ITEMS):
+        start = FIRST + timedelta(days=rnd.randint(0, 350))
+        items.append((rnd.randint(1, PROPERTIES), start, start + timedelta(days=rnd.randint(1, 14))))
+    return base, rules, items
+
+
+def _decimal_quotes(base, rules, items):
+    by_property = {}
+    for rule in rules:
+        by_property.setdefault(rule[0], []).append(rule)
+    totals = []
+    for pid, start, end in items:
+        total = Decimal(0)
+        day = start
+        while day < end:
+            price = base[pid]
+            for _, rule_price, lo, hi, weekdays in by_property.get(pid, ()):
+                if (lo is None or lo <= day) and (hi is None or day <= hi) and (
+                    not weekdays or day.weekday() in weekdays
+                ):
+                    price = rule_price
+            total += price
+            day += timedelta(days=1)
+        totals.append(total.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+    return totals
+
+
+def _numpy_quotes(base, rules, items):
+    last = max(end for _, _, end in items) - timedelta(days=1)
+    rates = NightlyRates({pid: to_cents(price) for pid, price in base.items()}, FIRST, last)
+    for pid, price, lo, hi, weekdays in rules:
+        rates.override(pid, to_cents(price), lo, hi, weekdays)
+    nights = np.fromiter(((end - start).days for _, start, end in items), dtype=np.intp)
+    totals = rates.totals((pid for pid, _, _ in items), (start for _, start, _ in items), nights)
+    return [Decimal(cents).scaleb(-2) for cents in totals.tolist()]
+
+
+def _quotes_per_second(fn, *args) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return ITEMS / best
+
+
+def main():
+    base, rules, items = _dataset(random.Random(42))
+    assert _decimal_quotes(base, rules, items) == _numpy_quotes(base, rules, items)
+
+    results = [
+        ("Decimal noite a noite", _quotes_per_second(_decimal_quotes, base, rules, items)),
+        ("NumPy (centavos)", _quotes_per_second(_numpy_quotes, base, rules, items)),
+    ]
+    reference = results[0][1]
+    print(f"{ITEMS} cotações, {PROPERTIES} propriedades, 2 regras por propriedade")
+    for name, rate in results:
+        print(f"{name:24s} {rate:12,.0f} cotações/s  ({rate / reference:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark de GET /properties/search (anti-join NOT EXISTS) em escala.
+
+Uso (Postgres do docker compose, com as migrações aplicadas):
+
+    python -m benchmarks.bench_search
+    BENCH_PROPERTIES=100000 BENCH_RESERVATIONS_PER_PROPERTY=50 python -m benchmarks.bench_search
+
+Na primeira execução popula o banco com BENCH_PROPERTIES propriedades e
+BENCH_RESERVATIONS_PER_PROPERTY reservas semanais sem sobreposição por
+propriedade (100k x 50 = 5M), tudo via generate_series. Depois mede a
+latência da busca para janelas aleatórias e imprime o plano da consulta.
+"""
+import os
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.db.models import Property
+from app.db.session import SQLALCHEMY_DATABASE_URL
+from app.service.property import _search_available_stmt, search_available_properties
+
+PROPERTIES = int(os.getenv("BENCH_PROPERTIES", "100000"))
+RES_PER_PROPERTY = int(os.getenv("BENCH_RESERVATIONS_PER_PROPERTY", "50"))
+QUERIES = int(os.getenv("BENCH_QUERIES", "200"))
+CITIES = 50
+
+POPULATE_PROPERTIES = text(
+    """
+    INSERT INTO properties (title, address_street, address_number, address_neighborhood,
+                            address_city, address_state, country, rooms, capacity, price_per_night)
+    SELECT 'Bench ' || g, 'Rua ' || g, g::text, 'Bairro ' || (g % 200),
+           'Cidade ' || (g % :cities), 'MG', 'BRA', 1 + g % 5, 1 + g % 10, 80 + (g % 400)
+    FROM generate_series(1, :n) AS g
+    """
+)
+
+# reservas de 1 a 5 noites, uma por semana, sem sobreposição dentro da propriedade
+POPULATE_RESERVATIONS = text(
+    """
+    INSERT INTO reservations (property_id, client_name, client_email, start_date, end_date,
+                              guests_quantity, total_price, is_active)
+    SELECT p.id, 'Bench', 'bench' || p.id || '_' || k || '@example.com',
+           DATE '2025-01-01' + k * 7,
+           DATE '2025-01-01' + k * 7 + 1 + ((p.id + k) % 5),
+           1, p.price_per_night, ((p.id + k) % 10) <> 0
+    FROM properties p
+    CROSS JOIN generate_series(0, :per_property - 1) AS k
+    WHERE p.title LIKE 'Bench %'
+    """
+)
+
+
+def _populate(db: Session) -> None:
+    existing = db.execute(
+        select(func.count()).select_from(Property).where(Property.title.like("Bench %"))
+    ).scalar_one()
+    if existing >= PROPERTIES:
+        return
+    t0 = time.perf_counter()
+    db.execute(POPULATE_PROPERTIES, {"n": PROPERTIES, "cities": CITIES})
+    db.execute(POPULATE_RESERVATIONS, {"per_property": RES_PER_PROPERTY})
+    db.commit()
+    db.execute(text("ANALYZE properties"))
+    db.execute(text("ANALYZE reservations"))
+    db.commit()
+    print(f"dataset criado em {time.perf_counter() - t0:.1f}s")
+
+
+def _random_query(rnd: random.Random) -> dict:
+    start = date(2025, 1, 1) + timedelta(days=rnd.randint(0, RES_PER_PROPERTY * 7))
+    return {
+        "start_date": start,
+        "end_date": start + timedelta(days=rnd.randint(1, 7)),
+        "guests": rnd.randint(1, 6),
+        "address_city": f"Cidade {rnd.randrange(CITIES)}",
+    }
+
+
+def main():
+    eng = create_engine(SQLALCHEMY_DATABASE_URL)
+    rnd = random.Random(42)
+    with Session(eng) as db:
+        _populate(db)
+
+        latencies = []
+        for _ in range(QUERIES):
+            params = _random_query(rnd)
+            t0 = time.perf_counter()
+            search_available_properties(db, **params)
+            latencies.append(time.perf_counter() - t0)
+
+        latencies.sort()
+        print(f"{QUERIES} buscas: p50 {statistics.median(latencies) * 1000:.2f} ms, "
+              f"p99 {latencies[int(QUERIES * 0.99) - 1] * 1000:.2f} ms")
+
+        params = _random_query(rnd)
+        stmt = _search_available_stmt(**params).limit(50)
+        sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        for (line,) in db.execute(text("EXPLAIN (ANALYZE, BUFFERS) " + sql)):
+            print(line)
+    eng.dispose()
+
+
+if __name__ == "__main__":
+    main()